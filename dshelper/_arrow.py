@@ -0,0 +1,161 @@
+"""
+Apache Arrow / Parquet Input Helpers
+====================================
+
+Private helpers that let the public functions take a ``pyarrow.Table`` or a
+Parquet path instead of a DataFrame. pyarrow is an optional dependency and is
+only imported when such an input is actually passed.
+"""
+
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+_PARQUET_SUFFIXES = ('.parquet', '.parq', '.pq')
+
+
+def is_arrow_source(obj) -> bool:
+    """True for a pyarrow.Table or a path to a Parquet file or directory."""
+    if _is_table(obj):
+        return True
+    if isinstance(obj, (str, Path)):
+        path = Path(obj)
+        return path.suffix.lower() in _PARQUET_SUFFIXES or (
+            path.is_dir() and any(path.glob('*.parquet'))
+        )
+    return False
+
+
+def read_table(source, columns: Optional[List[str]] = None):
+    """
+    Load only the requested columns of a Parquet path or Table.
+
+    For Parquet the column list is pushed down to the reader, so other
+    columns are never read from disk.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("pyarrow is required for Arrow/Parquet input. "
+                          "Install it with: pip install pyarrow")
+
+    if isinstance(source, pa.Table):
+        return source.select(columns) if columns is not None else source
+    return pq.read_table(source, columns=columns)
+
+
+def missing_counts(table) -> Tuple[pd.Series, pd.Series]:
+    """
+    Missing values per column and the column dtypes of a Table.
+
+    Nulls come from the validity bitmaps (``null_count`` is stored, not
+    computed); floating columns also count NaN, as ``DataFrame.isnull`` does.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    counts, dtypes = {}, {}
+    for name, column in zip(table.column_names, table.columns):
+        count = column.null_count
+        if pa.types.is_floating(column.type):
+            count += pc.sum(pc.is_nan(column)).as_py() or 0
+        counts[name] = count
+        dtypes[name] = _numpy_dtype(column.type)
+
+    return pd.Series(counts, dtype=np.int64), pd.Series(dtypes, dtype=object)
+
+
+def to_numpy_2d(table, dtype=None) -> np.ndarray:
+    """
+    Copy the columns of a Table into one column-major 2-D array.
+
+    Every chunk without nulls is exposed to NumPy zero-copy and written
+    straight into its slice of the output, so the only copy is the output
+    itself (no intermediate DataFrame). Nulls become NaN.
+    """
+    import pyarrow as pa
+
+    for name, column in zip(table.column_names, table.columns):
+        if not (pa.types.is_integer(column.type) or pa.types.is_floating(column.type)
+                or pa.types.is_boolean(column.type)):
+            raise ValueError(f"Column '{name}' of type {column.type} is not numeric")
+
+    if dtype is None:
+        dtypes = [_numpy_dtype(column.type) for column in table.columns]
+        if any(column.null_count for column in table.columns):
+            dtypes.append(np.float64)
+        dtype = np.result_type(*dtypes) if dtypes else np.float64
+
+    out = np.empty((table.num_rows, table.num_columns), dtype=dtype, order='F')
+    for j, column in enumerate(table.columns):
+        start = 0
+        for chunk in column.chunks:
+            out[start:start + len(chunk), j] = chunk.to_numpy(zero_copy_only=False)
+            start += len(chunk)
+
+    return out
+
+
+def features_and_target(
+    source,
+    y: Union[str, np.ndarray, pd.Series],
+    columns: Optional[List[str]],
+    dtype=None
+) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+    """
+    Read the feature columns (and the target, if given by name) in one projected read.
+
+    Returns the feature array, the target values and the feature names.
+    """
+    target = y if isinstance(y, str) else None
+
+    if columns is None:
+        if _is_table(source):
+            names = source.column_names
+        else:
+            # Only the schema is read to list the columns
+            import pyarrow.parquet as pq
+            names = pq.ParquetDataset(source).schema.names
+        columns = [name for name in names if name != target]
+    columns = list(columns)
+
+    table = read_table(source, columns + ([target] if target is not None else []))
+    if target is not None:
+        y = table.column(target).to_numpy()
+        table = table.select(columns)
+
+    return to_numpy_2d(table, dtype), y, columns
+
+
+def _is_table(obj) -> bool:
+    """True for a pyarrow.Table, without importing pyarrow."""
+    return type(obj).__name__ == 'Table' and type(obj).__module__.split('.')[0] == 'pyarrow'
+
+
+def _numpy_dtype(arrow_type) -> np.dtype:
+    """NumPy dtype that pandas uses for an Arrow type (object if there is none)."""
+    try:
+        return np.dtype(arrow_type.to_pandas_dtype())
+    except (NotImplementedError, TypeError):
+        return np.dtype(object)
+
+
+def iter_batches(source, chunksize: int, columns: Optional[List[str]] = None):
+    """Yield DataFrame chunks of a Table or Parquet file/directory without loading it whole."""
+    try:
+        import pyarrow.dataset as ds
+    except ImportError:
+        raise ImportError("pyarrow is required for Arrow/Parquet input. "
+                          "Install it with: pip install pyarrow")
+
+    if _is_table(source):
+        table = source.select(columns) if columns is not None else source
+        batches = table.to_batches(max_chunksize=chunksize)
+    else:
+        dataset = ds.dataset(source, format='parquet')
+        batches = dataset.to_batches(columns=columns, batch_size=chunksize)
+
+    for batch in batches:
+        yield batch.to_pandas()
@@ -0,0 +1,58 @@
+"""
+Column-Group Parallelism Helpers
+================================
+
+Private helpers for running per-column work on groups of columns in a thread
+pool. Threads share the DataFrame, so no column is pickled or copied to reach
+a worker, and results come back in column order, so output is deterministic.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Callable, List, Optional, Sequence
+
+
+def map_column_groups(
+    func: Callable[[List], list],
+    columns: Sequence,
+    n_jobs: Optional[int] = None
+) -> list:
+    """
+    Apply ``func`` to contiguous groups of columns and concatenate the results.
+
+    ``func`` takes a list of columns and returns a list of per-column results.
+    With ``n_jobs`` None (or a single column) it runs once in the calling
+    thread; otherwise the columns are split into one group per worker.
+    """
+    from joblib import Parallel, delayed, effective_n_jobs
+
+    columns = list(columns)
+    n_groups = min(effective_n_jobs(n_jobs), len(columns)) if n_jobs is not None else 1
+    if n_groups <= 1:
+        return func(columns)
+
+    groups = [[columns[i] for i in group]
+              for group in np.array_split(np.arange(len(columns)), n_groups)]
+    results = Parallel(n_jobs=n_groups, prefer='threads')(delayed(func)(group) for group in groups)
+    return [item for part in results for item in part]
+
+
+def output_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Copy of df for per-column results to be assigned into.
+
+    Under copy-on-write (always on from pandas 3) a shallow copy is enough,
+    since writing to it never reaches df. Without it the result is a deep copy,
+    so in-place edits of untouched columns cannot change the caller's frame.
+    """
+    return df.copy(deep=not _copy_on_write())
+
+
+def _copy_on_write() -> bool:
+    """True when pandas copy-on-write is enabled."""
+    if int(pd.__version__.split('.')[0]) >= 3:
+        return True
+    try:
+        return pd.get_option('mode.copy_on_write') is True
+    except KeyError:  # OptionError on pandas < 2.0, which has no copy-on-write
+        return False
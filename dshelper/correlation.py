@@ -7,7 +7,7 @@ This module provides utilities for correlation analysis and visualization.
 
 import pandas as pd
 import numpy as np
-from typing import Optional, List, Tuple
+from typing import Optional, List, Tuple, Union
 import warnings
 
 
@@ -21,7 +21,8 @@ def heatmap(
     vmax: float = 1,
     columns: Optional[List[str]] = None,
     mask_diagonal: bool = False,
-    threshold: Optional[float] = None
+    threshold: Optional[float] = None,
+    weights: Optional[Union[str, np.ndarray, pd.Series]] = None
 ) -> pd.DataFrame:
     """
     Generate a correlation heatmap with customizable options.
@@ -48,6 +49,9 @@ def heatmap(
         Whether to mask the diagonal (correlation with self)
     threshold : float, optional
         Only show correlations with absolute value above this threshold
+    weights : str or array-like, optional
+        Row weights (or the name of a weight column, which is then excluded),
+        e.g. 'sample_weight' from ``preprocessing.sample``. Only for 'pearson'
         
     Returns:
     --------
@@ -58,6 +62,7 @@ def heatmap(
     --------
     >>> from dshelper import correlation
     >>> corr_matrix = correlation.heatmap(df, method='spearman')
+    >>> corr_matrix = correlation.heatmap(df_sample, weights='sample_weight')
     """
     try:
         import matplotlib.pyplot as plt
@@ -65,6 +70,11 @@ def heatmap(
     except ImportError:
         raise ImportError("matplotlib and seaborn are required for plotting")
     
+    if weights is not None and method != 'pearson':
+        raise ValueError("weights are only supported with method='pearson'")
+    if isinstance(weights, str):
+        df, weights = df.drop(columns=weights), df[weights]
+    
     # Select columns
     if columns:
         df_numeric = df[columns]
@@ -75,7 +85,10 @@ def heatmap(
         raise ValueError("No numeric columns found in DataFrame")
     
     # Calculate correlation
-    corr_matrix = df_numeric.corr(method=method)
+    if weights is not None:
+        corr_matrix = _weighted_corr(df_numeric, np.asarray(weights, dtype=np.float64))
+    else:
+        corr_matrix = df_numeric.corr(method=method)
     
     # Apply threshold if specified
     if threshold is not None:
@@ -111,6 +124,37 @@ def heatmap(
     return corr_matrix
 
 
+def _weighted_corr(df: pd.DataFrame, weights: np.ndarray) -> pd.DataFrame:
+    """
+    Weighted Pearson correlation with pairwise-complete observations.
+    
+    All pairwise weighted sums come from four matrix products over the
+    zero-filled values and their presence mask, so missing values are handled
+    without a per-pair loop. With unit weights this equals ``DataFrame.corr()``.
+    """
+    values = df.to_numpy(dtype=np.float64)
+    present = ~np.isnan(values)
+    filled = np.where(present, values, 0.0)
+    weighted_present = present * weights[:, None]
+    weighted = filled * weights[:, None]
+    
+    # Entry (i, j) sums over rows where both column i and column j are present
+    total = weighted_present.T @ present
+    sum_x = weighted.T @ present
+    sum_xx = (weighted * filled).T @ present
+    sum_xy = weighted.T @ filled
+    
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_x = sum_x / total
+        mean_y = mean_x.T
+        cov = sum_xy / total - mean_x * mean_y
+        var_x = sum_xx / total - mean_x ** 2
+        var_y = var_x.T
+        corr = np.clip(cov / np.sqrt(var_x * var_y), -1, 1)
+    
+    return pd.DataFrame(corr, index=df.columns, columns=df.columns)
+
+
 def top_correlations(
     df: pd.DataFrame,
     target: Optional[str] = None,
@@ -246,6 +290,150 @@ def remove_highly_correlated(
     return df_reduced, to_drop
 
 
+def _inverse_correlation(corr: np.ndarray) -> Tuple[np.ndarray, bool]:
+    """
+    Invert a correlation matrix via Cholesky, falling back to the pseudo-inverse.
+    
+    Returns the inverse and whether it is exact (False for the pseudo-inverse
+    of a singular or non positive definite matrix).
+    """
+    try:
+        chol = np.linalg.cholesky(corr)
+    except np.linalg.LinAlgError:
+        return np.linalg.pinv(corr, hermitian=True), False
+    
+    chol_inv = np.linalg.solve(chol, np.eye(len(corr)))
+    return chol_inv.T @ chol_inv, True
+
+
+def _vif_inputs(df: pd.DataFrame, method: str) -> Tuple[np.ndarray, List[str], List[str]]:
+    """Correlation matrix of the non-constant numeric columns plus column bookkeeping."""
+    df_numeric = df.select_dtypes(include=[np.number])
+    
+    if df_numeric.empty:
+        raise ValueError("No numeric columns found in DataFrame")
+    
+    constant = df_numeric.columns[df_numeric.nunique(dropna=True) <= 1].tolist()
+    if constant:
+        warnings.warn(f"VIF is undefined for constant columns: {constant}")
+    
+    columns = [c for c in df_numeric.columns if c not in constant]
+    corr = df_numeric[columns].corr(method=method).to_numpy()
+    
+    return corr, columns, constant
+
+
+def vif(
+    df: pd.DataFrame,
+    method: str = 'pearson'
+) -> pd.DataFrame:
+    """
+    Calculate the variance inflation factor (VIF) of every numeric feature.
+    
+    All VIFs are read off the diagonal of the inverted correlation matrix,
+    which is equivalent to regressing each feature on all the others but
+    needs a single matrix inversion instead of one regression per column.
+    
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Input DataFrame
+    method : str, default='pearson'
+        Correlation method: 'pearson', 'spearman', or 'kendall'
+        
+    Returns:
+    --------
+    pd.DataFrame
+        DataFrame with Feature and VIF columns, sorted by VIF (descending).
+        Constant columns get a VIF of NaN
+        
+    Example:
+    --------
+    >>> vif_table = correlation.vif(df)
+    >>> print(vif_table[vif_table['VIF'] > 10])
+    """
+    corr, columns, constant = _vif_inputs(df, method)
+    
+    vifs = np.array([])
+    if columns:
+        inverse, exact = _inverse_correlation(corr)
+        if not exact:
+            warnings.warn("Correlation matrix is singular; VIFs were computed from "
+                          "its pseudo-inverse and understate perfect collinearity")
+        vifs = np.diag(inverse)
+    
+    result = pd.DataFrame({
+        'Feature': columns + constant,
+        'VIF': np.concatenate([vifs, np.full(len(constant), np.nan)])
+    })
+    result = result.sort_values('VIF', ascending=False, na_position='last')
+    
+    return result.reset_index(drop=True)
+
+
+def remove_high_vif(
+    df: pd.DataFrame,
+    threshold: float = 10.0,
+    method: str = 'pearson'
+) -> Tuple[pd.DataFrame, List[str]]:
+    """
+    Iteratively remove the feature with the highest VIF until all VIFs are below a threshold.
+    
+    The correlation matrix is inverted once. After each removal the inverse
+    of the remaining features is obtained with a rank-one downdate, O(p^2)
+    per step instead of re-inverting at O(p^3).
+    
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Input DataFrame
+    threshold : float, default=10.0
+        Features are removed until every remaining VIF is below this value
+    method : str, default='pearson'
+        Correlation method: 'pearson', 'spearman', or 'kendall'
+        
+    Returns:
+    --------
+    tuple
+        (DataFrame with columns removed, List of removed column names in removal order)
+        
+    Example:
+    --------
+    >>> df_reduced, removed = correlation.remove_high_vif(df, threshold=5)
+    >>> print(f"Removed {len(removed)} features: {removed}")
+    """
+    corr, columns, _ = _vif_inputs(df, method)
+    
+    active = np.arange(len(columns))
+    to_drop = []
+    
+    if len(active) > 0:
+        inverse, exact = _inverse_correlation(corr)
+    
+    while len(active) > 1:
+        vifs = np.diag(inverse)
+        worst = int(np.argmax(vifs))
+        if vifs[worst] < threshold:
+            break
+        
+        to_drop.append(columns[active[worst]])
+        keep = np.arange(len(active)) != worst
+        active = active[keep]
+        
+        if exact:
+            # Inverse of a principal submatrix from the full inverse (Schur complement)
+            column = inverse[keep, worst]
+            inverse = inverse[np.ix_(keep, keep)] - np.outer(column, column) / inverse[worst, worst]
+        else:
+            inverse, exact = _inverse_correlation(corr[np.ix_(active, active)])
+    
+    df_reduced = df.drop(columns=to_drop)
+    
+    print(f"Removed {len(to_drop)} features with high VIF (threshold={threshold})")
+    
+    return df_reduced, to_drop
+
+
 def correlation_with_target(
     X: pd.DataFrame,
     y: pd.Series,
@@ -316,3 +504,170 @@ def correlation_with_target(
             warnings.warn("matplotlib or seaborn not available. Skipping plot.")
     
     return correlations
+
+
+def _rolling_corr(
+    a: np.ndarray,
+    b: np.ndarray,
+    window: int,
+    min_periods: int
+) -> np.ndarray:
+    """
+    Rolling Pearson correlation between matching columns of two 2-D arrays.
+    
+    Window sums are read off cumulative sums (one subtraction per window),
+    so the cost is O(n * p) regardless of the window length. Rows where
+    either side is NaN are excluded pairwise, like pandas does.
+    """
+    valid = ~(np.isnan(a) | np.isnan(b))
+    
+    # Centering keeps the cumulative sums small and limits cancellation
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', category=RuntimeWarning)
+        a = np.where(valid, a - np.nanmean(a, axis=0), 0.0)
+        b = np.where(valid, b - np.nanmean(b, axis=0), 0.0)
+    
+    def window_sums(values: np.ndarray) -> np.ndarray:
+        sums = np.cumsum(values, axis=0, dtype=np.float64)
+        sums[window:] -= sums[:-window].copy()
+        return sums
+    
+    count = window_sums(valid)
+    sum_a = window_sums(a)
+    sum_b = window_sums(b)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cov = window_sums(a * b) - sum_a * sum_b / count
+        sq_a = window_sums(a * a)
+        var_a = sq_a - sum_a ** 2 / count
+        sq_b = window_sums(b * b)
+        var_b = sq_b - sum_b ** 2 / count
+        corr = cov / np.sqrt(var_a * var_b)
+    
+    # Constant windows come out as rounding noise rather than exact zeros
+    degenerate = (var_a <= 1e-12 * sq_a) | (var_b <= 1e-12 * sq_b)
+    corr[(count < min_periods) | degenerate] = np.nan
+    
+    return np.clip(corr, -1.0, 1.0)
+
+
+def rolling_with_target(
+    X: pd.DataFrame,
+    y: Union[pd.Series, np.ndarray],
+    window: int,
+    min_periods: Optional[int] = None
+) -> pd.DataFrame:
+    """
+    Calculate rolling (sliding window) Pearson correlations with the target.
+    
+    All features are processed at once from running sums and co-moments,
+    so each window update is O(1) per feature instead of recomputing the
+    moments for every window as ``X[col].rolling(window).corr(y)`` does.
+    
+    Parameters:
+    -----------
+    X : pd.DataFrame
+        Feature DataFrame, rows ordered in time
+    y : pd.Series or np.ndarray
+        Target variable, aligned by position with X
+    window : int
+        Number of observations in each window
+    min_periods : int, optional
+        Minimum number of valid observations required to produce a value.
+        If None, defaults to window
+        
+    Returns:
+    --------
+    pd.DataFrame
+        Rolling correlations with the same index as X and one column per
+        numeric feature
+        
+    Example:
+    --------
+    >>> rolling_corr = correlation.rolling_with_target(X, y, window=60)
+    """
+    if window < 1:
+        raise ValueError("window must be a positive integer")
+    if min_periods is None:
+        min_periods = window
+    
+    X_numeric = X.select_dtypes(include=[np.number])
+    
+    if X_numeric.empty:
+        raise ValueError("No numeric columns found in DataFrame")
+    
+    y_values = np.asarray(y, dtype=np.float64)
+    if len(y_values) != len(X_numeric):
+        raise ValueError("X and y must have the same number of rows")
+    
+    values = X_numeric.to_numpy(dtype=np.float64)
+    target = np.broadcast_to(y_values[:, None], values.shape)
+    
+    corr = _rolling_corr(values, target, window, min_periods)
+    
+    return pd.DataFrame(corr, index=X.index, columns=X_numeric.columns)
+
+
+def rolling_pairwise(
+    df: pd.DataFrame,
+    window: int,
+    min_periods: Optional[int] = None,
+    pairs: Optional[List[Tuple[str, str]]] = None
+) -> pd.DataFrame:
+    """
+    Calculate rolling (sliding window) Pearson correlations between feature pairs.
+    
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Input DataFrame, rows ordered in time
+    window : int
+        Number of observations in each window
+    min_periods : int, optional
+        Minimum number of valid observations required to produce a value.
+        If None, defaults to window
+    pairs : list of tuple, optional
+        Feature pairs to compute. If None, uses every pair of numeric columns
+        
+    Returns:
+    --------
+    pd.DataFrame
+        Rolling correlations with the same index as df and one column per
+        pair, labelled by a (Feature_1, Feature_2) MultiIndex
+        
+    Example:
+    --------
+    >>> rolling_corr = correlation.rolling_pairwise(df, window=60)
+    >>> rolling_corr[('price', 'volume')].plot()
+    """
+    if window < 1:
+        raise ValueError("window must be a positive integer")
+    if min_periods is None:
+        min_periods = window
+    
+    df_numeric = df.select_dtypes(include=[np.number])
+    
+    if df_numeric.empty:
+        raise ValueError("No numeric columns found in DataFrame")
+    
+    columns = df_numeric.columns
+    if pairs is None:
+        pairs = [(columns[i], columns[j])
+                 for i in range(len(columns))
+                 for j in range(i + 1, len(columns))]
+    
+    missing_cols = {c for pair in pairs for c in pair} - set(columns)
+    if missing_cols:
+        raise ValueError(f"Columns not found or not numeric: {sorted(missing_cols)}")
+    
+    values = df_numeric.to_numpy(dtype=np.float64)
+    left = columns.get_indexer([p[0] for p in pairs])
+    right = columns.get_indexer([p[1] for p in pairs])
+    
+    corr = _rolling_corr(values[:, left], values[:, right], window, min_periods)
+    
+    return pd.DataFrame(
+        corr,
+        index=df.index,
+        columns=pd.MultiIndex.from_tuples(pairs, names=['Feature_1', 'Feature_2'])
+    )
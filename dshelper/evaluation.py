@@ -17,7 +17,8 @@ def quick_eval(
     task_type: str = 'auto',
     show_plot: bool = True,
     figsize: tuple = (12, 5),
-    labels: Optional[List[str]] = None
+    labels: Optional[List[str]] = None,
+    y_score: Optional[Union[np.ndarray, pd.DataFrame, pd.Series, List]] = None
 ) -> Dict[str, Any]:
     """
     Quick evaluation of model predictions with comprehensive metrics.
@@ -36,6 +37,13 @@ def quick_eval(
         Figure size for plots
     labels : list, optional
         Class labels for classification tasks
+    y_score : array-like, optional
+        Predicted scores for classification, e.g. ``predict_proba`` output:
+        shape (n_samples,) with the positive-class score for binary targets, or
+        (n_samples, n_classes) with columns in sorted class order. Used for
+        ROC AUC (one-vs-rest macro average for multiclass), PR AUC (average
+        precision), log loss and Brier score; the last two need probabilities.
+        float32 scores are not upcast
         
     Returns:
     --------
@@ -47,6 +55,9 @@ def quick_eval(
     >>> from dshelper import evaluation
     >>> metrics = evaluation.quick_eval(y_test, y_pred)
     >>> print(f"Accuracy: {metrics['accuracy']:.3f}")
+    >>> metrics = evaluation.quick_eval(y_test, model.predict(X_test),
+    ...                                 y_score=model.predict_proba(X_test))
+    >>> print(f"Log loss: {metrics['log_loss']:.3f}")
     """
     y_true = np.array(y_true)
     y_pred = np.array(y_pred)
@@ -61,8 +72,10 @@ def quick_eval(
         print(f"Auto-detected task type: {task_type}")
     
     if task_type == 'classification':
-        return _eval_classification(y_true, y_pred, show_plot, figsize, labels)
+        return _eval_classification(y_true, y_pred, show_plot, figsize, labels, y_score)
     elif task_type == 'regression':
+        if y_score is not None:
+            raise ValueError("y_score is only supported for classification")
         return _eval_regression(y_true, y_pred, show_plot, figsize)
     else:
         raise ValueError(f"Unknown task_type: {task_type}")
@@ -73,37 +86,66 @@ def _eval_classification(
     y_pred: np.ndarray,
     show_plot: bool,
     figsize: tuple,
-    labels: Optional[List[str]]
+    labels: Optional[List[str]],
+    y_score: Optional[Union[np.ndarray, pd.DataFrame, pd.Series, List]] = None
 ) -> Dict[str, Any]:
-    """Internal function for classification evaluation."""
-    from sklearn.metrics import (
-        accuracy_score, precision_score, recall_score, f1_score,
-        confusion_matrix, classification_report, roc_auc_score
-    )
+    """Internal function for classification evaluation.
+    
+    Every metric and the report are derived from one confusion matrix, built
+    with a single factorization of the labels and one bincount.
+    """
+    classes, cm = _confusion_matrix(y_true, y_pred)
+    precision_c, recall_c, f1_c, support = _per_class_scores(cm)
     
     # Calculate metrics
-    accuracy = accuracy_score(y_true, y_pred)
+    accuracy = float(np.trace(cm) / cm.sum())
     
     # Handle binary vs multiclass
-    average_method = 'binary' if len(np.unique(y_true)) == 2 else 'weighted'
-    
-    precision = precision_score(y_true, y_pred, average=average_method, zero_division=0)
-    recall = recall_score(y_true, y_pred, average=average_method, zero_division=0)
-    f1 = f1_score(y_true, y_pred, average=average_method, zero_division=0)
-    
-    # Confusion matrix
-    cm = confusion_matrix(y_true, y_pred)
+    if (support > 0).sum() == 2:
+        # Same rules as sklearn's average='binary' with pos_label=1
+        if len(classes) > 2:
+            raise ValueError("Target is multiclass but average='binary'. Please choose "
+                             "another average setting, one of [None, 'micro', 'macro', "
+                             "'weighted'].")
+        positive = np.flatnonzero(classes == 1)
+        if len(positive) == 0:
+            raise ValueError(f"pos_label=1 is not a valid label. "
+                             f"It should be one of {list(classes)}")
+        precision = float(precision_c[positive[0]])
+        recall = float(recall_c[positive[0]])
+        f1 = float(f1_c[positive[0]])
+    else:
+        precision = float(np.average(precision_c, weights=support))
+        recall = float(np.average(recall_c, weights=support))
+        f1 = float(np.average(f1_c, weights=support))
     
     # Classification report
-    report = classification_report(y_true, y_pred, zero_division=0, output_dict=True)
+    report = {}
+    for label, p, r, f, n in zip(classes, precision_c, recall_c, f1_c, support):
+        report['%s' % label] = {'precision': float(p), 'recall': float(r),
+                                'f1-score': float(f), 'support': float(n)}
+    report['accuracy'] = accuracy
+    report['macro avg'] = {
+        'precision': float(np.average(precision_c)), 'recall': float(np.average(recall_c)),
+        'f1-score': float(np.average(f1_c)), 'support': float(support.sum())
+    }
+    report['weighted avg'] = {
+        'precision': float(np.average(precision_c, weights=support)),
+        'recall': float(np.average(recall_c, weights=support)),
+        'f1-score': float(np.average(f1_c, weights=support)), 'support': float(support.sum())
+    }
     
-    # Try to calculate ROC AUC for binary classification
+    # ROC AUC of the hard predictions for binary classification: one ROC point
     roc_auc = None
-    if len(np.unique(y_true)) == 2:
-        try:
-            roc_auc = roc_auc_score(y_true, y_pred)
-        except:
-            pass
+    if (support > 0).sum() == 2 and len(classes) == 2 and np.issubdtype(y_pred.dtype, np.number):
+        tpr = cm[1, 1] / cm[1].sum()
+        fpr = cm[0, 1] / cm[0].sum()
+        roc_auc = float(fpr * tpr / 2.0 + (1 - fpr) * (tpr + 1) / 2.0)
+    
+    # Threshold-free metrics from the scores replace the hard-label AUC
+    pr_auc = loss = brier = None
+    if y_score is not None:
+        roc_auc, pr_auc, loss, brier = _score_metrics(y_true, y_score)
     
     # Print summary
     print("\n" + "="*50)
@@ -115,6 +157,11 @@ def _eval_classification(
     print(f"F1 Score:  {f1:.4f}")
     if roc_auc:
         print(f"ROC AUC:   {roc_auc:.4f}")
+    if pr_auc is not None:
+        print(f"PR AUC:    {pr_auc:.4f}")
+    if loss is not None:
+        print(f"Log Loss:  {loss:.4f}")
+        print(f"Brier:     {brier:.4f}")
     print("="*50 + "\n")
     
     # Visualization
@@ -141,8 +188,10 @@ def _eval_classification(
             }
             if roc_auc:
                 metrics_dict['ROC AUC'] = roc_auc
+            if pr_auc is not None:
+                metrics_dict['PR AUC'] = pr_auc
             
-            colors = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd']
+            colors = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd', '#8c564b']
             axes[1].bar(metrics_dict.keys(), metrics_dict.values(), color=colors[:len(metrics_dict)])
             axes[1].set_ylim(0, 1)
             axes[1].set_title('Performance Metrics', fontsize=14, fontweight='bold')
@@ -164,11 +213,119 @@ def _eval_classification(
         'recall': recall,
         'f1_score': f1,
         'roc_auc': roc_auc,
+        'pr_auc': pr_auc,
+        'log_loss': loss,
+        'brier_score': brier,
         'confusion_matrix': cm,
         'classification_report': report
     }
 
 
+def _confusion_matrix(y_true: np.ndarray, y_pred: np.ndarray):
+    """Sorted class labels (union of y_true and y_pred) and the confusion matrix."""
+    n_samples = len(y_true)
+    codes, classes = pd.factorize(np.concatenate([y_true, y_pred]), sort=True)
+    # Missing labels get code -1, which would land in a wrong cell of the matrix
+    for name, part in (('y_true', codes[:n_samples]), ('y_pred', codes[n_samples:])):
+        if (part < 0).any():
+            raise ValueError(f"Input {name} contains NaN.")
+    n_classes = len(classes)
+    cm = np.bincount(codes[:n_samples] * n_classes + codes[n_samples:],
+                     minlength=n_classes * n_classes).reshape(n_classes, n_classes)
+    return np.asarray(classes), cm
+
+
+def _per_class_scores(cm: np.ndarray):
+    """Per-class precision, recall, F1 and support from a confusion matrix (0 where undefined)."""
+    tp = np.diag(cm).astype(np.float64)
+    support = cm.sum(axis=1)
+    predicted = cm.sum(axis=0)
+    
+    def divide(numerator, denominator):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            safe = np.where(denominator > 0, denominator, 1)
+            return np.where(denominator > 0, numerator / safe, 0.0)
+    
+    precision = divide(tp, predicted)
+    recall = divide(tp, support)
+    f1 = divide(2 * tp, support + predicted)
+    return precision, recall, f1, support
+
+
+def _score_metrics(y_true: np.ndarray, y_score):
+    """
+    ROC AUC, PR AUC, log loss and Brier score from binary or (n, k) scores.
+    
+    Scores keep their float dtype. Log loss and Brier score are None when the
+    scores are not probabilities (outside [0, 1]).
+    """
+    y_score = np.asarray(y_score)
+    if not np.issubdtype(y_score.dtype, np.floating):
+        y_score = y_score.astype(np.float64)
+    if y_score.ndim == 2 and y_score.shape[1] == 1:
+        y_score = y_score[:, 0]
+    if len(y_score) != len(y_true):
+        raise ValueError(f"y_score has {len(y_score)} rows but y_true has {len(y_true)}")
+    
+    codes, classes = pd.factorize(y_true, sort=True)
+    n_classes = len(classes)
+    
+    if y_score.ndim == 1:
+        if n_classes != 2:
+            raise ValueError("1-D y_score needs a binary target; pass an "
+                             "(n_samples, n_classes) score matrix for multiclass")
+        positive = codes == 1
+        roc_auc, pr_auc = _ranking_scores(y_score, positive)
+        p_true = np.where(positive, y_score, 1 - y_score)
+        squared_error = np.sum(np.square(y_score - positive), dtype=np.float64)
+    else:
+        if y_score.shape[1] != n_classes:
+            raise ValueError(f"y_score has {y_score.shape[1]} columns but y_true has "
+                             f"{n_classes} classes")
+        # One argsort per class (one-vs-rest), then the macro average
+        columns = [1] if n_classes == 2 else range(n_classes)
+        curves = [_ranking_scores(y_score[:, c], codes == c) for c in columns]
+        roc_auc = float(np.mean([curve[0] for curve in curves]))
+        pr_auc = float(np.mean([curve[1] for curve in curves]))
+        p_true = y_score[np.arange(len(codes)), codes]
+        # sum_k (onehot_k - p_k)^2 = sum_k p_k^2 - 2 p_true + 1, without the one-hot matrix
+        squared_error = (np.einsum('ij,ij->', y_score, y_score, dtype=np.float64)
+                         - 2 * np.sum(p_true, dtype=np.float64) + len(codes))
+        if n_classes == 2:
+            squared_error /= 2
+    
+    if len(y_score) == 0 or y_score.min() < 0 or y_score.max() > 1:
+        return roc_auc, pr_auc, None, None
+    
+    eps = np.finfo(y_score.dtype).eps
+    loss = -np.mean(np.log(np.clip(p_true, eps, 1 - eps)), dtype=np.float64)
+    return roc_auc, pr_auc, float(loss), float(squared_error / len(codes))
+
+
+def _ranking_scores(score: np.ndarray, positive: np.ndarray):
+    """
+    ROC AUC and average precision of one score column from a single argsort.
+    
+    Tied scores form a single threshold, so ties add a diagonal ROC segment
+    and one precision-recall point.
+    """
+    order = np.argsort(score, kind='mergesort')[::-1]
+    sorted_score = score[order]
+    
+    # Last position of each run of equal scores
+    thresholds = np.r_[np.flatnonzero(np.diff(sorted_score)), len(score) - 1]
+    tps = np.cumsum(positive[order])[thresholds]
+    fps = thresholds + 1 - tps
+    if tps[-1] == 0 or fps[-1] == 0:
+        raise ValueError("Scores need both positive and negative samples for every class")
+    
+    tpr = np.r_[0, tps] / tps[-1]
+    fpr = np.r_[0, fps] / fps[-1]
+    roc_auc = np.sum(np.diff(fpr) * (tpr[1:] + tpr[:-1]) / 2.0)
+    average_precision = np.sum(np.diff(tpr) * (tps / (tps + fps)))
+    return float(roc_auc), float(average_precision)
+
+
 def _eval_regression(
     y_true: np.ndarray,
     y_pred: np.ndarray,
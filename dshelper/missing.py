@@ -9,27 +9,40 @@ import pandas as pd
 import numpy as np
 from typing import Union, Optional, Dict, List
 import warnings
+from pathlib import Path
+
+from dshelper import _arrow, _parallel
 
 
 def analyze(
-    df: pd.DataFrame,
+    df: Union[pd.DataFrame, str, Path],
     threshold: float = 0.0,
     show_plot: bool = True,
-    figsize: tuple = (10, 6)
+    figsize: tuple = (10, 6),
+    columns: Optional[List[str]] = None,
+    weights: Optional[Union[str, np.ndarray, pd.Series]] = None
 ) -> pd.DataFrame:
     """
     Analyze missing values in a DataFrame and generate a comprehensive report.
     
     Parameters:
     -----------
-    df : pd.DataFrame
-        Input DataFrame to analyze
+    df : pd.DataFrame, pyarrow.Table or str
+        Input DataFrame to analyze, or a Table / Parquet path (requires pyarrow).
+        Arrow input is never converted to pandas: null counts come from the
+        validity bitmaps
     threshold : float, default=0.0
         Only show columns with missing percentage above this threshold (0-100)
     show_plot : bool, default=True
         Whether to display a visualization of missing values
     figsize : tuple, default=(10, 6)
         Figure size for the plot
+    columns : list, optional
+        Columns to analyze. For Parquet paths only these columns are read
+    weights : str or array-like, optional
+        Row weights (or the name of a weight column, which is then excluded),
+        e.g. 'sample_weight' from ``preprocessing.sample``. Counts and
+        percentages are then weighted estimates for the full data
         
     Returns:
     --------
@@ -47,19 +60,39 @@ def analyze(
     >>> from dshelper import missing
     >>> df = pd.DataFrame({'A': [1, 2, None], 'B': [4, None, None]})
     >>> report = missing.analyze(df)
+    >>> report = missing.analyze('events.parquet', columns=['user_id', 'amount'])
+    >>> report = missing.analyze(df_sample, weights='sample_weight')
     """
-    if not isinstance(df, pd.DataFrame):
-        raise TypeError("Input must be a pandas DataFrame")
+    if weights is not None and not isinstance(df, pd.DataFrame):
+        raise ValueError("weights are only supported for DataFrame input")
+    
+    if _arrow.is_arrow_source(df):
+        table = _arrow.read_table(df, columns)
+        missing_count, dtypes = _arrow.missing_counts(table)
+        n_rows = table.num_rows
+    elif isinstance(df, pd.DataFrame):
+        if isinstance(weights, str):
+            df, weights = df.drop(columns=weights), df[weights]
+        if columns is not None:
+            df = df[columns]
+        if weights is not None:
+            weights = np.asarray(weights, dtype=np.float64)
+            missing_count = pd.Series(weights @ df.isnull().to_numpy(), index=df.columns)
+            n_rows = weights.sum()
+        else:
+            missing_count = df.isnull().sum()
+            n_rows = len(df)
+        dtypes = df.dtypes
+    else:
+        raise TypeError("Input must be a pandas DataFrame, a pyarrow.Table or a Parquet path")
     
     # Calculate missing statistics
-    missing_count = df.isnull().sum()
-    missing_percent = (missing_count / len(df)) * 100
-    dtypes = df.dtypes
-    non_missing = df.notnull().sum()
+    missing_percent = (missing_count / n_rows) * 100
+    non_missing = n_rows - missing_count
     
     # Create report DataFrame
     report = pd.DataFrame({
-        'Column': df.columns,
+        'Column': missing_count.index,
         'Missing_Count': missing_count.values,
         'Missing_Percent': missing_percent.values,
         'Non_Missing_Count': non_missing.values,
@@ -194,7 +227,8 @@ def fill_missing(
     strategy: str = 'mean',
     columns: Optional[List[str]] = None,
     fill_value: Optional[Union[int, float, str]] = None,
-    inplace: bool = False
+    inplace: bool = False,
+    n_jobs: Optional[int] = None
 ) -> pd.DataFrame:
     """
     Fill missing values using various strategies.
@@ -211,45 +245,76 @@ def fill_missing(
         Value to use when strategy='constant'
     inplace : bool, default=False
         If True, modify the DataFrame in place
+    n_jobs : int, optional
+        Number of threads filling groups of columns in parallel (-1 for all cores).
+        The result does not depend on n_jobs
         
     Returns:
     --------
     pd.DataFrame
-        DataFrame with missing values filled
+        DataFrame with missing values filled. Under pandas copy-on-write only the
+        filled columns are new arrays; otherwise the result is a full copy
         
     Example:
     --------
     >>> # Fill missing values with median
     >>> df_filled = missing.fill_missing(df, strategy='median')
+    >>> df_filled = missing.fill_missing(df_large, strategy='mode', n_jobs=-1)
     """
-    if not inplace:
-        df = df.copy()
-    
-    cols_to_fill = columns if columns else df.columns.tolist()
+    if strategy not in ('mean', 'median', 'mode', 'forward', 'backward', 'constant'):
+        raise ValueError(f"Unknown strategy: {strategy}")
+    if strategy == 'constant' and fill_value is None:
+        raise ValueError("fill_value must be provided when strategy='constant'")
     
-    for col in cols_to_fill:
+    cols_to_fill = []
+    for col in (columns if columns else df.columns.tolist()):
         if col not in df.columns:
             warnings.warn(f"Column '{col}' not found in DataFrame. Skipping.")
             continue
-            
-        if strategy == 'mean':
-            if df[col].dtype in ['float64', 'float32', 'int64', 'int32']:
-                df[col].fillna(df[col].mean(), inplace=True)
-        elif strategy == 'median':
-            if df[col].dtype in ['float64', 'float32', 'int64', 'int32']:
-                df[col].fillna(df[col].median(), inplace=True)
-        elif strategy == 'mode':
-            if not df[col].mode().empty:
-                df[col].fillna(df[col].mode()[0], inplace=True)
-        elif strategy == 'forward':
-            df[col].fillna(method='ffill', inplace=True)
-        elif strategy == 'backward':
-            df[col].fillna(method='bfill', inplace=True)
-        elif strategy == 'constant':
-            if fill_value is None:
-                raise ValueError("fill_value must be provided when strategy='constant'")
-            df[col].fillna(fill_value, inplace=True)
-        else:
-            raise ValueError(f"Unknown strategy: {strategy}")
+        cols_to_fill.append(col)
+    
+    def fill_group(group):
+        return [(col, _fill_column(df[col], strategy, fill_value)) for col in group]
+    
+    filled = _parallel.map_column_groups(fill_group, cols_to_fill, n_jobs)
+    
+    # Filled columns are assigned back in column order (chained inplace fills
+    # are no-ops under copy-on-write); with copy-on-write untouched columns are not copied
+    result = df if inplace else _parallel.output_frame(df)
+    for col, series in filled:
+        if series is not None:
+            result[col] = series
     
-    return df
+    return result
+
+
+def _fill_column(
+    series: pd.Series,
+    strategy: str,
+    fill_value: Optional[Union[int, float, str]]
+) -> Optional[pd.Series]:
+    """Filled copy of one column (keeping compact dtypes), or None if it has nothing to fill."""
+    if not series.isna().any():
+        return None
+    
+    if strategy in ('mean', 'median'):
+        if not _is_fillable_numeric(series):
+            return None
+        return series.fillna(series.mean() if strategy == 'mean' else series.median())
+    if strategy == 'mode':
+        mode = series.mode()
+        return None if mode.empty else series.fillna(mode[0])
+    if strategy == 'forward':
+        return series.ffill()
+    if strategy == 'backward':
+        return series.bfill()
+    return series.fillna(fill_value)
+
+
+def _is_fillable_numeric(series: pd.Series) -> bool:
+    """True for numeric columns of any width (int8 ... float64) that can hold a mean/median fill."""
+    dtype = series.dtype
+    if not pd.api.types.is_numeric_dtype(dtype) or pd.api.types.is_bool_dtype(dtype):
+        return False
+    # Nullable integers (Int64, ...) cannot hold a fractional fill and are skipped
+    return isinstance(dtype, np.dtype) or not pd.api.types.is_integer_dtype(dtype)
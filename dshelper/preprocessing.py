@@ -8,42 +8,83 @@ splitting, and encoding.
 
 import pandas as pd
 import numpy as np
-from typing import Optional, Tuple, Union, List
+from typing import Optional, Tuple, Union, List, Iterable, Iterator
+from scipy import sparse as sp
 from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import StandardScaler, MinMaxScaler, RobustScaler
+from sklearn.preprocessing import StandardScaler, MinMaxScaler, RobustScaler, MaxAbsScaler
 import warnings
+from pathlib import Path
+from collections import OrderedDict
+
+from dshelper import _arrow, _parallel
+
+
+# Rows per partial_fit call when fitting scalers incrementally
+_FIT_CHUNK_SIZE = 100_000
+
+# Isolation forest: rows used for fitting and rows scored per parallel task
+_IFOREST_FIT_ROWS = 100_000
+_SCORE_CHUNK_SIZE = 100_000
 
 
 def split_and_scale(
-    X: Union[pd.DataFrame, np.ndarray],
-    y: Union[pd.Series, np.ndarray],
+    X: Union[pd.DataFrame, np.ndarray, sp.spmatrix, str, Path],
+    y: Union[pd.Series, np.ndarray, str],
     test_size: float = 0.2,
     random_state: Optional[int] = 42,
     scaler: str = 'standard',
-    stratify: bool = False
+    stratify: bool = False,
+    dtype: Optional[type] = None,
+    copy: bool = True,
+    columns: Optional[List[str]] = None
 ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
     """
     Split data into train/test sets and apply scaling in one step.
     
+    Memory budget: with ``copy=False`` and X already a NumPy array of the
+    requested dtype, the split arrays are scaled in place and peak additional
+    memory stays below 1.5x the size of X (the train and test splits plus
+    chunk-sized temporaries while the scaler is fitted), for X much larger
+    than the 100,000-row fitting chunk. With ``copy=True`` (default) the
+    scaled outputs are separate copies, about 2x.
+    
+    scipy.sparse input is split by rows and scaled in CSR format without
+    densifying, so memory follows the number of non-zeros: 'standard' skips
+    centering, 'robust' skips centering and 'minmax' becomes MaxAbs scaling
+    (all of which keep zeros at zero).
+    
+    A ``pyarrow.Table`` or Parquet path is read without going through pandas:
+    only the feature and target columns are loaded (projection pushdown) and
+    each Arrow buffer is copied once, zero-copy viewed, into the feature array.
+    
     Parameters:
     -----------
-    X : pd.DataFrame or np.ndarray
-        Feature matrix
-    y : pd.Series or np.ndarray
-        Target variable
+    X : pd.DataFrame, np.ndarray, scipy.sparse matrix, pyarrow.Table or str
+        Feature matrix, or a Table / Parquet path (requires pyarrow)
+    y : pd.Series, np.ndarray or str
+        Target variable, or the name of the target column of an Arrow/Parquet X
     test_size : float, default=0.2
         Proportion of dataset to include in test split
     random_state : int, optional, default=42
         Random seed for reproducibility
     scaler : str, default='standard'
-        Type of scaler: 'standard', 'minmax', 'robust', or 'none'
+        Type of scaler: 'standard', 'minmax', 'robust', 'maxabs', or 'none'
     stratify : bool, default=False
         Whether to stratify split based on target variable
+    dtype : type, optional
+        Data type for the feature arrays, e.g. np.float32 to halve memory.
+        If None, keeps the input dtype (integers are promoted to float64 by scaling)
+    copy : bool, default=True
+        If False, the split arrays are scaled in place instead of being copied
+    columns : list, optional
+        Feature columns to read from an Arrow/Parquet X. If None, all columns
+        except the target
         
     Returns:
     --------
     tuple
-        (X_train_scaled, X_test_scaled, y_train, y_test)
+        (X_train_scaled, X_test_scaled, y_train, y_test); the feature arrays
+        are CSR matrices for sparse input
         
     Example:
     --------
@@ -51,13 +92,22 @@ def split_and_scale(
     >>> X_train, X_test, y_train, y_test = preprocessing.split_and_scale(
     ...     X, y, test_size=0.3, scaler='minmax'
     ... )
+    >>> X_train, X_test, y_train, y_test = preprocessing.split_and_scale(X_tfidf, y)  # CSR
+    >>> X_train, X_test, y_train, y_test = preprocessing.split_and_scale(
+    ...     'data.parquet', y='label', columns=['age', 'income']
+    ... )
     """
-    # Convert to numpy if needed
-    if isinstance(X, pd.DataFrame):
-        X_values = X.values
+    # Convert to numpy if needed (a single conversion straight to the target dtype)
+    if _arrow.is_arrow_source(X):
+        X_values, y, feature_names = _arrow.features_and_target(X, y, columns, dtype)
+    elif isinstance(X, pd.DataFrame):
+        X_values = X.to_numpy(dtype=dtype)
         feature_names = X.columns.tolist()
+    elif sp.issparse(X):
+        X_values = sp.csr_matrix(X, dtype=dtype)
+        feature_names = None
     else:
-        X_values = X
+        X_values = np.asarray(X, dtype=dtype)
         feature_names = None
     
     if isinstance(y, pd.Series):
@@ -73,29 +123,369 @@ def split_and_scale(
         random_state=random_state,
         stratify=stratify_param
     )
+    # Release the converted copy of X (if one was made) before scaling
+    del X_values
     
-    # Apply scaling
+    # Apply scaling; centering (or shifting to a minimum) would densify sparse input
+    is_sparse = sp.issparse(X_train)
     if scaler.lower() == 'standard':
-        scaler_obj = StandardScaler()
-    elif scaler.lower() == 'minmax':
-        scaler_obj = MinMaxScaler()
+        scaler_obj = StandardScaler(copy=copy, with_mean=not is_sparse)
+    elif scaler.lower() == 'minmax' and not is_sparse:
+        scaler_obj = MinMaxScaler(copy=copy)
+    elif scaler.lower() in ('minmax', 'maxabs'):
+        scaler_obj = MaxAbsScaler(copy=copy)
     elif scaler.lower() == 'robust':
-        scaler_obj = RobustScaler()
+        scaler_obj = RobustScaler(copy=copy, with_centering=not is_sparse)
     elif scaler.lower() == 'none':
         return X_train, X_test, y_train, y_test
     else:
-        raise ValueError(f"Unknown scaler type: {scaler}. Use 'standard', 'minmax', 'robust', or 'none'")
+        raise ValueError(f"Unknown scaler type: {scaler}. "
+                         "Use 'standard', 'minmax', 'robust', 'maxabs', or 'none'")
     
-    # Fit on training data only
-    X_train_scaled = scaler_obj.fit_transform(X_train)
+    # Fit on training data only, in row chunks where supported so the scaler's
+    # float64 accumulators never allocate a temporary the size of X_train
+    if hasattr(scaler_obj, 'partial_fit'):
+        for start in range(0, X_train.shape[0], _FIT_CHUNK_SIZE):
+            scaler_obj.partial_fit(X_train[start:start + _FIT_CHUNK_SIZE])
+    else:
+        scaler_obj.fit(X_train)
+    X_train_scaled = scaler_obj.transform(X_train)
     X_test_scaled = scaler_obj.transform(X_test)
     
-    print(f"✓ Data split: Train={len(X_train)}, Test={len(X_test)}")
-    print(f"✓ Scaling applied: {scaler.capitalize()}Scaler")
+    print(f"✓ Data split: Train={X_train.shape[0]}, Test={X_test.shape[0]}")
+    print(f"✓ Scaling applied: {type(scaler_obj).__name__}")
     
     return X_train_scaled, X_test_scaled, y_train, y_test
 
 
+def split_indices(
+    X: Union[pd.DataFrame, np.ndarray],
+    y: Optional[Union[pd.Series, np.ndarray]] = None,
+    test_size: float = 0.2,
+    random_state: Optional[int] = 42,
+    stratify: bool = False,
+    group_by: Optional[Union[str, np.ndarray, pd.Series]] = None,
+    time_column: Optional[Union[str, np.ndarray, pd.Series]] = None,
+    gap: Union[int, float, pd.Timedelta] = 0
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compute a train/test split as positional index arrays, without copying any data.
+    
+    - Default: random (optionally stratified) split, the same one split_and_scale uses.
+    - group_by: group-disjoint split. Each group is assigned by a vectorized hash
+      of its key, so the assignment is deterministic, stable across runs and
+      unchanged when new rows or groups are added (test_size is then the
+      expected fraction of groups).
+    - time_column: time-ordered split. The latest test_size fraction of rows is
+      the test set, and training rows closer than gap to the first test time are
+      dropped. Combined with group_by, groups that reach into the test period
+      are removed from the training set.
+    
+    Parameters:
+    -----------
+    X : pd.DataFrame or np.ndarray
+        Feature matrix (only used for its length and named columns)
+    y : pd.Series or np.ndarray, optional
+        Target variable, needed when stratify=True
+    test_size : float, default=0.2
+        Proportion of rows (or groups) to include in the test split
+    random_state : int, optional, default=42
+        Random seed; for group splits it salts the group hash
+    stratify : bool, default=False
+        Whether to stratify a random split based on the target variable
+    group_by : str or array-like, optional
+        Column name in X, or per-row group keys
+    time_column : str or array-like, optional
+        Column name in X, or per-row timestamps
+    gap : int, float or pd.Timedelta, default=0
+        Minimum distance in time units (e.g. pd.Timedelta('7D') or a number)
+        between the last training row and the first test row
+        
+    Returns:
+    --------
+    tuple
+        (train_idx, test_idx) positional index arrays, usable as X[train_idx]
+        or df.iloc[train_idx]
+        
+    Example:
+    --------
+    >>> train_idx, test_idx = preprocessing.split_indices(df, group_by='customer_id')
+    >>> train_idx, test_idx = preprocessing.split_indices(
+    ...     df, time_column='date', gap=pd.Timedelta('7D')
+    ... )
+    """
+    n_rows = X.shape[0]
+    
+    def column(key):
+        if isinstance(key, str) and isinstance(X, pd.DataFrame):
+            return X[key].to_numpy()
+        values = np.asarray(key)
+        if len(values) != n_rows:
+            raise ValueError("Group keys and timestamps must have one value per row")
+        return values
+    
+    groups = column(group_by) if group_by is not None else None
+    
+    if time_column is not None:
+        times = column(time_column)
+        order = np.argsort(times, kind='stable')
+        cutoff = times[order[min(int(np.floor(n_rows * (1 - test_size))), n_rows - 1)]]
+        boundary = cutoff - gap if gap else cutoff
+        
+        test_mask = times >= cutoff
+        train_mask = times < boundary
+        if groups is not None:
+            train_mask &= ~pd.Index(groups).isin(pd.unique(groups[test_mask]))
+        
+        train_idx = order[train_mask[order]]
+        test_idx = order[test_mask[order]]
+    elif groups is not None:
+        hash_kwargs = {} if random_state is None else {'hash_key': f'{random_state:016d}'[-16:]}
+        hashes = pd.util.hash_array(np.asarray(groups, dtype=object), **hash_kwargs)
+        test_mask = (hashes % np.uint64(10_000)) < np.uint64(round(test_size * 10_000))
+        train_idx = np.flatnonzero(~test_mask)
+        test_idx = np.flatnonzero(test_mask)
+    else:
+        stratify_param = np.asarray(y) if stratify else None
+        train_idx, test_idx = train_test_split(
+            np.arange(n_rows),
+            test_size=test_size,
+            random_state=random_state,
+            stratify=stratify_param
+        )
+    
+    return train_idx, test_idx
+
+
+def kfold_scaled(
+    X: Union[pd.DataFrame, np.ndarray],
+    y: Union[pd.Series, np.ndarray],
+    n_splits: int = 5,
+    shuffle: bool = True,
+    random_state: Optional[int] = 42,
+    stratify: bool = False,
+    dtype: type = np.float64
+) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Lazily yield standard-scaled K-fold cross-validation splits.
+    
+    Per-fold sums and sums of squares are computed in one pass. Each fold's
+    training mean and variance are then the global totals minus that fold's
+    own statistics, so no scaler is refitted (O(p) per fold instead of
+    O(n * p)). Folds are scaled into two output buffers that are reused for
+    every fold, so memory does not grow with n_splits.
+    
+    The yielded arrays are views into the reused buffers and are overwritten
+    by the next fold; copy them if they must outlive the iteration.
+    
+    Parameters:
+    -----------
+    X : pd.DataFrame or np.ndarray
+        Feature matrix
+    y : pd.Series or np.ndarray
+        Target variable
+    n_splits : int, default=5
+        Number of folds
+    shuffle : bool, default=True
+        Whether to shuffle rows before splitting into folds
+    random_state : int, optional, default=42
+        Random seed for reproducibility (used when shuffle=True)
+    stratify : bool, default=False
+        Whether to stratify folds based on target variable
+    dtype : type, default=np.float64
+        Data type of the scaled fold arrays
+        
+    Yields:
+    -------
+    tuple
+        (X_train_scaled, X_val_scaled, y_train, y_val) for each fold, scaled
+        exactly as a StandardScaler fitted on the fold's training rows
+        
+    Example:
+    --------
+    >>> for X_train, X_val, y_train, y_val in preprocessing.kfold_scaled(X, y, n_splits=5):
+    ...     model.fit(X_train, y_train)
+    ...     scores.append(model.score(X_val, y_val))
+    """
+    from sklearn.model_selection import KFold, StratifiedKFold
+    
+    X_values = X.to_numpy() if isinstance(X, pd.DataFrame) else np.asarray(X)
+    y_values = y.to_numpy() if isinstance(y, pd.Series) else np.asarray(y)
+    n_rows, n_features = X_values.shape
+    
+    splitter = (StratifiedKFold if stratify else KFold)(
+        n_splits=n_splits, shuffle=shuffle,
+        random_state=random_state if shuffle else None
+    )
+    fold_rows = [val_idx for _, val_idx in splitter.split(X_values, y_values)]
+    
+    # Per-fold moments around a global shift to limit cancellation
+    shift = X_values.mean(axis=0, dtype=np.float64)
+    fold_sums = np.empty((n_splits, n_features))
+    fold_squares = np.empty((n_splits, n_features))
+    for f, rows in enumerate(fold_rows):
+        block = X_values[rows] - shift
+        fold_sums[f] = block.sum(axis=0)
+        fold_squares[f] = np.einsum('ij,ij->j', block, block)
+    total_sum = fold_sums.sum(axis=0)
+    total_squares = fold_squares.sum(axis=0)
+    
+    fold_of_row = np.empty(n_rows, dtype=np.int64)
+    for f, rows in enumerate(fold_rows):
+        fold_of_row[rows] = f
+    
+    max_val = max(len(rows) for rows in fold_rows)
+    max_train = n_rows - min(len(rows) for rows in fold_rows)
+    train_buffer = np.empty((max_train, n_features), dtype=dtype)
+    val_buffer = np.empty((max_val, n_features), dtype=dtype)
+    
+    for f, val_idx in enumerate(fold_rows):
+        train_idx = np.flatnonzero(fold_of_row != f)
+        
+        n_train = len(train_idx)
+        mean = (total_sum - fold_sums[f]) / n_train
+        var = (total_squares - fold_squares[f]) / n_train - mean ** 2
+        scale = np.sqrt(np.maximum(var, 0))
+        # Constant features are left unscaled, as StandardScaler does
+        scale[scale < 10 * np.finfo(np.float64).eps] = 1.0
+        mean += shift
+        
+        X_train = train_buffer[:n_train]
+        X_val = val_buffer[:len(val_idx)]
+        for out, idx in ((X_train, train_idx), (X_val, val_idx)):
+            if X_values.dtype == out.dtype:
+                np.take(X_values, idx, axis=0, out=out)
+            else:
+                out[...] = X_values[idx]
+            out -= mean.astype(dtype)
+            out /= scale.astype(dtype)
+        
+        yield X_train, X_val, y_values[train_idx], y_values[val_idx]
+
+
+def _load_array(data: Union[str, Path, np.ndarray]) -> np.ndarray:
+    """Open a .npy path as a read-only memory map; pass arrays through unchanged."""
+    if isinstance(data, (str, Path)):
+        return np.load(data, mmap_mode='r')
+    return data
+
+
+def split_and_scale_memmap(
+    X: Union[str, Path, np.ndarray],
+    y: Union[str, Path, np.ndarray],
+    output_dir: Union[str, Path],
+    test_size: float = 0.2,
+    random_state: Optional[int] = 42,
+    scaler: str = 'standard',
+    stratify: bool = False,
+    chunk_size: int = 100_000,
+    dtype: type = np.float64
+) -> Tuple[np.memmap, np.memmap, np.ndarray, np.ndarray]:
+    """
+    Out-of-core version of split_and_scale for arrays that do not fit in memory.
+    
+    The split is computed as index arrays only, the scaler is fitted with
+    chunked ``partial_fit`` over the training rows, and the scaled outputs are
+    written chunk by chunk to memory-mapped .npy files. Peak memory is about
+    one chunk rather than several copies of the dataset.
+    
+    Parameters:
+    -----------
+    X : str, Path or np.ndarray
+        Path to a 2-D .npy file, or an array / np.memmap
+    y : str, Path or np.ndarray
+        Path to a 1-D .npy file, or an array with the target variable
+    output_dir : str or Path
+        Directory where X_train.npy and X_test.npy are written
+    test_size : float, default=0.2
+        Proportion of dataset to include in test split
+    random_state : int, optional, default=42
+        Random seed for reproducibility
+    scaler : str, default='standard'
+        Type of scaler: 'standard', 'minmax', 'maxabs', or 'none'
+        ('robust' needs exact quantiles and cannot be fitted incrementally)
+    stratify : bool, default=False
+        Whether to stratify split based on target variable
+    chunk_size : int, default=100_000
+        Number of rows read, scaled and written at a time
+    dtype : type, default=np.float64
+        Data type of the scaled output files
+        
+    Returns:
+    --------
+    tuple
+        (X_train_scaled, X_test_scaled, y_train, y_test) where the X arrays are
+        memory maps of the output files
+        
+    Example:
+    --------
+    >>> X_train, X_test, y_train, y_test = preprocessing.split_and_scale_memmap(
+    ...     'X.npy', 'y.npy', output_dir='scaled/', chunk_size=50_000
+    ... )
+    """
+    X_values = _load_array(X)
+    y_values = np.asarray(_load_array(y))
+    
+    if X_values.ndim != 2:
+        raise ValueError("X must be a 2-D array")
+    
+    scaler_map = {
+        'standard': StandardScaler,
+        'minmax': MinMaxScaler,
+        'maxabs': MaxAbsScaler,
+        'none': None
+    }
+    if scaler.lower() not in scaler_map:
+        raise ValueError(f"Unknown scaler type: {scaler}. "
+                         "Use 'standard', 'minmax', 'maxabs', or 'none'")
+    
+    # Split row indices only; the data itself is never copied here
+    stratify_param = y_values if stratify else None
+    train_idx, test_idx = train_test_split(
+        np.arange(len(X_values)),
+        test_size=test_size,
+        random_state=random_state,
+        stratify=stratify_param
+    )
+    
+    def read_rows(idx: np.ndarray) -> np.ndarray:
+        # Gather in sorted order for sequential disk access, then restore order
+        order = np.argsort(idx)
+        rows = np.empty((len(idx), X_values.shape[1]), dtype=X_values.dtype)
+        rows[order] = X_values[idx[order]]
+        return rows
+    
+    scaler_obj = scaler_map[scaler.lower()]
+    if scaler_obj is not None:
+        scaler_obj = scaler_obj()
+        for start in range(0, len(train_idx), chunk_size):
+            scaler_obj.partial_fit(read_rows(train_idx[start:start + chunk_size]))
+    
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    
+    outputs = []
+    for name, idx in (('X_train', train_idx), ('X_test', test_idx)):
+        out = np.lib.format.open_memmap(
+            output_dir / f'{name}.npy', mode='w+', dtype=dtype,
+            shape=(len(idx), X_values.shape[1])
+        )
+        for start in range(0, len(idx), chunk_size):
+            rows = read_rows(idx[start:start + chunk_size])
+            if scaler_obj is not None:
+                rows = scaler_obj.transform(rows)
+            out[start:start + len(rows)] = rows
+        out.flush()
+        outputs.append(out)
+    
+    print(f"✓ Data split: Train={len(train_idx)}, Test={len(test_idx)}")
+    if scaler_obj is not None:
+        print(f"✓ Scaling applied: {type(scaler_obj).__name__} (chunked partial_fit)")
+    print(f"✓ Scaled arrays written to {output_dir}")
+    
+    return outputs[0], outputs[1], y_values[train_idx], y_values[test_idx]
+
+
 def create_scaler(
     scaler_type: str = 'standard',
     **kwargs
@@ -106,7 +496,7 @@ def create_scaler(
     Parameters:
     -----------
     scaler_type : str, default='standard'
-        Type of scaler: 'standard', 'minmax', or 'robust'
+        Type of scaler: 'standard', 'minmax', 'robust', or 'maxabs'
     **kwargs : dict
         Additional parameters for the scaler
         
@@ -126,17 +516,145 @@ def create_scaler(
         return MinMaxScaler(**kwargs)
     elif scaler_type.lower() == 'robust':
         return RobustScaler(**kwargs)
+    elif scaler_type.lower() == 'maxabs':
+        return MaxAbsScaler(**kwargs)
     else:
         raise ValueError(f"Unknown scaler type: {scaler_type}")
 
 
+# Candidate integer dtypes, smallest first; the first one whose range covers a column wins
+_INTEGER_DTYPES = (np.int8, np.uint8, np.int16, np.uint16, np.int32, np.uint32, np.int64)
+
+
+def optimize_dtypes(
+    df: pd.DataFrame,
+    columns: Optional[List[str]] = None,
+    category_threshold: float = 0.5,
+    downcast_floats: bool = True,
+    return_report: bool = False
+) -> Union[pd.DataFrame, Tuple[pd.DataFrame, pd.DataFrame]]:
+    """
+    Shrink a DataFrame's memory footprint by downcasting columns to compact dtypes.
+    
+    Min/max of all numeric columns and the cardinality of all string columns are
+    computed in one vectorized pass over the frame. Integers are moved to the
+    smallest signed or unsigned type that holds their range, float64 columns to
+    float32 when every value survives the round trip exactly, and low-cardinality
+    object/string columns to category.
+    
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Input DataFrame
+    columns : list, optional
+        Columns to optimize. If None, considers all columns
+    category_threshold : float, default=0.5
+        Convert an object/string column to category when its number of unique
+        values is at most this fraction of the rows
+    downcast_floats : bool, default=True
+        Convert float64 columns to float32 when no value changes (e.g. small
+        integers or binary fractions stored as float); pass False to keep float64
+    return_report : bool, default=False
+        Also return a per-column report of the dtype changes and bytes saved
+        
+    Returns:
+    --------
+    pd.DataFrame or tuple
+        Optimized copy of df. With return_report=True, a tuple (df_optimized, report)
+        where report has columns Column, Old_Dtype, New_Dtype, Bytes_Before,
+        Bytes_After and Bytes_Saved
+        
+    Example:
+    --------
+    >>> df_small = preprocessing.optimize_dtypes(df)
+    >>> df_small, report = preprocessing.optimize_dtypes(df, return_report=True)
+    >>> print(report['Bytes_Saved'].sum())
+    """
+    if not isinstance(df, pd.DataFrame):
+        raise TypeError("Input must be a pandas DataFrame")
+    if not 0 <= category_threshold <= 1:
+        raise ValueError("category_threshold must be between 0 and 1")
+    
+    if columns is None:
+        columns = df.columns.tolist()
+    columns = [col for col in columns if col in df.columns]
+    
+    # Only plain numpy dtypes are downcast; bool and extension dtypes are left alone
+    numeric_cols = [
+        col for col in columns
+        if isinstance(df[col].dtype, np.dtype) and df[col].dtype.kind in 'iuf'
+    ]
+    string_cols = [
+        col for col in columns
+        if pd.api.types.is_object_dtype(df[col].dtype)
+        or pd.api.types.is_string_dtype(df[col].dtype)
+    ]
+    
+    target_dtypes = {}
+    if numeric_cols and len(df) > 0:
+        extremes = df[numeric_cols].agg(['min', 'max'])
+        for col in numeric_cols:
+            dtype = df[col].dtype
+            col_min, col_max = extremes.at['min', col], extremes.at['max', col]
+            if dtype.kind in 'iu':
+                for candidate in _INTEGER_DTYPES:
+                    info = np.iinfo(candidate)
+                    if info.min <= col_min and col_max <= info.max:
+                        if np.dtype(candidate).itemsize < dtype.itemsize:
+                            target_dtypes[col] = np.dtype(candidate)
+                        break
+            elif downcast_floats and dtype.itemsize > 4:
+                # Lossless only: out-of-range values overflow to inf and fail the round trip
+                values = df[col].to_numpy()
+                with np.errstate(over='ignore'):
+                    round_trip = values.astype(np.float32).astype(dtype)
+                if np.array_equal(round_trip, values, equal_nan=True):
+                    target_dtypes[col] = np.dtype(np.float32)
+    
+    if string_cols and len(df) > 0:
+        cardinality = df[string_cols].nunique()
+        for col in string_cols:
+            if cardinality[col] <= category_threshold * len(df):
+                target_dtypes[col] = 'category'
+    
+    bytes_before = df[list(target_dtypes)].memory_usage(index=False, deep=True)
+    df_result = df.astype(target_dtypes) if target_dtypes else df.copy()
+    bytes_after = df_result[list(target_dtypes)].memory_usage(index=False, deep=True)
+    
+    saved = int((bytes_before - bytes_after).sum())
+    total_before = int(df.memory_usage(deep=True).sum())
+    percent = saved / total_before * 100 if total_before else 0.0
+    print(f"✓ Optimized {len(target_dtypes)} columns: saved {saved / 1024 ** 2:.2f} MB "
+          f"({percent:.1f}% of {total_before / 1024 ** 2:.2f} MB)")
+    
+    if not return_report:
+        return df_result
+    
+    changed = list(target_dtypes)
+    report = pd.DataFrame({
+        'Column': changed,
+        'Old_Dtype': [str(df[col].dtype) for col in changed],
+        'New_Dtype': [str(df_result[col].dtype) for col in changed],
+        'Bytes_Before': bytes_before.to_numpy(dtype=np.int64),
+        'Bytes_After': bytes_after.to_numpy(dtype=np.int64),
+    })
+    report['Bytes_Saved'] = report['Bytes_Before'] - report['Bytes_After']
+    return df_result, report
+
+
 def encode_categorical(
     df: pd.DataFrame,
     columns: Optional[List[str]] = None,
     method: str = 'onehot',
     drop_first: bool = False,
-    handle_unknown: str = 'ignore'
-) -> pd.DataFrame:
+    handle_unknown: str = 'ignore',
+    sparse: bool = False,
+    n_features: int = 2 ** 20,
+    y: Optional[Union[pd.Series, np.ndarray]] = None,
+    n_splits: int = 5,
+    smoothing: float = 10.0,
+    n_jobs: Optional[int] = None
+) -> Union[pd.DataFrame, sp.csr_matrix]:
     """
     Encode categorical variables using various methods.
     
@@ -147,185 +665,1525 @@ def encode_categorical(
     columns : list, optional
         Columns to encode. If None, encodes all object/category columns
     method : str, default='onehot'
-        Encoding method: 'onehot', 'label', or 'ordinal'
+        Encoding method: 'onehot', 'label', 'ordinal', 'hash' (hashing trick,
+        always sparse output) or 'target' (out-of-fold smoothed target mean).
+        'label' codes follow the sorted categories (numeric columns sort by
+        value) and missing values get -1; 'ordinal' leaves them as NaN
     drop_first : bool, default=False
         Whether to drop first category to avoid multicollinearity (for onehot)
     handle_unknown : str, default='ignore'
         How to handle unknown categories: 'ignore' or 'error'
+    sparse : bool, default=False
+        Return a scipy.sparse.csr_matrix built directly from category codes
+        instead of a DataFrame (for onehot; memory is O(nnz))
+    n_features : int, default=2**20
+        Number of hashed output columns shared by all encoded columns (for hash)
+    y : pd.Series or np.ndarray, optional
+        Numeric target, required for method='target'
+    n_splits : int, default=5
+        Number of out-of-fold splits (for target)
+    smoothing : float, default=10.0
+        Weight of the global target mean, in pseudo-observations (for target).
+        Use ``TargetEncoder`` directly to keep the fitted mapping for new data
+    n_jobs : int, optional
+        Number of threads encoding groups of columns in parallel (-1 for all
+        cores; dense output). The result does not depend on n_jobs
         
     Returns:
     --------
-    pd.DataFrame
-        DataFrame with encoded columns
+    pd.DataFrame or scipy.sparse.csr_matrix
+        DataFrame with encoded columns. For sparse output, a CSR matrix with the
+        remaining (numeric) columns first, followed by the encoded columns
         
     Example:
     --------
     >>> df_encoded = preprocessing.encode_categorical(
     ...     df, columns=['category', 'type'], method='onehot'
     ... )
+    >>> X_sparse = preprocessing.encode_categorical(
+    ...     df, columns=['merchant_id'], method='hash', n_features=2**18
+    ... )
+    >>> df_target = preprocessing.encode_categorical(
+    ...     df, columns=['merchant_id'], method='target', y=y
+    ... )
     """
-    df_result = df.copy()
-    
     if columns is None:
-        columns = df_result.select_dtypes(include=['object', 'category']).columns.tolist()
+        columns = df.select_dtypes(include=['object', 'category']).columns.tolist()
+    
+    if method == 'hash' or sparse:
+        if method not in ('onehot', 'hash'):
+            raise ValueError("Sparse output is only supported for 'onehot' and 'hash' encoding")
+        return _encode_sparse(df, columns, method, drop_first, n_features)
     
     if not columns:
         warnings.warn("No categorical columns found or specified.")
-        return df_result
+        return df.copy()
     
+    # Column groups are encoded in threads; concat copies the remaining columns
+    # (lazily under copy-on-write), so the result never shares data with df
     if method == 'onehot':
-        df_result = pd.get_dummies(
-            df_result,
-            columns=columns,
-            drop_first=drop_first,
-            dtype=int
-        )
+        def dummies(group):
+            return [pd.get_dummies(df[group], columns=group, drop_first=drop_first, dtype=int)]
+        
+        parts = _parallel.map_column_groups(dummies, columns, n_jobs)
+        df_result = pd.concat([df.drop(columns=columns)] + parts, axis=1)
         print(f"✓ One-hot encoded {len(columns)} columns")
         
     elif method == 'label':
-        from sklearn.preprocessing import LabelEncoder
-        
+        columns = [col for col in columns if col in df.columns]
+        encoder = CategoricalEncoder(columns=columns, handle_unknown=handle_unknown, n_jobs=n_jobs)
+        df_result = encoder.fit_transform(df)
+        # encode_categorical keeps its int64 output dtypes (one-hot uses dtype=int
+        # too); CategoricalEncoder itself returns the compact codes
         for col in columns:
-            if col in df_result.columns:
-                le = LabelEncoder()
-                df_result[col] = le.fit_transform(df_result[col].astype(str))
+            df_result[col] = df_result[col].astype(np.int64)
         
         print(f"✓ Label encoded {len(columns)} columns")
         
     elif method == 'ordinal':
-        from sklearn.preprocessing import OrdinalEncoder
-        
-        encoder = OrdinalEncoder(handle_unknown=handle_unknown)
-        df_result[columns] = encoder.fit_transform(df_result[columns].astype(str))
+        encoder = CategoricalEncoder(columns=columns, handle_unknown=handle_unknown, n_jobs=n_jobs)
+        df_result = encoder.fit_transform(df)
+        for col in columns:
+            # Missing values stay missing in the float output
+            df_result[col] = df_result[col].astype(np.float64).where(df[col].notna())
         print(f"✓ Ordinal encoded {len(columns)} columns")
         
+    elif method == 'target':
+        if y is None:
+            raise ValueError("y must be provided when method='target'")
+        encoder = TargetEncoder(columns=columns, n_splits=n_splits, smoothing=smoothing,
+                                n_jobs=n_jobs)
+        df_result = encoder.fit_transform(df, y)
+        print(f"✓ Target encoded {len(columns)} columns ({n_splits}-fold out-of-fold)")
+        
     else:
         raise ValueError(f"Unknown encoding method: {method}")
     
     return df_result
 
 
-def handle_outliers(
+def _encode_sparse(
     df: pd.DataFrame,
-    columns: Optional[List[str]] = None,
-    method: str = 'iqr',
-    threshold: float = 1.5,
-    action: str = 'remove'
-) -> pd.DataFrame:
+    columns: List[str],
+    method: str,
+    drop_first: bool,
+    n_features: int
+) -> sp.csr_matrix:
     """
-    Detect and handle outliers in numerical columns.
+    Build a CSR matrix of one-hot or hashed categories straight from category codes.
+    
+    Each encoded column contributes at most one non-zero per row (missing
+    values contribute none), so memory is O(nnz) no matter how many levels
+    a column has.
+    """
+    remaining = df.drop(columns=columns)
+    non_numeric = remaining.columns.difference(
+        remaining.select_dtypes(include=[np.number, 'bool']).columns
+    )
+    if len(non_numeric):
+        raise ValueError(f"Sparse output needs the remaining columns to be numeric: "
+                         f"{non_numeric.tolist()}")
+    
+    n_rows = len(df)
+    blocks = [sp.csr_matrix(remaining.to_numpy(dtype=np.float64))]
+    
+    for col in columns:
+        codes, uniques = pd.factorize(df[col], sort=(method == 'onehot'))
+        
+        if method == 'hash':
+            # Hash each distinct level once, salted with the column name so
+            # equal values in different columns land in different buckets
+            salt = pd.util.hash_array(np.array([str(col)], dtype=object))[0]
+            buckets = (pd.util.hash_array(np.asarray(uniques, dtype=object)) ^ salt) \
+                % np.uint64(n_features)
+            width = n_features
+            columns_idx = buckets.astype(np.int64)
+        else:
+            width = len(uniques) - int(drop_first)
+            columns_idx = np.arange(len(uniques)) - int(drop_first)
+        
+        present = codes >= 0
+        col_codes = columns_idx[codes[present]]
+        if method == 'onehot' and drop_first:
+            present[present] = col_codes >= 0
+            col_codes = col_codes[col_codes >= 0]
+        
+        blocks.append(sp.csr_matrix(
+            (np.ones(len(col_codes)), (np.flatnonzero(present), col_codes)),
+            shape=(n_rows, width)
+        ))
+    
+    if method == 'hash':
+        # All hashed columns share one feature space
+        encoded = sum(blocks[1:], sp.csr_matrix((n_rows, n_features)))
+        result = sp.hstack([blocks[0], encoded], format='csr')
+        print(f"✓ Hash encoded {len(columns)} columns into {n_features} features")
+    else:
+        result = sp.hstack(blocks, format='csr')
+        print(f"✓ One-hot encoded {len(columns)} columns (sparse)")
+    
+    return result
+
+
+class CategoricalEncoder:
+    """
+    Fitted integer encoder for categorical columns, reusable across batches.
+    
+    ``fit`` stores a sorted vocabulary per column; ``transform`` maps whole
+    columns at once with a hash lookup into the vocabulary index, with no
+    per-value string conversion. Codes use the smallest signed integer dtype
+    that fits the vocabulary. Numeric categories are ordered by value, not as
+    strings (2 before 10), and missing values are never part of the
+    vocabulary: they always map to ``unknown_value``.
     
     Parameters:
     -----------
-    df : pd.DataFrame
-        Input DataFrame
     columns : list, optional
-        Columns to check for outliers. If None, uses all numeric columns
-    method : str, default='iqr'
-        Detection method: 'iqr' (Interquartile Range) or 'zscore'
-    threshold : float, default=1.5
-        Threshold for outlier detection (1.5 for IQR, 3 for z-score typically)
-    action : str, default='remove'
-        Action to take: 'remove', 'clip', or 'flag'
-        
-    Returns:
-    --------
-    pd.DataFrame
-        DataFrame with outliers handled according to specified action
+        Columns to encode. If None, encodes all object/category columns seen in fit
+    handle_unknown : str, default='ignore'
+        How to handle categories not seen in fit: 'ignore' (map to unknown_value)
+        or 'error'
+    unknown_value : int, default=-1
+        Reserved code for unknown categories and missing values
+    n_jobs : int, optional
+        Number of threads processing groups of columns in parallel
         
     Example:
     --------
-    >>> # Remove outliers using IQR method
-    >>> df_clean = preprocessing.handle_outliers(df, method='iqr', action='remove')
+    >>> encoder = preprocessing.CategoricalEncoder().fit(df_train)
+    >>> df_train_codes = encoder.transform(df_train)
+    >>> df_batch_codes = encoder.transform(df_batch)  # same codes, unknowns -> -1
     """
-    df_result = df.copy()
     
-    if columns is None:
-        columns = df_result.select_dtypes(include=[np.number]).columns.tolist()
-    
-    outlier_mask = pd.Series([False] * len(df_result), index=df_result.index)
+    def __init__(
+        self,
+        columns: Optional[List[str]] = None,
+        handle_unknown: str = 'ignore',
+        unknown_value: int = -1,
+        n_jobs: Optional[int] = None
+    ):
+        if handle_unknown not in ('ignore', 'error'):
+            raise ValueError(f"handle_unknown must be 'ignore' or 'error', got {handle_unknown}")
+        
+        self.columns = columns
+        self.handle_unknown = handle_unknown
+        self.unknown_value = unknown_value
+        self.n_jobs = n_jobs
     
-    for col in columns:
-        if col not in df_result.columns:
-            continue
+    def fit(self, df: pd.DataFrame) -> 'CategoricalEncoder':
+        """
+        Learn the vocabulary of every categorical column.
         
-        if method == 'iqr':
-            Q1 = df_result[col].quantile(0.25)
-            Q3 = df_result[col].quantile(0.75)
-            IQR = Q3 - Q1
-            
-            lower_bound = Q1 - threshold * IQR
-            upper_bound = Q3 + threshold * IQR
-            
-            col_outliers = (df_result[col] < lower_bound) | (df_result[col] > upper_bound)
+        Parameters:
+        -----------
+        df : pd.DataFrame
+            Training data
             
-            if action == 'remove':
-                outlier_mask |= col_outliers
-            elif action == 'clip':
-                df_result[col] = df_result[col].clip(lower=lower_bound, upper=upper_bound)
-            elif action == 'flag':
-                df_result[f'{col}_outlier'] = col_outliers
-                
-        elif method == 'zscore':
-            from scipy import stats
-            z_scores = np.abs(stats.zscore(df_result[col].dropna()))
-            col_outliers = pd.Series([False] * len(df_result), index=df_result.index)
-            col_outliers.loc[df_result[col].notna()] = z_scores > threshold
-            
-            if action == 'remove':
-                outlier_mask |= col_outliers
-            elif action == 'clip':
-                mean = df_result[col].mean()
-                std = df_result[col].std()
-                lower_bound = mean - threshold * std
-                upper_bound = mean + threshold * std
-                df_result[col] = df_result[col].clip(lower=lower_bound, upper=upper_bound)
-            elif action == 'flag':
-                df_result[f'{col}_outlier'] = col_outliers
+        Returns:
+        --------
+        CategoricalEncoder
+            The fitted encoder
+        """
+        columns = self.columns
+        if columns is None:
+            columns = df.select_dtypes(include=['object', 'category']).columns.tolist()
+        
+        def fit_group(group):
+            return [(col, self._vocabulary(df[col])) for col in group]
+        
+        self.vocabularies_ = dict(_parallel.map_column_groups(fit_group, columns, self.n_jobs))
+        
+        return self
+    
+    @staticmethod
+    def _vocabulary(series: pd.Series) -> pd.Index:
+        """Sorted distinct non-missing values of one column."""
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            uniques = series.cat.categories[series.cat.categories.isin(series.unique())]
         else:
-            raise ValueError(f"Unknown method: {method}")
+            uniques = pd.unique(series.dropna())
+        try:
+            return pd.Index(np.sort(np.asarray(uniques)))
+        except TypeError:
+            # Mixed types cannot be ordered directly
+            return pd.Index(sorted(uniques, key=str))
     
-    if action == 'remove':
-        original_len = len(df_result)
-        df_result = df_result[~outlier_mask]
-        removed = original_len - len(df_result)
-        print(f"✓ Removed {removed} rows containing outliers ({removed/original_len*100:.2f}%)")
+    def transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Map categorical columns to their integer codes.
+        
+        Parameters:
+        -----------
+        df : pd.DataFrame
+            Data to encode
+            
+        Returns:
+        --------
+        pd.DataFrame
+            Copy of df with encoded columns replaced by integer codes (under
+            copy-on-write the other columns are not copied)
+        """
+        def transform_group(group):
+            return [(col, self._encode(col, df[col])) for col in group]
+        
+        columns = list(self.vocabularies_)
+        encoded = _parallel.map_column_groups(transform_group, columns, self.n_jobs)
+        
+        df_result = _parallel.output_frame(df)
+        for col, codes in encoded:
+            df_result[col] = codes
+        
+        return df_result
     
-    return df_result
+    def _encode(self, col, series: pd.Series) -> np.ndarray:
+        """Integer codes of one column in the smallest signed dtype."""
+        vocab = self.vocabularies_[col]
+        codes = vocab.get_indexer(series)
+        unknown = codes == -1
+        
+        if unknown.any():
+            if self.handle_unknown == 'error':
+                unseen = series[unknown & series.notna().to_numpy()]
+                if len(unseen):
+                    raise ValueError(f"Unknown categories in column '{col}': "
+                                     f"{unseen.unique()[:5].tolist()}")
+            codes[unknown] = self.unknown_value
+        
+        code_dtype = np.min_scalar_type(-max(len(vocab), abs(self.unknown_value), 1))
+        return codes.astype(code_dtype)
+    
+    def fit_transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Fit the vocabularies on df and return its encoded copy."""
+        return self.fit(df).transform(df)
 
 
-def feature_selection_quick(
-    X: pd.DataFrame,
-    y: Union[pd.Series, np.ndarray],
-    k: int = 10,
-    method: str = 'f_classif'
-) -> Tuple[pd.DataFrame, List[str]]:
+class TargetEncoder:
     """
-    Quick feature selection using statistical tests.
+    Smoothed target-mean encoder with out-of-fold estimates for training data.
+    
+    Each category is replaced by ``(sum_y + smoothing * prior) / (count + smoothing)``.
+    ``fit_transform`` encodes every training row with statistics from the other
+    K-1 folds only, so the encoding does not leak the row's own target. All
+    folds come from a single grouped sum: one bincount over (fold, category)
+    pairs is subtracted from the global per-category sums. ``transform`` applies
+    the mapping fitted on all rows; unseen categories and missing values get the
+    prior (the global target mean).
     
     Parameters:
     -----------
-    X : pd.DataFrame
-        Feature matrix
-    y : pd.Series or np.ndarray
-        Target variable
-    k : int, default=10
-        Number of top features to select
-    method : str, default='f_classif'
-        Selection method: 'f_classif', 'f_regression', 'mutual_info_classif', 'mutual_info_regression'
-        
-    Returns:
-    --------
-    tuple
-        (Selected features DataFrame, List of selected feature names)
+    columns : list, optional
+        Columns to encode. If None, encodes all object/category columns seen in fit
+    n_splits : int, default=5
+        Number of out-of-fold splits used by fit_transform
+    smoothing : float, default=10.0
+        Weight of the prior, in number of pseudo-observations
+    random_state : int, optional, default=42
+        Random seed for the fold assignment
+    n_jobs : int, optional
+        Number of threads processing groups of columns in parallel
         
     Example:
     --------
-    >>> X_selected, selected_features = preprocessing.feature_selection_quick(
-    ...     X, y, k=15, method='mutual_info_classif'
+    >>> encoder = preprocessing.TargetEncoder(columns=['merchant_id'])
+    >>> df_train_enc = encoder.fit_transform(df_train, y_train)  # out-of-fold
+    >>> df_test_enc = encoder.transform(df_test)                 # fitted mapping
+    """
+    
+    def __init__(
+        self,
+        columns: Optional[List[str]] = None,
+        n_splits: int = 5,
+        smoothing: float = 10.0,
+        random_state: Optional[int] = 42,
+        n_jobs: Optional[int] = None
+    ):
+        if n_splits < 2:
+            raise ValueError("n_splits must be at least 2")
+        if smoothing < 0:
+            raise ValueError("smoothing must be non-negative")
+        
+        self.columns = columns
+        self.n_splits = n_splits
+        self.smoothing = smoothing
+        self.random_state = random_state
+        self.n_jobs = n_jobs
+    
+    def fit(self, df: pd.DataFrame, y: Union[pd.Series, np.ndarray]) -> 'TargetEncoder':
+        """
+        Learn the smoothed target mean of every category from all rows.
+        
+        Parameters:
+        -----------
+        df : pd.DataFrame
+            Training data
+        y : pd.Series or np.ndarray
+            Numeric target (binary 0/1 or continuous)
+            
+        Returns:
+        --------
+        TargetEncoder
+            The fitted encoder
+        """
+        self._fit(df, y)
+        return self
+    
+    def fit_transform(self, df: pd.DataFrame, y: Union[pd.Series, np.ndarray]) -> pd.DataFrame:
+        """
+        Fit the mapping on all rows and return out-of-fold encodings of df.
+        
+        Parameters:
+        -----------
+        df : pd.DataFrame
+            Training data
+        y : pd.Series or np.ndarray
+            Numeric target (binary 0/1 or continuous)
+            
+        Returns:
+        --------
+        pd.DataFrame
+            Copy of df with encoded columns replaced by out-of-fold target means
+        """
+        y_values, fitted = self._fit(df, y)
+        n_samples = len(y_values)
+        k = self.n_splits
+        
+        rng = np.random.default_rng(self.random_state)
+        folds = rng.permutation(n_samples) % k
+        
+        # Per-fold totals give each fold's out-of-fold prior
+        fold_counts = np.bincount(folds, minlength=k).astype(np.float64)
+        fold_sums = np.bincount(folds, weights=y_values, minlength=k)
+        oof_prior = (y_values.sum() - fold_sums) / np.maximum(n_samples - fold_counts, 1)
+        
+        def encode(codes, sums, counts):
+            n_categories = len(sums)
+            # One grouped sum over (fold, category); out-of-fold = global - in-fold
+            key = folds * n_categories + np.where(codes >= 0, codes, 0)
+            valid = codes >= 0
+            in_sums = np.bincount(key[valid], weights=y_values[valid],
+                                  minlength=k * n_categories).reshape(k, n_categories)
+            in_counts = np.bincount(key[valid], minlength=k * n_categories).reshape(k, n_categories)
+            
+            table = ((sums - in_sums) + self.smoothing * oof_prior[:, None]) / (
+                (counts - in_counts) + self.smoothing
+            )
+            # Categories seen only in the row's own fold fall back to the prior
+            table = np.where((counts - in_counts) > 0, table, oof_prior[:, None])
+            
+            encoded = oof_prior[folds]
+            encoded[valid] = table[folds[valid], codes[valid]]
+            return encoded
+        
+        def encode_group(group):
+            return [(col, encode(*fitted[col])) for col in group]
+        
+        encoded = _parallel.map_column_groups(encode_group, list(fitted), self.n_jobs)
+        
+        df_result = _parallel.output_frame(df)
+        for col, values in encoded:
+            df_result[col] = values
+        
+        return df_result
+    
+    def transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Encode categorical columns with the mapping fitted on all training rows.
+        
+        Parameters:
+        -----------
+        df : pd.DataFrame
+            Data to encode
+            
+        Returns:
+        --------
+        pd.DataFrame
+            Copy of df with encoded columns replaced by smoothed target means
+        """
+        def transform_group(group):
+            encoded = []
+            for col in group:
+                mapping = self.mapping_[col]
+                codes = mapping.index.get_indexer(df[col])
+                encoded.append((col, np.where(codes >= 0, mapping.to_numpy()[codes], self.prior_)))
+            return encoded
+        
+        df_result = _parallel.output_frame(df)
+        encoded = _parallel.map_column_groups(transform_group, list(self.mapping_), self.n_jobs)
+        for col, values in encoded:
+            df_result[col] = values
+        return df_result
+    
+    def _fit(
+        self,
+        df: pd.DataFrame,
+        y: Union[pd.Series, np.ndarray]
+    ) -> Tuple[np.ndarray, dict]:
+        """Store the fitted mapping; return the target and per-column codes/sums/counts."""
+        y_values = np.asarray(y, dtype=np.float64)
+        if y_values.ndim != 1 or len(y_values) != len(df):
+            raise ValueError("y must be one-dimensional with one value per row of df")
+        if np.isnan(y_values).any():
+            raise ValueError("y must not contain missing values")
+        
+        columns = self.columns
+        if columns is None:
+            columns = df.select_dtypes(include=['object', 'category']).columns.tolist()
+        
+        self.prior_ = float(y_values.mean()) if len(y_values) else 0.0
+        
+        def fit_group(group):
+            results = []
+            for col in group:
+                codes, uniques = pd.factorize(df[col])
+                seen = codes >= 0
+                sums = np.bincount(codes[seen], weights=y_values[seen], minlength=len(uniques))
+                counts = np.bincount(codes[seen], minlength=len(uniques)).astype(np.float64)
+                results.append((col, uniques, codes, sums, counts))
+            return results
+        
+        self.mapping_ = {}
+        fitted = {}
+        results = _parallel.map_column_groups(fit_group, columns, self.n_jobs)
+        for col, uniques, codes, sums, counts in results:
+            means = (sums + self.smoothing * self.prior_) / (counts + self.smoothing)
+            self.mapping_[col] = pd.Series(means, index=pd.Index(uniques), name=col)
+            fitted[col] = (codes, sums, counts)
+        
+        return y_values, fitted
+
+
+def handle_outliers(
+    df: pd.DataFrame,
+    columns: Optional[List[str]] = None,
+    method: str = 'iqr',
+    threshold: float = 1.5,
+    action: str = 'remove',
+    contamination: Union[str, float] = 'auto',
+    n_jobs: Optional[int] = None,
+    random_state: Optional[int] = 42
+) -> pd.DataFrame:
+    """
+    Detect and handle outliers in numerical columns.
+    
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Input DataFrame
+    columns : list, optional
+        Columns to check for outliers. If None, uses all numeric columns
+    method : str, default='iqr'
+        Detection method: 'iqr' (Interquartile Range), 'zscore', 'mad'
+        (median absolute deviation, robust to skew), or 'isolation_forest'
+        (multivariate, flags whole rows)
+    threshold : float, default=1.5
+        Threshold for outlier detection (1.5 for IQR, 3 for z-score, 3.5 for
+        MAD typically). Not used by isolation_forest
+    action : str, default='remove'
+        Action to take: 'remove', 'clip', or 'flag'. With isolation_forest,
+        'clip' clips each column to the range of the inlier rows and 'flag'
+        adds a single 'is_outlier' column
+    contamination : 'auto' or float, default='auto'
+        Expected proportion of outliers (for isolation_forest)
+    n_jobs : int, optional
+        Number of parallel jobs used to score row chunks (for isolation_forest)
+    random_state : int, optional, default=42
+        Random seed for the subsample and the forest (for isolation_forest)
+        
+    Returns:
+    --------
+    pd.DataFrame
+        DataFrame with outliers handled according to specified action
+        
+    Example:
+    --------
+    >>> # Remove outliers using IQR method
+    >>> df_clean = preprocessing.handle_outliers(df, method='iqr', action='remove')
+    >>> # Flag multivariate outliers
+    >>> df_flagged = preprocessing.handle_outliers(
+    ...     df, method='isolation_forest', action='flag', n_jobs=-1
+    ... )
+    """
+    if columns is None:
+        columns = df.select_dtypes(include=[np.number]).columns.tolist()
+    columns = [col for col in columns if col in df.columns]
+    
+    if method not in ('iqr', 'zscore', 'mad', 'isolation_forest'):
+        raise ValueError(f"Unknown method: {method}")
+    
+    # One 2-D pass for all columns: bounds, mask and action are bulk operations
+    values = df[columns].to_numpy(dtype=np.float64)
+    
+    if method == 'isolation_forest':
+        row_outliers = _isolation_forest_outliers(values, contamination, n_jobs, random_state)
+        outliers = row_outliers[:, None]
+        flag_names = ['is_outlier']
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', category=RuntimeWarning)
+            clip_lower = np.nanmin(values[~row_outliers], axis=0)
+            clip_upper = np.nanmax(values[~row_outliers], axis=0)
+    else:
+        lower, upper, clip_lower, clip_upper = _outlier_bounds(values, method, threshold)
+        with np.errstate(invalid='ignore'):
+            outliers = (values < lower) | (values > upper)
+        flag_names = [f'{col}_outlier' for col in columns]
+    
+    if action == 'remove':
+        outlier_mask = outliers.any(axis=1)
+        original_len = len(df)
+        df_result = df[~outlier_mask]
+        removed = original_len - len(df_result)
+        print(f"✓ Removed {removed} rows containing outliers ({removed/original_len*100:.2f}%)")
+    elif action == 'clip':
+        df_result = df.copy()
+        df_result[columns] = np.clip(values, clip_lower, clip_upper)
+        _restore_dtypes(df_result, df, columns)
+    elif action == 'flag':
+        flags = pd.DataFrame(outliers, index=df.index, columns=flag_names)
+        df_result = pd.concat([df, flags], axis=1)
+    else:
+        df_result = df.copy()
+    
+    return df_result
+
+
+def _restore_dtypes(df_result: pd.DataFrame, df: pd.DataFrame, columns: List[str]) -> None:
+    """
+    Cast clipped columns back to their original int or float dtype in place.
+    
+    Integers clipped to a fractional bound are rounded towards the inside of
+    the bounds (down at the upper bound, up at the lower bound), so they never
+    end up beyond the bound they were clipped to.
+    """
+    for col in columns:
+        dtype = df[col].dtype
+        if not isinstance(dtype, np.dtype) or dtype == df_result[col].dtype:
+            continue
+        if dtype.kind in 'iu':
+            clipped = df_result[col].to_numpy()
+            inward = np.where(clipped < df[col].to_numpy(), np.floor(clipped), np.ceil(clipped))
+            df_result[col] = inward.astype(dtype)
+        elif dtype.kind == 'f':
+            df_result[col] = df_result[col].astype(dtype)
+
+
+def _outlier_bounds(
+    values: np.ndarray,
+    method: str,
+    threshold: float
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Per-column outlier bounds for a 2-D array, ignoring NaNs.
+    
+    Returns (lower, upper) used to detect outliers and (clip_lower, clip_upper)
+    used for clipping. They only differ for z-scores, where detection uses the
+    population std (as scipy.stats.zscore) and clipping the sample std.
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', category=RuntimeWarning)
+        
+        if method == 'iqr':
+            # Quantiles along the contiguous axis are several times faster;
+            # DataFrame.to_numpy() is column-major, so this is usually a free view
+            columns_major = np.asfortranarray(values).T
+            quantile = np.nanquantile if np.isnan(values).any() else np.quantile
+            q1, q3 = quantile(columns_major, [0.25, 0.75], axis=1)
+            iqr = q3 - q1
+            lower = q1 - threshold * iqr
+            upper = q3 + threshold * iqr
+            return lower, upper, lower, upper
+        
+        if method == 'mad':
+            # Robust z-score 0.6745 * (x - median) / MAD; if MAD is 0, fall back
+            # to the mean absolute deviation (Iglewicz & Hoaglin)
+            columns_major = np.asfortranarray(values).T
+            median = np.nanmedian(columns_major, axis=1)
+            deviation = np.abs(columns_major - median[:, None])
+            scale = np.nanmedian(deviation, axis=1) / 0.6745
+            fallback = np.nanmean(deviation, axis=1) / 0.7979
+            scale = np.where(scale > 0, scale, fallback)
+            lower = median - threshold * scale
+            upper = median + threshold * scale
+            return lower, upper, lower, upper
+        
+        mean = np.nanmean(values, axis=0)
+        std = np.nanstd(values, axis=0)
+        sample_std = np.nanstd(values, axis=0, ddof=1)
+    
+    return (mean - threshold * std, mean + threshold * std,
+            mean - threshold * sample_std, mean + threshold * sample_std)
+
+
+def _merge_quantile_sketch(
+    sketch: np.ndarray,
+    count: np.ndarray,
+    other_sketch: np.ndarray,
+    other_count: np.ndarray
+) -> None:
+    """
+    Merge quantile sketches (grid-sampled quantile functions, one column each) in place.
+    
+    The two piecewise-linear CDFs are mixed with weights given by their row
+    counts and inverted back onto the same grid of levels.
+    """
+    levels = np.linspace(0, 1, sketch.shape[0])
+    for j in range(sketch.shape[1]):
+        if other_count[j] == 0:
+            continue
+        if count[j] == 0:
+            sketch[:, j] = other_sketch[:, j]
+            continue
+        points = np.union1d(sketch[:, j], other_sketch[:, j])
+        total = count[j] + other_count[j]
+        cdf = (count[j] * np.interp(points, sketch[:, j], levels)
+               + other_count[j] * np.interp(points, other_sketch[:, j], levels)) / total
+        sketch[:, j] = np.interp(levels, cdf, points)
+
+
+def _isolation_forest_outliers(
+    values: np.ndarray,
+    contamination: Union[str, float],
+    n_jobs: Optional[int],
+    random_state: Optional[int]
+) -> np.ndarray:
+    """
+    Row outlier mask from an isolation forest.
+    
+    The forest is fitted on a random subsample of at most _IFOREST_FIT_ROWS
+    rows and the full array is scored in row chunks on a thread pool, so
+    memory stays bounded by the chunk size. Missing values are replaced by
+    the column median before scoring.
+    """
+    from joblib import Parallel, delayed
+    from sklearn.ensemble import IsolationForest
+    
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', category=RuntimeWarning)
+        fill = np.nan_to_num(np.nanmedian(np.asfortranarray(values).T, axis=1))
+    
+    def prepare(rows: np.ndarray) -> np.ndarray:
+        return np.where(np.isnan(rows), fill, rows)
+    
+    rng = np.random.default_rng(random_state)
+    n_rows = len(values)
+    fit_rows = np.sort(rng.choice(n_rows, size=min(n_rows, _IFOREST_FIT_ROWS), replace=False))
+    
+    forest = IsolationForest(contamination=contamination, random_state=random_state,
+                             n_jobs=n_jobs)
+    forest.fit(prepare(values[fit_rows]))
+    
+    scores = Parallel(n_jobs=n_jobs, prefer='threads')(
+        delayed(forest.decision_function)(prepare(values[start:start + _SCORE_CHUNK_SIZE]))
+        for start in range(0, n_rows, _SCORE_CHUNK_SIZE)
+    )
+    
+    return np.concatenate(scores) < 0 if scores else np.zeros(0, dtype=bool)
+
+
+class OutlierClipper:
+    """
+    Outlier clipping with bounds fitted once (optionally over streamed chunks)
+    and then frozen, so training and scoring batches are clipped identically.
+    
+    For 'iqr', each column keeps an approximate quantile sketch: its quantile
+    function sampled on a fixed grid of ``n_quantiles`` levels. A chunk is
+    summarized by its exact quantiles on that grid, and two sketches merge by
+    mixing their CDFs weighted by row counts, so fitting needs memory
+    independent of the number of rows. For 'zscore', per-column counts, means
+    and sums of squared deviations are merged exactly (Welford / Chan et al.).
+    
+    Parameters:
+    -----------
+    columns : list, optional
+        Columns to clip. If None, uses all numeric columns of the first chunk
+    method : str, default='iqr'
+        Bounds method: 'iqr' (Interquartile Range) or 'zscore'
+    threshold : float, default=1.5
+        Threshold for the bounds (1.5 for IQR, 3 for z-score typically)
+    n_quantiles : int, default=1001
+        Size of the quantile grid kept per column (for iqr)
+        
+    Example:
+    --------
+    >>> clipper = preprocessing.OutlierClipper(method='iqr')
+    >>> clipper.fit(pd.read_csv('train.csv', chunksize=100_000))
+    >>> df_scored = clipper.transform(df_batch)
+    >>> clipper.save('clipper.npz')
+    """
+    
+    def __init__(
+        self,
+        columns: Optional[List[str]] = None,
+        method: str = 'iqr',
+        threshold: float = 1.5,
+        n_quantiles: int = 1001
+    ):
+        if method not in ('iqr', 'zscore'):
+            raise ValueError(f"Unknown method: {method}")
+        
+        self.columns = columns
+        self.method = method
+        self.threshold = threshold
+        self.n_quantiles = n_quantiles
+    
+    def fit(
+        self,
+        data: Union[pd.DataFrame, Iterable[pd.DataFrame]]
+    ) -> 'OutlierClipper':
+        """
+        Fit the bounds on a DataFrame or an iterable of DataFrame chunks.
+        
+        Parameters:
+        -----------
+        data : pd.DataFrame or iterable of pd.DataFrame
+            Training data, e.g. ``pd.read_csv(path, chunksize=...)``
+            
+        Returns:
+        --------
+        OutlierClipper
+            The fitted clipper
+        """
+        for attr in ('columns_', 'count_', 'sketch_', 'mean_', 'm2_'):
+            self.__dict__.pop(attr, None)
+        
+        if isinstance(data, pd.DataFrame):
+            data = [data]
+        for chunk in data:
+            self.partial_fit(chunk)
+        
+        return self
+    
+    def partial_fit(self, chunk: pd.DataFrame) -> 'OutlierClipper':
+        """Update the fitted state with one chunk of rows."""
+        if not hasattr(self, 'columns_'):
+            columns = self.columns
+            if columns is None:
+                columns = chunk.select_dtypes(include=[np.number]).columns.tolist()
+            self.columns_ = list(columns)
+            self.count_ = np.zeros(len(self.columns_))
+            if self.method == 'iqr':
+                self.sketch_ = np.full((self.n_quantiles, len(self.columns_)), np.nan)
+            else:
+                self.mean_ = np.zeros(len(self.columns_))
+                self.m2_ = np.zeros(len(self.columns_))
+        
+        values = chunk[self.columns_].to_numpy(dtype=np.float64)
+        count = (~np.isnan(values)).sum(axis=0).astype(np.float64)
+        
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', category=RuntimeWarning)
+            if self.method == 'iqr':
+                levels = np.linspace(0, 1, self.n_quantiles)
+                sketch = np.nanquantile(np.asfortranarray(values).T, levels, axis=1)
+                self._merge_state(count, sketch=sketch)
+            else:
+                mean = np.nanmean(values, axis=0)
+                m2 = np.nansum((values - mean) ** 2, axis=0)
+                self._merge_state(count, mean=np.nan_to_num(mean), m2=m2)
+        
+        return self
+    
+    def merge(self, other: 'OutlierClipper') -> 'OutlierClipper':
+        """
+        Merge the fitted state of another clipper (e.g. from another worker) into this one.
+        
+        Both clippers must use the same columns, method and quantile grid.
+        """
+        if (other.columns_ != self.columns_ or other.method != self.method
+                or other.n_quantiles != self.n_quantiles):
+            raise ValueError("Can only merge clippers with the same columns, method "
+                             "and n_quantiles")
+        
+        if self.method == 'iqr':
+            self._merge_state(other.count_, sketch=other.sketch_)
+        else:
+            self._merge_state(other.count_, mean=other.mean_, m2=other.m2_)
+        
+        return self
+    
+    def _merge_state(self, count, sketch=None, mean=None, m2=None) -> None:
+        """Combine the current state with another summary of `count` rows per column."""
+        total = self.count_ + count
+        
+        if self.method == 'zscore':
+            # Chan et al. parallel update of mean and sum of squared deviations
+            with np.errstate(invalid='ignore', divide='ignore'):
+                delta = mean - self.mean_
+                weight = np.where(total > 0, count / total, 0.0)
+                self.m2_ = self.m2_ + m2 + delta ** 2 * self.count_ * weight
+                self.mean_ = self.mean_ + delta * weight
+        else:
+            _merge_quantile_sketch(self.sketch_, self.count_, sketch, count)
+        
+        self.count_ = total
+    
+    @property
+    def bounds_(self) -> pd.DataFrame:
+        """Frozen clipping bounds, one row per column with 'lower' and 'upper'."""
+        if self.method == 'iqr':
+            levels = np.linspace(0, 1, self.n_quantiles)
+            q1, q3 = np.array([
+                np.interp([0.25, 0.75], levels, self.sketch_[:, j])
+                for j in range(len(self.columns_))
+            ]).reshape(-1, 2).T
+            lower = q1 - self.threshold * (q3 - q1)
+            upper = q3 + self.threshold * (q3 - q1)
+        else:
+            with np.errstate(invalid='ignore', divide='ignore'):
+                std = np.sqrt(self.m2_ / (self.count_ - 1))
+            lower = self.mean_ - self.threshold * std
+            upper = self.mean_ + self.threshold * std
+        
+        return pd.DataFrame({'lower': lower, 'upper': upper}, index=self.columns_)
+    
+    def transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Clip the fitted columns of df to the frozen bounds.
+        
+        Parameters:
+        -----------
+        df : pd.DataFrame
+            Data to clip
+            
+        Returns:
+        --------
+        pd.DataFrame
+            Copy of df with clipped columns
+        """
+        bounds = self.bounds_
+        df_result = df.copy()
+        df_result[self.columns_] = np.clip(
+            df[self.columns_].to_numpy(dtype=np.float64),
+            bounds['lower'].to_numpy(), bounds['upper'].to_numpy()
+        )
+        _restore_dtypes(df_result, df, self.columns_)
+        return df_result
+    
+    def fit_transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Fit the bounds on df and return its clipped copy."""
+        return self.fit(df).transform(df)
+    
+    def save(self, path: Union[str, Path]) -> None:
+        """Save the fitted state (not just the bounds, so it can still be merged) to .npz."""
+        import json
+        
+        meta = {
+            'columns': self.columns_,
+            'method': self.method,
+            'threshold': self.threshold,
+            'n_quantiles': self.n_quantiles,
+        }
+        if self.method == 'iqr':
+            state = {'sketch': self.sketch_}
+        else:
+            state = {'mean': self.mean_, 'm2': self.m2_}
+        np.savez(path, count=self.count_, meta=np.array(json.dumps(meta)), **state)
+    
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> 'OutlierClipper':
+        """Load a clipper saved with ``save``."""
+        import json
+        
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data['meta']))
+            clipper = cls(columns=meta['columns'], method=meta['method'],
+                          threshold=meta['threshold'], n_quantiles=meta['n_quantiles'])
+            clipper.columns_ = meta['columns']
+            clipper.count_ = data['count']
+            if clipper.method == 'iqr':
+                clipper.sketch_ = data['sketch']
+            else:
+                clipper.mean_ = data['mean']
+                clipper.m2_ = data['m2']
+        
+        return clipper
+
+
+def bin_features(
+    df: pd.DataFrame,
+    columns: Optional[List[str]] = None,
+    n_bins: int = 10
+) -> pd.DataFrame:
+    """
+    Discretize continuous columns into quantile bins with compact integer codes.
+    
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Input DataFrame
+    columns : list, optional
+        Columns to bin. If None, bins all float columns
+    n_bins : int, default=10
+        Number of quantile bins per column (fewer if a column has tied edges)
+        
+    Returns:
+    --------
+    pd.DataFrame
+        Copy of df with binned columns replaced by uint8 codes (uint16 above 255
+        bins); missing values get the code ``n_bins``. Use ``QuantileBinner`` to
+        fit on chunks or reuse the edges on new data
+        
+    Example:
+    --------
+    >>> df_binned = preprocessing.bin_features(df, columns=['income', 'age'], n_bins=20)
+    >>> df_onehot = preprocessing.encode_categorical(df_binned, columns=['income', 'age'])
+    """
+    if columns is None:
+        columns = df.select_dtypes(include=['floating']).columns.tolist()
+    
+    binner = QuantileBinner(columns=columns, n_bins=n_bins)
+    df_result = binner.fit_transform(df)
+    print(f"✓ Binned {len(binner.columns_)} columns into up to {n_bins} quantile bins")
+    
+    return df_result
+
+
+class QuantileBinner:
+    """
+    Quantile discretizer with edges fitted in one pass, optionally over streamed chunks.
+    
+    Fitting keeps the same mergeable quantile sketch per column as
+    ``OutlierClipper`` (exact on a single DataFrame up to the grid resolution),
+    so chunked and distributed fits need memory independent of the number of
+    rows. ``transform`` maps each column with ``np.searchsorted`` into uint8
+    codes (uint16 for more than 255 bins).
+    
+    Parameters:
+    -----------
+    columns : list, optional
+        Columns to bin. If None, uses all float columns of the first chunk
+    n_bins : int, default=10
+        Number of quantile bins per column. Tied edges are merged, so skewed or
+        discrete columns may get fewer bins
+    n_quantiles : int, default=1001
+        Size of the quantile grid kept per column
+        
+    Attributes:
+    -----------
+    bin_edges_ : dict
+        Inner bin edges per column; a value v gets code ``searchsorted(edges, v, 'right')``
+    missing_code_ : int
+        Code assigned to missing values (equal to n_bins)
+        
+    Example:
+    --------
+    >>> binner = preprocessing.QuantileBinner(n_bins=32)
+    >>> binner.fit(pd.read_csv('train.csv', chunksize=100_000))
+    >>> for chunk in pd.read_csv('score.csv', chunksize=100_000):
+    ...     codes = binner.transform(chunk)
+    """
+    
+    def __init__(
+        self,
+        columns: Optional[List[str]] = None,
+        n_bins: int = 10,
+        n_quantiles: int = 1001
+    ):
+        if not 2 <= n_bins < np.iinfo(np.uint16).max:
+            raise ValueError(f"n_bins must be between 2 and {np.iinfo(np.uint16).max - 1}")
+        
+        self.columns = columns
+        self.n_bins = n_bins
+        self.n_quantiles = n_quantiles
+    
+    def fit(
+        self,
+        data: Union[pd.DataFrame, Iterable[pd.DataFrame]]
+    ) -> 'QuantileBinner':
+        """
+        Fit the bin edges on a DataFrame or an iterable of DataFrame chunks.
+        
+        Parameters:
+        -----------
+        data : pd.DataFrame or iterable of pd.DataFrame
+            Training data, e.g. ``pd.read_csv(path, chunksize=...)``
+            
+        Returns:
+        --------
+        QuantileBinner
+            The fitted binner
+        """
+        for attr in ('columns_', 'count_', 'sketch_'):
+            self.__dict__.pop(attr, None)
+        
+        if isinstance(data, pd.DataFrame):
+            data = [data]
+        for chunk in data:
+            self.partial_fit(chunk)
+        
+        return self
+    
+    def partial_fit(self, chunk: pd.DataFrame) -> 'QuantileBinner':
+        """Update the quantile sketches with one chunk of rows."""
+        if not hasattr(self, 'columns_'):
+            columns = self.columns
+            if columns is None:
+                columns = chunk.select_dtypes(include=['floating']).columns.tolist()
+            self.columns_ = list(columns)
+            self.count_ = np.zeros(len(self.columns_))
+            self.sketch_ = np.full((self.n_quantiles, len(self.columns_)), np.nan)
+        
+        values = chunk[self.columns_].to_numpy(dtype=np.float64)
+        count = (~np.isnan(values)).sum(axis=0).astype(np.float64)
+        
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', category=RuntimeWarning)
+            levels = np.linspace(0, 1, self.n_quantiles)
+            sketch = np.nanquantile(np.asfortranarray(values).T, levels, axis=1)
+        
+        _merge_quantile_sketch(self.sketch_, self.count_, sketch, count)
+        self.count_ = self.count_ + count
+        self.__dict__.pop('_edges', None)
+        
+        return self
+    
+    def merge(self, other: 'QuantileBinner') -> 'QuantileBinner':
+        """Merge the fitted sketches of another binner with the same columns and grid."""
+        if other.columns_ != self.columns_ or other.n_quantiles != self.n_quantiles:
+            raise ValueError("Can only merge binners with the same columns and n_quantiles")
+        
+        _merge_quantile_sketch(self.sketch_, self.count_, other.sketch_, other.count_)
+        self.count_ = self.count_ + other.count_
+        self.__dict__.pop('_edges', None)
+        
+        return self
+    
+    @property
+    def bin_edges_(self) -> dict:
+        """Inner bin edges per column, derived from the sketches."""
+        if '_edges' not in self.__dict__:
+            grid = np.linspace(0, 1, self.n_quantiles)
+            levels = np.linspace(0, 1, self.n_bins + 1)[1:-1]
+            edges = {}
+            for j, col in enumerate(self.columns_):
+                if self.count_[j] == 0:
+                    edges[col] = np.empty(0)
+                else:
+                    edges[col] = np.unique(np.interp(levels, grid, self.sketch_[:, j]))
+            self._edges = edges
+        return self._edges
+    
+    @property
+    def missing_code_(self) -> int:
+        """Code assigned to missing values."""
+        return self.n_bins
+    
+    def transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Replace the fitted columns of df by their bin codes.
+        
+        Parameters:
+        -----------
+        df : pd.DataFrame
+            Data to bin (any number of rows, e.g. one chunk)
+            
+        Returns:
+        --------
+        pd.DataFrame
+            Copy of df with binned columns as uint8 / uint16 codes
+        """
+        code_dtype = np.uint8 if self.n_bins <= np.iinfo(np.uint8).max else np.uint16
+        df_result = df.copy()
+        
+        for col, edges in self.bin_edges_.items():
+            values = df[col].to_numpy(dtype=np.float64)
+            codes = np.searchsorted(edges, values, side='right').astype(code_dtype)
+            codes[np.isnan(values)] = self.missing_code_
+            df_result[col] = codes
+        
+        return df_result
+    
+    def fit_transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Fit the edges on df and return its binned copy."""
+        return self.fit(df).transform(df)
+
+
+def sample(
+    source: Union[pd.DataFrame, Iterable[pd.DataFrame], str, Path, List[Union[str, Path]]],
+    n: int = 10_000,
+    stratify: Optional[str] = None,
+    random_state: Optional[int] = 42,
+    chunksize: int = _FIT_CHUNK_SIZE,
+    n_jobs: Optional[int] = None
+) -> pd.DataFrame:
+    """
+    Uniform (or per-stratum) random sample of a dataset too large to load, in one pass.
+    
+    Rows are streamed chunk by chunk through ``ReservoirSampler`` (reservoir
+    sampling with Algorithm L), so memory is bounded by the sample size and
+    one chunk. A list of file paths is treated as shards: each shard is
+    sampled in its own process and the reservoirs are merged, which gives the
+    same distribution as sampling the concatenated data.
+    
+    Parameters:
+    -----------
+    source : pd.DataFrame, iterable of pd.DataFrame, str, Path or list of paths
+        Data to sample: a DataFrame, chunks (e.g. ``pd.read_csv(path, chunksize=...)``),
+        a CSV or Parquet path (Parquet requires pyarrow), or a list of such paths (shards)
+    n : int, default=10000
+        Sample size; with stratify, the number of rows kept per stratum
+    stratify : str, optional
+        Column whose values define strata, each with its own reservoir (balanced classes)
+    random_state : int, optional, default=42
+        Random seed for reproducibility
+    chunksize : int, default=100000
+        Rows read per chunk from file sources
+    n_jobs : int, optional
+        Number of processes used to sample shards in parallel
+        
+    Returns:
+    --------
+    pd.DataFrame
+        Sampled rows with an added 'sample_weight' column: the number of source
+        rows each sampled row stands for (stratum size / stratum sample size).
+        Pass ``weights='sample_weight'`` to ``missing.analyze`` or
+        ``correlation.heatmap`` to get estimates for the full data
+        
+    Example:
+    --------
+    >>> df_sample = preprocessing.sample('events.csv', n=50_000)
+    >>> missing.analyze(df_sample, weights='sample_weight')
+    >>> df_balanced = preprocessing.sample(
+    ...     ['part-0.parquet', 'part-1.parquet'], n=5_000, stratify='label', n_jobs=-1
+    ... )
+    """
+    if (isinstance(source, (list, tuple)) and source
+            and all(isinstance(shard, (str, Path)) for shard in source)):
+        from joblib import Parallel, delayed
+        
+        seeds = np.random.SeedSequence(random_state).spawn(len(source))
+        samplers = Parallel(n_jobs=n_jobs)(
+            delayed(_sample_shard)(shard, n, stratify, seed, chunksize)
+            for shard, seed in zip(source, seeds)
+        )
+        sampler = samplers[0]
+        for other in samplers[1:]:
+            sampler.merge(other)
+    else:
+        sampler = ReservoirSampler(n=n, stratify=stratify, random_state=random_state)
+        for chunk in _iter_chunks(source, chunksize):
+            sampler.update(chunk)
+    
+    result = sampler.to_frame()
+    print(f"✓ Sampled {len(result)} of {sum(sampler.counts_.values())} rows"
+          + (f" across {len(sampler.counts_)} strata" if stratify is not None else ""))
+    
+    return result
+
+
+def _sample_shard(
+    shard: Union[str, Path],
+    n: int,
+    stratify: Optional[str],
+    seed: np.random.SeedSequence,
+    chunksize: int
+) -> 'ReservoirSampler':
+    """Sample one shard (run in a worker process)."""
+    sampler = ReservoirSampler(n=n, stratify=stratify, random_state=seed)
+    for chunk in _iter_chunks(shard, chunksize):
+        sampler.update(chunk)
+    return sampler
+
+
+def _iter_chunks(
+    source: Union[pd.DataFrame, Iterable[pd.DataFrame], str, Path],
+    chunksize: int
+) -> Iterable[pd.DataFrame]:
+    """DataFrame chunks of an in-memory frame, a chunk iterable or a CSV/Parquet source."""
+    if isinstance(source, pd.DataFrame):
+        return [source]
+    if _arrow.is_arrow_source(source):
+        return _arrow.iter_batches(source, chunksize)
+    if isinstance(source, (str, Path)):
+        return pd.read_csv(source, chunksize=chunksize)
+    return source
+
+
+def _hypergeometric(rng: np.random.Generator, ngood: int, nbad: int, nsample: int) -> int:
+    """
+    Number of good items in nsample draws without replacement from ngood + nbad.
+    
+    NumPy's sampler only accepts populations below 1e9 per side; larger ones
+    (multi-billion-row shards) are drawn exactly one item at a time, which
+    costs O(nsample) and nsample is at most the reservoir size.
+    """
+    if max(ngood, nbad) < 10 ** 9:
+        return int(rng.hypergeometric(ngood, nbad, nsample))
+    
+    good, remaining = int(ngood), int(ngood) + int(nbad)
+    taken = 0
+    for u in rng.random(nsample):
+        if u * remaining < good:
+            good -= 1
+            taken += 1
+        remaining -= 1
+    return taken
+
+
+class ReservoirSampler:
+    """
+    Streaming uniform sampler (reservoir sampling, Algorithm L), optionally per stratum.
+    
+    Algorithm L draws how many rows to skip before the next one enters the
+    reservoir, so after the reservoir fills, the cost per chunk is proportional
+    to the number of replacements (about n * log(N / n) in total) rather than to
+    the number of rows. Samplers fed with disjoint shards can be merged: the
+    merged reservoir takes a hypergeometric number of rows from each side, which
+    is again a uniform sample of the union.
+    
+    Parameters:
+    -----------
+    n : int, default=10000
+        Reservoir size (per stratum when stratify is set)
+    stratify : str, optional
+        Column whose values define strata, each with its own reservoir
+    random_state : int or np.random.SeedSequence, optional, default=42
+        Random seed for reproducibility
+        
+    Example:
+    --------
+    >>> sampler = preprocessing.ReservoirSampler(n=10_000, stratify='label')
+    >>> for chunk in pd.read_csv('train.csv', chunksize=100_000):
+    ...     sampler.update(chunk)
+    >>> df_sample = sampler.to_frame()
+    """
+    
+    def __init__(
+        self,
+        n: int = 10_000,
+        stratify: Optional[str] = None,
+        random_state: Optional[Union[int, np.random.SeedSequence]] = 42
+    ):
+        if n < 1:
+            raise ValueError("n must be at least 1")
+        
+        self.n = n
+        self.stratify = stratify
+        self.random_state = random_state
+        self._rng = np.random.default_rng(random_state)
+        self.counts_ = {}
+        self.reservoirs_ = {}
+        # stratum -> (largest key in the reservoir, index of the next row to take)
+        self._state = {}
+    
+    def update(self, chunk: pd.DataFrame) -> 'ReservoirSampler':
+        """Stream one chunk of rows through the reservoirs."""
+        if self.stratify is None:
+            self._update_stratum(None, chunk)
+        else:
+            groups = chunk.groupby(self.stratify, sort=False, dropna=False).indices
+            for key, positions in groups.items():
+                self._update_stratum(key, chunk.iloc[positions])
+        return self
+    
+    def _update_stratum(self, key, rows: pd.DataFrame) -> None:
+        """Algorithm L over the rows of one stratum."""
+        seen = self.counts_.get(key, 0)
+        reservoir = self.reservoirs_.get(key)
+        start = 0
+        
+        if seen < self.n:
+            start = min(self.n - seen, len(rows))
+            head = rows.iloc[:start]
+            reservoir = head if reservoir is None else pd.concat([reservoir, head])
+            if seen + start == self.n:
+                self._reset_state(key, self.n)
+        
+        if start < len(rows) and key in self._state:
+            w, next_index = self._state[key]
+            end = seen + len(rows)
+            replaced = {}
+            while next_index < end:
+                # Later replacements of the same slot overwrite earlier ones
+                replaced[int(self._rng.integers(self.n))] = next_index - seen
+                w *= np.exp(np.log(self._rng.random()) / self.n)
+                next_index += self._skip(w) + 1
+            self._state[key] = (w, next_index)
+            
+            if replaced:
+                keep = np.ones(len(reservoir), dtype=bool)
+                keep[list(replaced)] = False
+                reservoir = pd.concat([reservoir[keep], rows.iloc[list(replaced.values())]])
+        
+        self.reservoirs_[key] = reservoir
+        self.counts_[key] = seen + len(rows)
+    
+    def _skip(self, w: float) -> int:
+        """Number of rows to pass over before the next replacement."""
+        with np.errstate(divide='ignore'):
+            skip = np.floor(np.log(self._rng.random()) / np.log1p(-w))
+        return int(min(skip, np.iinfo(np.int64).max // 2))
+    
+    def _reset_state(self, key, seen: int) -> None:
+        """Draw the Algorithm L state for a full reservoir that has seen `seen` rows."""
+        # The largest of the n smallest of `seen` uniform keys is Beta(n, seen - n + 1)
+        w = self._rng.beta(self.n, seen - self.n + 1)
+        self._state[key] = (w, seen + self._skip(w))
+    
+    def merge(self, other: 'ReservoirSampler') -> 'ReservoirSampler':
+        """
+        Merge the reservoirs of a sampler fed with a disjoint part of the data.
+        
+        Both samplers must use the same n and stratify column.
+        """
+        if other.n != self.n or other.stratify != self.stratify:
+            raise ValueError("Can only merge samplers with the same n and stratify")
+        
+        for key, other_count in other.counts_.items():
+            count = self.counts_.get(key, 0)
+            if count == 0:
+                merged = other.reservoirs_[key]
+            else:
+                size = min(self.n, count + other_count)
+                from_self = _hypergeometric(self._rng, count, other_count, size)
+                mine, theirs = self.reservoirs_[key], other.reservoirs_[key]
+                keep_mine = self._rng.choice(len(mine), from_self, replace=False)
+                keep_theirs = self._rng.choice(len(theirs), size - from_self, replace=False)
+                merged = pd.concat([mine.iloc[np.sort(keep_mine)],
+                                    theirs.iloc[np.sort(keep_theirs)]])
+            
+            self.reservoirs_[key] = merged
+            self.counts_[key] = count + other_count
+            if self.counts_[key] >= self.n:
+                self._reset_state(key, self.counts_[key])
+        
+        return self
+    
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Sampled rows of all strata with a 'sample_weight' column.
+        
+        Returns:
+        --------
+        pd.DataFrame
+            Sampled rows (original index kept) and their weights, the number
+            of source rows each sampled row stands for
+        """
+        if not self.reservoirs_:
+            return pd.DataFrame({'sample_weight': pd.Series(dtype=np.float64)})
+        
+        frames = []
+        for key, reservoir in self.reservoirs_.items():
+            frames.append(reservoir.assign(sample_weight=self.counts_[key] / len(reservoir)))
+        return pd.concat(frames)
+
+
+def feature_selection_quick(
+    X: Union[pd.DataFrame, sp.spmatrix],
+    y: Union[pd.Series, np.ndarray],
+    k: int = 10,
+    method: str = 'f_classif',
+    n_jobs: Optional[int] = None
+) -> Tuple[Union[pd.DataFrame, sp.csr_matrix], List]:
+    """
+    Quick feature selection using statistical tests.
+    
+    Scores come from ``feature_scores``, which caches them per dataset and
+    method, so re-selecting with a different k does not recompute anything.
+    
+    Parameters:
+    -----------
+    X : pd.DataFrame or scipy.sparse matrix
+        Feature matrix. Sparse input is scored without densifying
+    y : pd.Series or np.ndarray
+        Target variable
+    k : int, default=10
+        Number of top features to select
+    method : str, default='f_classif'
+        Selection method: 'f_classif', 'f_regression', 'mutual_info_classif',
+        'mutual_info_regression'
+    n_jobs : int, optional
+        Number of processes used to score column blocks in parallel
+        
+    Returns:
+    --------
+    tuple
+        (Selected features DataFrame, List of selected feature names). For
+        sparse X, a CSR matrix of the selected columns and their column indices
+        
+    Example:
+    --------
+    >>> X_selected, selected_features = preprocessing.feature_selection_quick(
+    ...     X, y, k=15, method='mutual_info_classif', n_jobs=-1
     ... )
     """
-    from sklearn.feature_selection import SelectKBest, f_classif, f_regression
+    scores = _score_features(X, y, method, n_jobs)[0]
+    mask = _top_k_mask(scores, k)
+    
+    if sp.issparse(X):
+        selected_features = np.flatnonzero(mask).tolist()
+        X_selected = sp.csr_matrix(X)[:, selected_features]
+    else:
+        selected_features = X.columns[mask].tolist()
+        X_selected = X[selected_features]
+    
+    print(f"✓ Selected {len(selected_features)} features using {method}")
+    
+    return X_selected, selected_features
+
+
+def feature_scores(
+    X: Union[pd.DataFrame, sp.spmatrix],
+    y: Union[pd.Series, np.ndarray],
+    method: str = 'f_classif',
+    n_jobs: Optional[int] = None
+) -> pd.DataFrame:
+    """
+    Univariate score and p-value of every feature.
+    
+    Column blocks are scored in a process pool when n_jobs is set, and the
+    results are cached keyed on a fingerprint of (X, y) and the method.
+    Mutual information draws its noise from a fixed seed per column, so its
+    scores are reproducible and do not depend on n_jobs.
+    
+    Parameters:
+    -----------
+    X : pd.DataFrame or scipy.sparse matrix
+        Feature matrix. Sparse input is scored without densifying
+    y : pd.Series or np.ndarray
+        Target variable
+    method : str, default='f_classif'
+        Scoring method: 'f_classif', 'f_regression', 'mutual_info_classif', 'mutual_info_regression'
+    n_jobs : int, optional
+        Number of processes used to score column blocks in parallel
+        
+    Returns:
+    --------
+    pd.DataFrame
+        DataFrame with Feature, Score and P_Value columns (P_Value is NaN for
+        mutual information), sorted by score (descending). Features of sparse
+        X are identified by column index
+        
+    Example:
+    --------
+    >>> scores = preprocessing.feature_scores(X, y, method='mutual_info_classif', n_jobs=-1)
+    >>> print(scores.head(20))
+    """
+    scores, pvalues = _score_features(X, y, method, n_jobs)
+    
+    result = pd.DataFrame({
+        'Feature': np.arange(X.shape[1]) if sp.issparse(X) else X.columns,
+        'Score': scores,
+        'P_Value': pvalues
+    })
+    result = result.sort_values('Score', ascending=False, na_position='last')
+    
+    return result.reset_index(drop=True)
+
+
+# (fingerprint, method) -> (scores, pvalues), most recently used last
+_SCORE_CACHE: 'OrderedDict[Tuple[str, str], Tuple[np.ndarray, np.ndarray]]' = OrderedDict()
+_SCORE_CACHE_SIZE = 16
+
+
+def _score_features(
+    X: Union[pd.DataFrame, sp.spmatrix],
+    y: Union[pd.Series, np.ndarray],
+    method: str,
+    n_jobs: Optional[int]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Cached, optionally parallel univariate scores and p-values in column order."""
+    from joblib import Parallel, delayed, effective_n_jobs
+    from sklearn.feature_selection import f_classif, f_regression
     from sklearn.feature_selection import mutual_info_classif, mutual_info_regression
     
     # Map method strings to functions
@@ -339,13 +2197,938 @@ def feature_selection_quick(
     if method not in method_map:
         raise ValueError(f"Unknown method: {method}")
     
-    selector = SelectKBest(score_func=method_map[method], k=min(k, X.shape[1]))
-    X_selected = selector.fit_transform(X, y)
+    key = (_fingerprint(X, y), method)
+    if key in _SCORE_CACHE:
+        _SCORE_CACHE.move_to_end(key)
+        return _SCORE_CACHE[key]
     
-    # Get selected feature names
-    selected_mask = selector.get_support()
-    selected_features = X.columns[selected_mask].tolist()
+    # CSC keeps sparse input sparse and makes column blocks cheap to slice
+    values = sp.csc_matrix(X) if sp.issparse(X) else X.to_numpy()
+    y_values = np.asarray(y)
+    n_blocks = max(min(effective_n_jobs(n_jobs), X.shape[1]) if n_jobs is not None else 1, 1)
+    blocks = np.array_split(np.arange(X.shape[1]), n_blocks)
     
-    print(f"✓ Selected {len(selected_features)} features using {method}")
+    # Mutual information adds seeded noise on every call; one seed per column
+    # makes its scores independent of how the columns are blocked
+    seeds = None
+    if method.startswith('mutual_info'):
+        seeds = np.array([int(child.generate_state(1)[0])
+                          for child in np.random.SeedSequence(42).spawn(X.shape[1])])
+    
+    if len(blocks) > 1:
+        results = Parallel(n_jobs=n_jobs)(
+            delayed(_score_block)(
+                method_map[method], values[:, block], y_values,
+                None if seeds is None else seeds[block]
+            )
+            for block in blocks
+        )
+    else:
+        results = [_score_block(method_map[method], values, y_values, seeds)]
+    
+    scores = np.concatenate([r[0] for r in results])
+    pvalues = np.concatenate([r[1] for r in results])
+    
+    _SCORE_CACHE[key] = (scores, pvalues)
+    if len(_SCORE_CACHE) > _SCORE_CACHE_SIZE:
+        _SCORE_CACHE.popitem(last=False)
+    
+    return scores, pvalues
+
+
+def _top_k_mask(scores: np.ndarray, k: int) -> np.ndarray:
+    """Mask of the k best scores, ranked like SelectKBest (NaN last, stable ties)."""
+    scores = np.where(np.isnan(scores), np.finfo(np.float64).min, scores)
+    mask = np.zeros(len(scores), dtype=bool)
+    k = min(k, len(scores))
+    if k > 0:
+        mask[np.argsort(scores, kind='mergesort')[-k:]] = True
+    return mask
+
+
+def _score_block(
+    score_func,
+    values: np.ndarray,
+    y: np.ndarray,
+    seeds: Optional[np.ndarray] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Score one block of columns; with seeds (mutual information) each column
+    is scored on its own with its seed, and there are no p-values."""
+    if seeds is not None:
+        scores = [score_func(values[:, [j]], y, random_state=seed)[0]
+                  for j, seed in enumerate(seeds)]
+        return np.asarray(scores, dtype=np.float64), np.full(values.shape[1], np.nan)
+    result = score_func(values, y)
+    if isinstance(result, tuple):
+        return np.asarray(result[0], dtype=np.float64), np.asarray(result[1], dtype=np.float64)
+    return np.asarray(result, dtype=np.float64), np.full(values.shape[1], np.nan)
+
+
+def _fingerprint(X: Union[pd.DataFrame, sp.spmatrix], y: Union[pd.Series, np.ndarray]) -> str:
+    """Content hash of a feature frame (or sparse matrix) and target, used as a cache key."""
+    import hashlib
+    
+    digest = hashlib.blake2b(digest_size=16)
+    if sp.issparse(X):
+        X = sp.csr_matrix(X)
+        digest.update(repr((X.shape, X.dtype.str)).encode())
+        for part in (X.indptr, X.indices, X.data):
+            digest.update(np.ascontiguousarray(part).tobytes())
+    else:
+        digest.update(repr(X.columns.tolist()).encode())
+        digest.update(pd.util.hash_pandas_object(X, index=False).to_numpy().tobytes())
+    digest.update(pd.util.hash_array(np.asarray(y).ravel()).tobytes())
+    return digest.hexdigest()
+
+
+class StreamingFeatureSelector:
+    """
+    Chunked univariate F-test feature selection for data larger than memory.
+    
+    Both tests reduce to sufficient statistics that are accumulated chunk by
+    chunk with ``update`` and combined across workers with ``merge``: per-class
+    counts, means and sums of squared deviations for 'f_classif', and means,
+    sums of squared deviations and X-y co-moments for 'f_regression'. Moments
+    are merged with the parallel update of Chan et al., so the F-scores and
+    p-values match sklearn's ``f_classif`` / ``f_regression`` on the full data.
+    
+    Parameters:
+    -----------
+    method : str, default='f_classif'
+        Test to accumulate: 'f_classif' or 'f_regression'
+        
+    Example:
+    --------
+    >>> selector = preprocessing.StreamingFeatureSelector('f_classif')
+    >>> for chunk in pd.read_csv('train.csv', chunksize=500_000):
+    ...     selector.update(chunk.drop(columns='target'), chunk['target'])
+    >>> selected_features = selector.select(k=50)
+    """
+    
+    def __init__(self, method: str = 'f_classif'):
+        if method not in ('f_classif', 'f_regression'):
+            raise ValueError(f"Unknown method: {method}. Use 'f_classif' or 'f_regression'")
+        
+        self.method = method
+        self.n_samples_ = 0
+    
+    def update(
+        self,
+        X: Union[pd.DataFrame, np.ndarray],
+        y: Union[pd.Series, np.ndarray]
+    ) -> 'StreamingFeatureSelector':
+        """
+        Accumulate the statistics of one chunk of rows.
+        
+        Parameters:
+        -----------
+        X : pd.DataFrame or np.ndarray
+            Feature chunk (same columns for every chunk)
+        y : pd.Series or np.ndarray
+            Target values of the chunk
+            
+        Returns:
+        --------
+        StreamingFeatureSelector
+            The updated selector
+        """
+        if isinstance(X, pd.DataFrame):
+            names = X.columns.tolist()
+        else:
+            names = list(range(np.shape(X)[1]))
+        values = np.asarray(X, dtype=np.float64)
+        y_values = np.asarray(y)
+        
+        if np.isnan(values).any():
+            raise ValueError("Input contains NaN; impute missing values before scoring")
+        if len(values) == 0:
+            return self
+        
+        if self.method == 'f_classif':
+            classes, inverse = np.unique(y_values, return_inverse=True)
+            counts = np.bincount(inverse).astype(np.float64)
+            # Group sums via a sparse one-hot product, on shifted values for stability
+            shift = values.mean(axis=0)
+            shifted = values - shift
+            groups = sp.csr_matrix(
+                (np.ones(len(inverse)), (inverse, np.arange(len(inverse)))),
+                shape=(len(classes), len(inverse))
+            )
+            means = (groups @ shifted) / counts[:, None]
+            m2 = groups @ (shifted ** 2) - counts[:, None] * means ** 2
+            state = {'classes': list(classes), 'counts': counts,
+                     'means': means + shift, 'm2': np.maximum(m2, 0)}
+        else:
+            y_values = y_values.astype(np.float64)
+            mean_x = values.mean(axis=0)
+            mean_y = y_values.mean()
+            centered = values - mean_x
+            centered_y = y_values - mean_y
+            state = {'count': float(len(values)), 'mean_x': mean_x, 'mean_y': mean_y,
+                     'm2_x': (centered ** 2).sum(axis=0), 'm2_y': centered_y @ centered_y,
+                     'c_xy': centered_y @ centered}
+        
+        return self._merge_state(names, len(values), state)
+    
+    def merge(self, other: 'StreamingFeatureSelector') -> 'StreamingFeatureSelector':
+        """Merge the statistics accumulated by another selector (e.g. another worker)."""
+        if other.method != self.method:
+            raise ValueError("Can only merge selectors using the same method")
+        if other.n_samples_ == 0:
+            return self
+        return self._merge_state(other.feature_names_, other.n_samples_, other.state_)
+    
+    def _merge_state(self, names: list, n_samples: int, state: dict) -> 'StreamingFeatureSelector':
+        """Chan et al. parallel merge of a partial state into the accumulated one."""
+        if self.n_samples_ == 0:
+            import copy
+            
+            # Deep copy: the class list is extended in place by later merges
+            self.feature_names_ = list(names)
+            self.state_ = copy.deepcopy(state)
+            self.n_samples_ = n_samples
+            return self
+        
+        if list(names) != self.feature_names_:
+            raise ValueError("All chunks must have the same feature columns")
+        
+        acc = self.state_
+        if self.method == 'f_classif':
+            for j, label in enumerate(state['classes']):
+                if label not in acc['classes']:
+                    acc['classes'].append(label)
+                    acc['counts'] = np.append(acc['counts'], state['counts'][j])
+                    acc['means'] = np.vstack([acc['means'], state['means'][j]])
+                    acc['m2'] = np.vstack([acc['m2'], state['m2'][j]])
+                    continue
+                i = acc['classes'].index(label)
+                n_a, n_b = acc['counts'][i], state['counts'][j]
+                delta = state['means'][j] - acc['means'][i]
+                total = n_a + n_b
+                acc['m2'][i] += state['m2'][j] + delta ** 2 * n_a * n_b / total
+                acc['means'][i] += delta * n_b / total
+                acc['counts'][i] = total
+        else:
+            n_a, n_b = acc['count'], state['count']
+            total = n_a + n_b
+            delta_x = state['mean_x'] - acc['mean_x']
+            delta_y = state['mean_y'] - acc['mean_y']
+            acc['m2_x'] = acc['m2_x'] + state['m2_x'] + delta_x ** 2 * n_a * n_b / total
+            acc['m2_y'] = acc['m2_y'] + state['m2_y'] + delta_y ** 2 * n_a * n_b / total
+            acc['c_xy'] = acc['c_xy'] + state['c_xy'] + delta_x * delta_y * n_a * n_b / total
+            acc['mean_x'] = acc['mean_x'] + delta_x * n_b / total
+            acc['mean_y'] = acc['mean_y'] + delta_y * n_b / total
+            acc['count'] = total
+        
+        self.n_samples_ += n_samples
+        return self
+    
+    def _f_scores(self) -> Tuple[np.ndarray, np.ndarray]:
+        """F-scores and p-values from the accumulated statistics."""
+        from scipy import special
+        
+        if self.n_samples_ == 0:
+            raise ValueError("No data has been accumulated; call update() first")
+        
+        acc = self.state_
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if self.method == 'f_classif':
+                counts = acc['counts'][:, None]
+                grand_mean = (counts * acc['means']).sum(axis=0) / self.n_samples_
+                ss_between = (counts * (acc['means'] - grand_mean) ** 2).sum(axis=0)
+                ss_within = acc['m2'].sum(axis=0)
+                df_between = len(acc['classes']) - 1
+                df_within = self.n_samples_ - len(acc['classes'])
+                f = (ss_between / df_between) / (ss_within / df_within)
+                p = special.fdtrc(df_between, df_within, f)
+            else:
+                r = acc['c_xy'] / np.sqrt(acc['m2_x'] * acc['m2_y'])
+                df_resid = self.n_samples_ - 2
+                f = r ** 2 / (1 - r ** 2) * df_resid
+                p = special.fdtrc(1, df_resid, f)
+        
+        return f, p
+    
+    def scores(self) -> pd.DataFrame:
+        """
+        Per-feature F-score and p-value table.
+        
+        Returns:
+        --------
+        pd.DataFrame
+            DataFrame with Feature, Score and P_Value columns, sorted by score (descending)
+        """
+        f, p = self._f_scores()
+        result = pd.DataFrame({'Feature': self.feature_names_, 'Score': f, 'P_Value': p})
+        result = result.sort_values('Score', ascending=False, na_position='last')
+        return result.reset_index(drop=True)
+    
+    def select(self, k: int = 10) -> List:
+        """Names of the k best features, in their original column order."""
+        mask = _top_k_mask(self._f_scores()[0], k)
+        return [name for name, keep in zip(self.feature_names_, mask) if keep]
+
+
+def feature_selection_mrmr(
+    X: pd.DataFrame,
+    y: Union[pd.Series, np.ndarray],
+    k: int = 10,
+    method: str = 'pearson',
+    scheme: str = 'difference'
+) -> Tuple[pd.DataFrame, List[str]]:
+    """
+    Minimum-redundancy-maximum-relevance (mRMR) feature selection.
+    
+    Features are picked greedily by their absolute correlation with the target
+    (relevance) penalized by their mean absolute correlation with the features
+    already selected (redundancy). Redundancy is computed lazily, one column
+    of the correlation matrix per selected feature, so selecting k of p
+    features costs O(k * p * n) and never builds the full p x p matrix.
+    
+    Parameters:
+    -----------
+    X : pd.DataFrame
+        Feature matrix (only numeric columns are considered)
+    y : pd.Series or np.ndarray
+        Target variable
+    k : int, default=10
+        Number of features to select
+    method : str, default='pearson'
+        Correlation method: 'pearson' or 'spearman'
+    scheme : str, default='difference'
+        How relevance and redundancy are combined: 'difference'
+        (relevance - redundancy) or 'quotient' (relevance / redundancy)
+        
+    Returns:
+    --------
+    tuple
+        (Selected features DataFrame, List of selected feature names in selection order)
+        
+    Example:
+    --------
+    >>> X_selected, selected_features = preprocessing.feature_selection_mrmr(X, y, k=15)
+    """
+    from dshelper.correlation import correlation_with_target
+    
+    if method not in ('pearson', 'spearman'):
+        raise ValueError(f"Unknown method: {method}. Use 'pearson' or 'spearman'")
+    if scheme not in ('difference', 'quotient'):
+        raise ValueError(f"Unknown scheme: {scheme}. Use 'difference' or 'quotient'")
+    
+    X_numeric = X.select_dtypes(include=[np.number])
+    if not isinstance(y, pd.Series):
+        y = pd.Series(np.asarray(y), index=X.index)
+    
+    relevance = correlation_with_target(X_numeric, y, method=method, plot=False)
+    relevance = relevance.reindex(X_numeric.columns).abs().fillna(0).to_numpy()
+    
+    # Unit-norm centered columns: a correlation column is then a single mat-vec.
+    # Missing values are treated as the column mean (they contribute zero).
+    values = X_numeric.rank() if method == 'spearman' else X_numeric
+    values = values.to_numpy(dtype=np.float64)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', category=RuntimeWarning)
+        values = np.nan_to_num(values - np.nanmean(values, axis=0))
+    norms = np.linalg.norm(values, axis=0)
+    values /= np.where(norms > 0, norms, 1.0)
+    
+    n_features = X_numeric.shape[1]
+    redundancy_sum = np.zeros(n_features)
+    available = np.ones(n_features, dtype=bool)
+    selected = []
+    
+    for step in range(min(k, n_features)):
+        if step == 0:
+            score = relevance.copy()
+        elif scheme == 'difference':
+            score = relevance - redundancy_sum / step
+        else:
+            score = relevance / (redundancy_sum / step + 1e-12)
+        
+        score[~available] = -np.inf
+        best = int(np.argmax(score))
+        selected.append(best)
+        available[best] = False
+        
+        redundancy_sum += np.abs(values.T @ values[:, best])
+    
+    selected_features = X_numeric.columns[selected].tolist()
+    
+    print(f"✓ Selected {len(selected_features)} features using mRMR ({method})")
+    
+    return X[selected_features], selected_features
+
+
+class Preprocessor:
+    """
+    Fitted preprocessing pipeline: imputation, outlier clipping, categorical
+    encoding and scaling, fitted once and applied identically at inference.
+    
+    All fitted statistics are plain NumPy arrays and vocabularies, so the
+    pipeline serializes to a compact .npz artifact and ``transform`` on a
+    single row (a dict or 1-D array) runs in microseconds without building
+    a DataFrame.
+    
+    Parameters:
+    -----------
+    numeric_columns : list, optional
+        Numeric columns to impute, clip and scale. If None, uses all numeric columns
+    categorical_columns : list, optional
+        Columns to encode. If None, uses all object/category columns
+    impute : str, optional, default='median'
+        Fill value for missing numeric values: 'mean', 'median', or None to skip.
+        Missing categorical values are filled with the most frequent category
+    outliers : str, optional, default='iqr'
+        Outlier clipping bounds: 'iqr', 'zscore', or None to skip
+    outlier_threshold : float, default=1.5
+        Threshold for the outlier bounds (1.5 for IQR, 3 for z-score typically)
+    encoding : str, default='onehot'
+        Categorical encoding: 'onehot' or 'ordinal'. Unknown categories become
+        all zeros (onehot) or -1 (ordinal)
+    scaler : str, default='standard'
+        Type of scaler: 'standard', 'minmax', 'robust', or 'none'
+        
+    Example:
+    --------
+    >>> prep = preprocessing.Preprocessor(scaler='robust').fit(df_train)
+    >>> prep.save('preprocessor.npz')
+    >>> prep = preprocessing.Preprocessor.load('preprocessor.npz')
+    >>> x = prep.transform({'age': 42, 'city': 'Paris'})
+    """
+    
+    def __init__(
+        self,
+        numeric_columns: Optional[List[str]] = None,
+        categorical_columns: Optional[List[str]] = None,
+        impute: Optional[str] = 'median',
+        outliers: Optional[str] = 'iqr',
+        outlier_threshold: float = 1.5,
+        encoding: str = 'onehot',
+        scaler: str = 'standard'
+    ):
+        if impute not in ('mean', 'median', None):
+            raise ValueError(f"Unknown impute strategy: {impute}")
+        if outliers not in ('iqr', 'zscore', None):
+            raise ValueError(f"Unknown outlier method: {outliers}")
+        if encoding not in ('onehot', 'ordinal'):
+            raise ValueError(f"Unknown encoding method: {encoding}")
+        if scaler.lower() not in ('standard', 'minmax', 'robust', 'none'):
+            raise ValueError(f"Unknown scaler type: {scaler}. "
+                             "Use 'standard', 'minmax', 'robust', or 'none'")
+        
+        self.numeric_columns = numeric_columns
+        self.categorical_columns = categorical_columns
+        self.impute = impute
+        self.outliers = outliers
+        self.outlier_threshold = outlier_threshold
+        self.encoding = encoding
+        self.scaler = scaler.lower()
+    
+    def fit(self, df: pd.DataFrame) -> 'Preprocessor':
+        """
+        Fit all preprocessing statistics on a DataFrame.
+        
+        Parameters:
+        -----------
+        df : pd.DataFrame
+            Training data
+            
+        Returns:
+        --------
+        Preprocessor
+            The fitted preprocessor
+        """
+        numeric = self.numeric_columns
+        if numeric is None:
+            numeric = df.select_dtypes(include=[np.number]).columns.tolist()
+        categorical = self.categorical_columns
+        if categorical is None:
+            categorical = df.select_dtypes(include=['object', 'category']).columns.tolist()
+        
+        self.numeric_columns_ = list(numeric)
+        self.categorical_columns_ = list(categorical)
+        
+        values = df[self.numeric_columns_].to_numpy(dtype=np.float64, copy=True)
+        n_numeric = values.shape[1]
+        
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', category=RuntimeWarning)
+            
+            # All-missing columns are filled with 0
+            if self.impute == 'mean':
+                self.fill_ = np.nan_to_num(np.nanmean(values, axis=0))
+            elif self.impute == 'median':
+                self.fill_ = np.nan_to_num(np.nanmedian(values, axis=0))
+            else:
+                self.fill_ = np.full(n_numeric, np.nan)
+            
+            if self.outliers == 'iqr':
+                q1, q3 = np.nanquantile(values, [0.25, 0.75], axis=0)
+                self.lower_ = q1 - self.outlier_threshold * (q3 - q1)
+                self.upper_ = q3 + self.outlier_threshold * (q3 - q1)
+            elif self.outliers == 'zscore':
+                mean = np.nanmean(values, axis=0)
+                std = np.nanstd(values, axis=0, ddof=1)
+                self.lower_ = mean - self.outlier_threshold * std
+                self.upper_ = mean + self.outlier_threshold * std
+            else:
+                self.lower_ = np.full(n_numeric, -np.inf)
+                self.upper_ = np.full(n_numeric, np.inf)
+            
+            values = self._impute_and_clip(values)
+            
+            if self.scaler == 'standard':
+                center, scale = np.nanmean(values, axis=0), np.nanstd(values, axis=0)
+            elif self.scaler == 'minmax':
+                center = np.nanmin(values, axis=0)
+                scale = np.nanmax(values, axis=0) - center
+            elif self.scaler == 'robust':
+                q1, center, q3 = np.nanquantile(values, [0.25, 0.5, 0.75], axis=0)
+                scale = q3 - q1
+            else:
+                center, scale = np.zeros(n_numeric), np.ones(n_numeric)
+        
+        # Constant columns are left unscaled, as sklearn scalers do
+        self.center_ = np.nan_to_num(center)
+        self.scale_ = np.where(np.isfinite(scale) & (scale > 0), scale, 1.0)
+        
+        self.vocabularies_ = []
+        self.category_fill_ = []
+        for col in self.categorical_columns_:
+            counts = df[col].value_counts(dropna=True)
+            self.vocabularies_.append(sorted(counts.index.tolist(), key=str))
+            self.category_fill_.append(counts.index[0] if len(counts) else None)
+        
+        self._build_lookups()
+        
+        return self
+    
+    def _impute_and_clip(self, values: np.ndarray) -> np.ndarray:
+        """Fill missing numeric values and clip them to the outlier bounds (in place)."""
+        if self.impute:
+            missing = np.isnan(values)
+            if missing.any():
+                np.copyto(values, np.broadcast_to(self.fill_, values.shape), where=missing)
+        return np.clip(values, self.lower_, self.upper_, out=values)
+    
+    def _build_lookups(self) -> None:
+        """Precompute the per-row lookup tables used by transform."""
+        self._inv_scale = 1.0 / self.scale_
+        self._codes = [{value: code for code, value in enumerate(vocab)}
+                       for vocab in self.vocabularies_]
+        self._vocab_index = [pd.Index(vocab) for vocab in self.vocabularies_]
+        self._fill_codes = [lookup.get(fill, -1)
+                            for lookup, fill in zip(self._codes, self.category_fill_)]
+        
+        n_numeric = len(self.numeric_columns_)
+        if self.encoding == 'onehot':
+            sizes = [len(vocab) for vocab in self.vocabularies_]
+        else:
+            sizes = [1] * len(self.vocabularies_)
+        self._offsets = n_numeric + np.concatenate([[0], np.cumsum(sizes)]).astype(int)
+        self.n_features_out_ = int(self._offsets[-1])
+        
+        names = list(self.numeric_columns_)
+        for col, vocab in zip(self.categorical_columns_, self.vocabularies_):
+            if self.encoding == 'onehot':
+                names.extend(f'{col}_{value}' for value in vocab)
+            else:
+                names.append(col)
+        self.feature_names_out_ = names
+    
+    def transform(
+        self,
+        X: Union[pd.DataFrame, np.ndarray, dict]
+    ) -> np.ndarray:
+        """
+        Apply the fitted preprocessing.
+        
+        Parameters:
+        -----------
+        X : pd.DataFrame, np.ndarray or dict
+            A DataFrame or 2-D array (batch), or a single row given as a dict
+            of column -> value or a 1-D array. Arrays must list the numeric
+            columns followed by the categorical columns, in fitted order
+            
+        Returns:
+        --------
+        np.ndarray
+            Transformed features: 2-D for batches, 1-D for a single row.
+            Column names are in ``feature_names_out_``
+        """
+        if isinstance(X, dict):
+            return self._transform_row(X)
+        if isinstance(X, np.ndarray):
+            if X.ndim == 1:
+                if not self.categorical_columns_:
+                    values = X.astype(np.float64)
+                    return (self._impute_and_clip(values) - self.center_) * self._inv_scale
+                return self._transform_row(dict(zip(self.input_columns_, X)))
+            X = pd.DataFrame(X, columns=self.input_columns_)
+        
+        out = np.zeros((len(X), self.n_features_out_))
+        n_numeric = len(self.numeric_columns_)
+        
+        # Numeric columns are copied straight into the output and transformed
+        # there, so no intermediate n x p array is allocated
+        values = out[:, :n_numeric]
+        for j, col in enumerate(self.numeric_columns_):
+            values[:, j] = X[col].to_numpy(dtype=np.float64)
+        self._impute_and_clip(values)
+        np.subtract(values, self.center_, out=values)
+        np.multiply(values, self._inv_scale, out=values)
+        
+        rows = np.arange(len(X))
+        for j, col in enumerate(self.categorical_columns_):
+            series = X[col]
+            codes = self._vocab_index[j].get_indexer(series)
+            # Missing rows take the fill's code, as in _transform_row (fillna would
+            # fail on a categorical batch whose categories lack the fill value)
+            codes[series.isna().to_numpy()] = self._fill_codes[j]
+            if self.encoding == 'onehot':
+                known = codes >= 0
+                out[rows[known], self._offsets[j] + codes[known]] = 1.0
+            else:
+                out[:, self._offsets[j]] = codes
+        
+        return out
     
-    return pd.DataFrame(X_selected, columns=selected_features, index=X.index), selected_features
+    def _transform_row(self, row: dict) -> np.ndarray:
+        """Transform a single row given as a dict, without pandas."""
+        out = np.zeros(self.n_features_out_)
+        n_numeric = len(self.numeric_columns_)
+        
+        values = np.fromiter(
+            (np.nan if row.get(col) is None else row[col] for col in self.numeric_columns_),
+            dtype=np.float64, count=n_numeric
+        )
+        values = self._impute_and_clip(values)
+        out[:n_numeric] = (values - self.center_) * self._inv_scale
+        
+        for j, col in enumerate(self.categorical_columns_):
+            value = row.get(col)
+            if value is None or value != value:  # None or NaN
+                code = self._fill_codes[j]
+            else:
+                code = self._codes[j].get(value, -1)
+            if self.encoding == 'onehot':
+                if code >= 0:
+                    out[self._offsets[j] + code] = 1.0
+            else:
+                out[self._offsets[j]] = code
+        
+        return out
+    
+    def fit_transform(self, df: pd.DataFrame) -> np.ndarray:
+        """Fit on a DataFrame and return its transformed features."""
+        return self.fit(df).transform(df)
+    
+    @property
+    def input_columns_(self) -> List[str]:
+        """Input column order expected for array input."""
+        return self.numeric_columns_ + self.categorical_columns_
+    
+    def save(self, path: Union[str, Path]) -> None:
+        """
+        Save the fitted preprocessor to a compact .npz artifact.
+        
+        Fitted statistics are stored as arrays and the configuration and
+        vocabularies as JSON, so loading never needs pickle.
+        """
+        import json
+        
+        meta = {
+            'numeric_columns': self.numeric_columns_,
+            'categorical_columns': self.categorical_columns_,
+            'impute': self.impute,
+            'outliers': self.outliers,
+            'outlier_threshold': self.outlier_threshold,
+            'encoding': self.encoding,
+            'scaler': self.scaler,
+            'vocabularies': [[_to_builtin(v) for v in vocab] for vocab in self.vocabularies_],
+            'category_fill': [_to_builtin(v) for v in self.category_fill_],
+        }
+        np.savez(
+            path,
+            fill=self.fill_, lower=self.lower_, upper=self.upper_,
+            center=self.center_, scale=self.scale_,
+            meta=np.array(json.dumps(meta))
+        )
+    
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> 'Preprocessor':
+        """Load a preprocessor saved with ``save``."""
+        import json
+        
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data['meta']))
+            prep = cls(
+                numeric_columns=meta['numeric_columns'],
+                categorical_columns=meta['categorical_columns'],
+                impute=meta['impute'],
+                outliers=meta['outliers'],
+                outlier_threshold=meta['outlier_threshold'],
+                encoding=meta['encoding'],
+                scaler=meta['scaler']
+            )
+            prep.numeric_columns_ = meta['numeric_columns']
+            prep.categorical_columns_ = meta['categorical_columns']
+            prep.fill_ = data['fill']
+            prep.lower_ = data['lower']
+            prep.upper_ = data['upper']
+            prep.center_ = data['center']
+            prep.scale_ = data['scale']
+        
+        prep.vocabularies_ = meta['vocabularies']
+        prep.category_fill_ = meta['category_fill']
+        prep._build_lookups()
+        
+        return prep
+
+
+class PreprocessingPlan:
+    """
+    Declarative preprocessing plan: missing values -> outliers -> encoding -> scaling.
+    
+    Steps are declared with the same names and options as the standalone
+    functions, but instead of one full copy and pass per function the plan
+    fits every statistic from one sorted, column-major copy of the numeric
+    data: fill values, outlier bounds of the filled data and scaling
+    statistics of the clipped data are all read from the sorted columns with
+    index lookups. The result compiles into a fitted ``Preprocessor``, whose
+    ``transform`` writes all steps into one preallocated output array.
+    
+    Results match running ``fill_missing`` -> ``handle_outliers(action='clip')``
+    -> ``encode_categorical`` -> scaling in sequence, except that categorical
+    missing values are filled with the most frequent category and indicator
+    columns are not scaled.
+    
+    Parameters:
+    -----------
+    numeric_columns : list, optional
+        Numeric columns. If None, uses all numeric columns
+    categorical_columns : list, optional
+        Categorical columns. If None, uses all object/category columns. They
+        are dropped from the output unless an encode_categorical step is declared
+        
+    Example:
+    --------
+    >>> plan = (preprocessing.PreprocessingPlan()
+    ...         .fill_missing('median')
+    ...         .handle_outliers('iqr', threshold=1.5)
+    ...         .encode_categorical('onehot')
+    ...         .scale('standard'))
+    >>> X_train = plan.fit_transform(df_train)
+    >>> X_test = plan.transform(df_test)
+    """
+    
+    _ORDER = ('fill_missing', 'handle_outliers', 'encode_categorical', 'scale')
+    
+    def __init__(
+        self,
+        numeric_columns: Optional[List[str]] = None,
+        categorical_columns: Optional[List[str]] = None
+    ):
+        self.numeric_columns = numeric_columns
+        self.categorical_columns = categorical_columns
+        self.steps = {}
+    
+    def fill_missing(self, strategy: str = 'median') -> 'PreprocessingPlan':
+        """Declare imputation of numeric columns with their 'mean' or 'median'."""
+        if strategy not in ('mean', 'median'):
+            raise ValueError(f"Unknown strategy for a plan: {strategy}. Use 'mean' or 'median'")
+        return self._add_step('fill_missing', strategy=strategy)
+    
+    def handle_outliers(self, method: str = 'iqr', threshold: float = 1.5) -> 'PreprocessingPlan':
+        """Declare clipping of numeric columns to 'iqr' or 'zscore' bounds."""
+        if method not in ('iqr', 'zscore'):
+            raise ValueError(f"Unknown method for a plan: {method}. Use 'iqr' or 'zscore'")
+        return self._add_step('handle_outliers', method=method, threshold=threshold)
+    
+    def encode_categorical(self, method: str = 'onehot') -> 'PreprocessingPlan':
+        """Declare 'onehot' or 'ordinal' encoding of categorical columns."""
+        if method not in ('onehot', 'ordinal'):
+            raise ValueError(f"Unknown encoding method for a plan: {method}. "
+                             "Use 'onehot' or 'ordinal'")
+        return self._add_step('encode_categorical', method=method)
+    
+    def scale(self, scaler: str = 'standard') -> 'PreprocessingPlan':
+        """Declare 'standard', 'minmax' or 'robust' scaling of numeric columns."""
+        if scaler.lower() not in ('standard', 'minmax', 'robust'):
+            raise ValueError(f"Unknown scaler type: {scaler}. "
+                             "Use 'standard', 'minmax', or 'robust'")
+        return self._add_step('scale', scaler=scaler.lower())
+    
+    def _add_step(self, name: str, **options) -> 'PreprocessingPlan':
+        """Record a step, enforcing the fused execution order."""
+        if name in self.steps:
+            raise ValueError(f"Step '{name}' is already in the plan")
+        later = [step for step in self.steps if self._ORDER.index(step) > self._ORDER.index(name)]
+        if later:
+            raise ValueError(f"Step '{name}' must come before {later}; plans run in the order "
+                             f"{' -> '.join(self._ORDER)}")
+        self.steps[name] = options
+        return self
+    
+    def fit(self, df: pd.DataFrame) -> 'PreprocessingPlan':
+        """
+        Fit all steps of the plan.
+        
+        Parameters:
+        -----------
+        df : pd.DataFrame
+            Training data
+            
+        Returns:
+        --------
+        PreprocessingPlan
+            The fitted plan; the compiled pipeline is in ``preprocessor_``
+        """
+        numeric = self.numeric_columns
+        if numeric is None:
+            numeric = df.select_dtypes(include=[np.number]).columns.tolist()
+        categorical = self.categorical_columns
+        if categorical is None:
+            categorical = df.select_dtypes(include=['object', 'category']).columns.tolist()
+        if 'encode_categorical' not in self.steps:
+            categorical = []
+        
+        fill = self.steps.get('fill_missing', {}).get('strategy')
+        outliers = self.steps.get('handle_outliers', {})
+        scaler = self.steps.get('scale', {}).get('scaler', 'none')
+        
+        prep = Preprocessor(
+            numeric_columns=list(numeric),
+            categorical_columns=list(categorical),
+            impute=fill,
+            outliers=outliers.get('method'),
+            outlier_threshold=outliers.get('threshold', 1.5),
+            encoding=self.steps.get('encode_categorical', {}).get('method', 'onehot'),
+            scaler=scaler
+        )
+        prep.numeric_columns_ = list(numeric)
+        prep.categorical_columns_ = list(categorical)
+        
+        # The single fused scan: one column-major copy, sorted in place (NaNs last)
+        n_rows, n_numeric = len(df), len(numeric)
+        block = np.empty((n_rows, n_numeric), order='F')
+        for j, col in enumerate(numeric):
+            block[:, j] = df[col].to_numpy(dtype=np.float64)
+        block.sort(axis=0)
+        n_valid = n_rows - np.isnan(block).sum(axis=0)
+        
+        stats = np.array([
+            _sorted_column_stats(block[:n_valid[j], j], n_rows, fill,
+                                 outliers.get('method'), outliers.get('threshold', 1.5), scaler)
+            for j in range(n_numeric)
+        ]).reshape(n_numeric, 5)
+        prep.fill_ = stats[:, 0] if fill else np.full(n_numeric, np.nan)
+        prep.lower_, prep.upper_ = stats[:, 1], stats[:, 2]
+        prep.center_ = np.nan_to_num(stats[:, 3])
+        prep.scale_ = np.where(np.isfinite(stats[:, 4]) & (stats[:, 4] > 0), stats[:, 4], 1.0)
+        
+        prep.vocabularies_ = []
+        prep.category_fill_ = []
+        for col in categorical:
+            counts = df[col].value_counts(dropna=True)
+            prep.vocabularies_.append(sorted(counts.index.tolist(), key=str))
+            prep.category_fill_.append(counts.index[0] if len(counts) else None)
+        
+        prep._build_lookups()
+        self.preprocessor_ = prep
+        
+        return self
+    
+    def transform(self, X: Union[pd.DataFrame, np.ndarray, dict]) -> np.ndarray:
+        """Apply the fitted plan; see ``Preprocessor.transform``."""
+        return self.preprocessor_.transform(X)
+    
+    def fit_transform(self, df: pd.DataFrame) -> np.ndarray:
+        """Fit the plan on a DataFrame and return its transformed features."""
+        return self.fit(df).transform(df)
+    
+    @property
+    def feature_names_out_(self) -> List[str]:
+        """Names of the output columns."""
+        return self.preprocessor_.feature_names_out_
+    
+    def save(self, path: Union[str, Path]) -> None:
+        """Save the fitted plan as a ``Preprocessor`` .npz artifact."""
+        self.preprocessor_.save(path)
+
+
+def _sorted_column_stats(
+    s: np.ndarray,
+    n_rows: int,
+    fill: Optional[str],
+    outliers: Optional[str],
+    threshold: float,
+    scaler: str
+) -> Tuple[float, float, float, float, float]:
+    """
+    Fill value, clipping bounds and scaling center/scale of one numeric column.
+    
+    ``s`` holds the sorted non-missing values. The filled column is ``s`` with
+    the missing rows set to the fill value, i.e. ``s`` with copies of it
+    inserted at its sorted position, so its order statistics are index lookups
+    and its quantiles match np.quantile on the filled data. Clipping is
+    monotonic, so the clipped column keeps that order.
+    """
+    m = len(s)
+    if m == 0:
+        # All-missing columns are filled with 0 and left unscaled
+        value = 0.0 if fill else np.nan
+        return value, -np.inf, np.inf, 0.0, 1.0
+    
+    value = float(np.mean(s) if fill == 'mean' else np.quantile(s, 0.5)) if fill else np.nan
+    n_fill = n_rows - m if fill else 0
+    n = m + n_fill
+    insert_at = np.searchsorted(s, value) if fill else m
+    
+    def order_stat(i: np.ndarray) -> np.ndarray:
+        """Values at sorted positions i of the filled column."""
+        return np.where(i < insert_at, s[np.minimum(i, m - 1)],
+                        np.where(i < insert_at + n_fill, value, s[np.clip(i - n_fill, 0, m - 1)]))
+    
+    def quantiles(levels, lower=-np.inf, upper=np.inf) -> np.ndarray:
+        """Linear-interpolation quantiles of the filled and clipped column."""
+        position = np.asarray(levels) * (n - 1)
+        below = np.floor(position).astype(np.int64)
+        a = np.clip(order_stat(below), lower, upper)
+        b = np.clip(order_stat(np.minimum(below + 1, n - 1)), lower, upper)
+        return a + (b - a) * (position - below)
+    
+    def moments(lower=-np.inf, upper=np.inf, ddof=0) -> Tuple[float, float]:
+        """Mean and standard deviation of the filled and clipped column."""
+        clipped = np.clip(s, lower, upper)
+        filled = np.clip(value, lower, upper) if n_fill else 0.0
+        mean = (clipped.sum() + n_fill * filled) / n
+        m2 = ((clipped - mean) ** 2).sum() + n_fill * (filled - mean) ** 2
+        return mean, np.sqrt(m2 / (n - ddof)) if n > ddof else np.nan
+    
+    if outliers == 'iqr':
+        q1, q3 = quantiles([0.25, 0.75])
+        lower, upper = q1 - threshold * (q3 - q1), q3 + threshold * (q3 - q1)
+    elif outliers == 'zscore':
+        mean, std = moments(ddof=1)
+        lower, upper = mean - threshold * std, mean + threshold * std
+    else:
+        lower, upper = -np.inf, np.inf
+    
+    if scaler == 'standard':
+        center, scale = moments(lower, upper)
+    elif scaler == 'minmax':
+        center, top = quantiles([0.0, 1.0], lower, upper)
+        scale = top - center
+    elif scaler == 'robust':
+        q1, center, q3 = quantiles([0.25, 0.5, 0.75], lower, upper)
+        scale = q3 - q1
+    else:
+        center, scale = 0.0, 1.0
+    
+    return value, lower, upper, center, scale
+
+
+def _to_builtin(value):
+    """Convert NumPy scalars to plain Python values for JSON."""
+    return value.item() if isinstance(value, np.generic) else value
@@ -40,6 +40,9 @@ setup(
         "seaborn>=0.11.0",
     ],
     extras_require={
+        "parquet": [
+            "pyarrow>=7.0.0",
+        ],
         "dev": [
             "pytest>=7.0.0",
             "pytest-cov>=3.0.0",
@@ -116,5 +116,85 @@ class TestCorrelationWithTarget:
         assert abs(correlations['f1']) > 0.9
 
 
+class TestRollingCorrelation:
+    """Test correlation.rolling_with_target and rolling_pairwise functions"""
+    
+    def test_rolling_with_target_matches_pandas(self):
+        """Test rolling correlations agree with pandas rolling().corr()"""
+        rng = np.random.default_rng(0)
+        X = pd.DataFrame(rng.normal(size=(200, 3)), columns=['f1', 'f2', 'f3'])
+        X.iloc[20:25, 1] = np.nan
+        y = pd.Series(X['f1'] + rng.normal(size=200))
+        
+        rolling_corr = correlation.rolling_with_target(X, y, window=30, min_periods=20)
+        
+        for col in X.columns:
+            expected = X[col].rolling(30, min_periods=20).corr(y)
+            np.testing.assert_allclose(rolling_corr[col], expected, atol=1e-10)
+    
+    def test_rolling_pairwise(self):
+        """Test rolling correlations between feature pairs"""
+        rng = np.random.default_rng(1)
+        df = pd.DataFrame(rng.normal(size=(100, 3)), columns=['A', 'B', 'C'])
+        
+        rolling_corr = correlation.rolling_pairwise(df, window=10)
+        
+        assert rolling_corr.shape == (100, 3)
+        expected = df['A'].rolling(10).corr(df['C'])
+        np.testing.assert_allclose(rolling_corr[('A', 'C')], expected, atol=1e-10)
+
+
+class TestVIF:
+    """Test correlation.vif and remove_high_vif functions"""
+    
+    def test_vif_matches_regression(self):
+        """Test VIFs agree with 1 / (1 - R^2) from regressing each feature on the rest"""
+        rng = np.random.default_rng(0)
+        df = pd.DataFrame(rng.normal(size=(200, 3)), columns=['A', 'B', 'C'])
+        df['D'] = df['A'] + df['B'] + 0.5 * rng.normal(size=200)
+        
+        vif_table = correlation.vif(df).set_index('Feature')['VIF']
+        
+        for col in df.columns:
+            others = np.column_stack([np.ones(len(df)), df.drop(columns=col).values])
+            target = df[col].values
+            residuals = target - others @ np.linalg.lstsq(others, target, rcond=None)[0]
+            r2 = 1 - residuals.var() / target.var()
+            assert abs(vif_table[col] - 1 / (1 - r2)) < 1e-8
+    
+    def test_remove_high_vif(self):
+        """Test iterative removal of multicollinear features"""
+        rng = np.random.default_rng(1)
+        df = pd.DataFrame(rng.normal(size=(200, 3)), columns=['A', 'B', 'C'])
+        df['D'] = df['A'] + df['B'] + 0.05 * rng.normal(size=200)
+        
+        df_reduced, removed = correlation.remove_high_vif(df, threshold=5)
+        
+        assert len(removed) == 1
+        assert correlation.vif(df_reduced)['VIF'].max() < 5
+
+
+class TestWeightedHeatmap:
+    """Test correlation.heatmap with sampling weights"""
+    
+    def test_weights_match_replicated_rows(self):
+        """Test integer weights give the correlation of the rows repeated that often"""
+        matplotlib = pytest.importorskip('matplotlib')
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+        
+        rng = np.random.default_rng(0)
+        df = pd.DataFrame(rng.normal(size=(100, 3)), columns=['A', 'B', 'C'])
+        df['B'] += df['A']
+        df.loc[::7, 'A'] = np.nan
+        df['w'] = rng.integers(1, 4, size=100)
+        
+        corr = correlation.heatmap(df, annot=False, weights='w')
+        plt.close('all')
+        
+        expected = df.loc[df.index.repeat(df['w']), ['A', 'B', 'C']].corr()
+        pd.testing.assert_frame_equal(corr, expected)
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
@@ -57,6 +57,165 @@ class TestQuickEval:
         assert 'accuracy' in metrics
 
 
+class TestClassificationMetrics:
+    """Test that quick_eval's confusion-matrix metrics match sklearn exactly"""
+    
+    @staticmethod
+    def _sklearn_metrics(y_true, y_pred):
+        from sklearn.metrics import (accuracy_score, precision_score, recall_score,
+                                     f1_score, confusion_matrix, classification_report)
+        average = 'binary' if len(np.unique(y_true)) == 2 else 'weighted'
+        return {
+            'accuracy': accuracy_score(y_true, y_pred),
+            'precision': precision_score(y_true, y_pred, average=average, zero_division=0),
+            'recall': recall_score(y_true, y_pred, average=average, zero_division=0),
+            'f1_score': f1_score(y_true, y_pred, average=average, zero_division=0),
+            'confusion_matrix': confusion_matrix(y_true, y_pred),
+            'classification_report': classification_report(y_true, y_pred, output_dict=True,
+                                                            zero_division=0)
+        }
+    
+    @pytest.mark.parametrize('n_classes', [2, 3, 7])
+    def test_matches_sklearn(self, n_classes):
+        """Test metrics, confusion matrix and report against sklearn"""
+        rng = np.random.default_rng(n_classes)
+        y_true = rng.integers(0, n_classes, 2000)
+        y_pred = np.where(rng.random(2000) < 0.6, y_true, rng.integers(0, n_classes, 2000))
+        
+        metrics = evaluation.quick_eval(y_true, y_pred, task_type='classification', show_plot=False)
+        expected = self._sklearn_metrics(y_true, y_pred)
+        
+        for key in ['accuracy', 'precision', 'recall', 'f1_score', 'classification_report']:
+            assert metrics[key] == expected[key]
+        np.testing.assert_array_equal(metrics['confusion_matrix'], expected['confusion_matrix'])
+    
+    def test_unseen_and_string_labels(self):
+        """Test labels that only appear in y_pred and zero-division classes"""
+        y_true = np.array(['a', 'b', 'c', 'a', 'c'])
+        y_pred = np.array(['a', 'b', 'b', 'd', 'd'])
+        
+        metrics = evaluation.quick_eval(y_true, y_pred, task_type='classification', show_plot=False)
+        expected = self._sklearn_metrics(y_true, y_pred)
+        
+        assert metrics['classification_report'] == expected['classification_report']
+        assert metrics['precision'] == expected['precision']
+        np.testing.assert_array_equal(metrics['confusion_matrix'], expected['confusion_matrix'])
+    
+    def test_binary_roc_auc_matches_sklearn(self):
+        """Test the hard-label ROC AUC for binary targets"""
+        from sklearn.metrics import roc_auc_score
+        rng = np.random.default_rng(0)
+        y_true = rng.integers(0, 2, 500)
+        y_pred = np.where(rng.random(500) < 0.7, y_true, 1 - y_true)
+        
+        metrics = evaluation.quick_eval(y_true, y_pred, task_type='classification', show_plot=False)
+        
+        assert metrics['roc_auc'] == pytest.approx(roc_auc_score(y_true, y_pred))
+    
+    def test_roc_auc_none_for_single_true_class(self):
+        """Test that a single class in y_true gives no ROC AUC, even if y_pred has two"""
+        metrics = evaluation.quick_eval(np.array([0, 0, 0, 0]), np.array([0, 1, 0, 1]),
+                                        task_type='classification', show_plot=False)
+        
+        assert metrics['roc_auc'] is None
+    
+    def test_missing_labels_raise(self):
+        """Test NaN labels raise like sklearn instead of being counted"""
+        with pytest.raises(ValueError, match='y_pred contains NaN'):
+            evaluation.quick_eval(np.array([0, 1, 2, 1]), np.array([0, 1, 2, np.nan]),
+                                  task_type='classification', show_plot=False)
+        with pytest.raises(ValueError, match='y_true contains NaN'):
+            evaluation.quick_eval(np.array([0, 1, np.nan, 1]), np.array([0, 1, 2, 1]),
+                                  task_type='classification', show_plot=False)
+    
+    def test_binary_without_positive_label_raises(self):
+        """Test that binary targets without label 1 raise like sklearn"""
+        with pytest.raises(ValueError, match='pos_label'):
+            evaluation.quick_eval(np.array([2, 3, 3]), np.array([2, 3, 3]),
+                                  task_type='classification', show_plot=False)
+
+
+class TestScoreMetrics:
+    """Test quick_eval metrics computed from y_score"""
+    
+    @staticmethod
+    def _eval(y_true, y_pred, y_score):
+        return evaluation.quick_eval(y_true, y_pred, task_type='classification',
+                                     show_plot=False, y_score=y_score)
+    
+    @pytest.mark.parametrize('dtype', [np.float64, np.float32])
+    def test_binary_matches_sklearn(self, dtype):
+        """Test ROC AUC, PR AUC, log loss and Brier score with tied scores"""
+        from sklearn.metrics import (roc_auc_score, average_precision_score, log_loss,
+                                     brier_score_loss)
+        rng = np.random.default_rng(0)
+        y_true = rng.integers(0, 2, 2000)
+        y_score = np.round(np.clip(0.3 * y_true + 0.7 * rng.random(2000), 0, 1), 2).astype(dtype)
+        
+        metrics = self._eval(y_true, (y_score > 0.5).astype(int), y_score)
+        
+        assert metrics['roc_auc'] == pytest.approx(roc_auc_score(y_true, y_score), abs=1e-12)
+        expected_ap = average_precision_score(y_true, y_score)
+        assert metrics['pr_auc'] == pytest.approx(expected_ap, abs=1e-12)
+        assert metrics['log_loss'] == pytest.approx(log_loss(y_true, y_score), rel=1e-6)
+        assert metrics['brier_score'] == pytest.approx(brier_score_loss(y_true, y_score), rel=1e-6)
+    
+    def test_two_column_proba_matches_positive_column(self):
+        """Test that predict_proba output for binary targets gives the same metrics"""
+        rng = np.random.default_rng(1)
+        y_true = rng.integers(0, 2, 500)
+        proba = rng.random(500)
+        
+        single = self._eval(y_true, (proba > 0.5).astype(int), proba)
+        matrix = self._eval(y_true, (proba > 0.5).astype(int), np.column_stack([1 - proba, proba]))
+        
+        for key in ['roc_auc', 'pr_auc', 'log_loss', 'brier_score']:
+            assert matrix[key] == pytest.approx(single[key])
+    
+    def test_multiclass_matches_sklearn(self):
+        """Test one-vs-rest AUC and multiclass losses on float32 probabilities"""
+        from sklearn.metrics import (roc_auc_score, average_precision_score, log_loss,
+                                     brier_score_loss)
+        rng = np.random.default_rng(2)
+        y_true = rng.integers(0, 4, 3000)
+        logits = rng.normal(size=(3000, 4)) + 2 * np.eye(4)[y_true]
+        proba = (np.exp(logits) / np.exp(logits).sum(axis=1, keepdims=True)).astype(np.float32)
+        
+        metrics = self._eval(y_true, proba.argmax(axis=1), proba)
+        onehot = np.eye(4)[y_true]
+        expected_ap = np.mean([average_precision_score(onehot[:, c], proba[:, c])
+                               for c in range(4)])
+        
+        assert metrics['roc_auc'] == pytest.approx(roc_auc_score(y_true, proba, multi_class='ovr'))
+        assert metrics['pr_auc'] == pytest.approx(expected_ap)
+        assert metrics['log_loss'] == pytest.approx(log_loss(y_true, proba), rel=1e-5)
+        assert metrics['brier_score'] == pytest.approx(brier_score_loss(y_true, proba), rel=1e-5)
+    
+    def test_decision_function_scores(self):
+        """Test that non-probability scores give AUCs but no log loss or Brier score"""
+        from sklearn.metrics import roc_auc_score
+        rng = np.random.default_rng(3)
+        y_true = rng.integers(0, 2, 200)
+        scores = rng.normal(size=200) + y_true
+        
+        metrics = self._eval(y_true, (scores > 0).astype(int), scores)
+        
+        assert metrics['roc_auc'] == pytest.approx(roc_auc_score(y_true, scores))
+        assert metrics['log_loss'] is None
+        assert metrics['brier_score'] is None
+    
+    def test_invalid_scores_raise(self):
+        """Test shape checks and regression rejection"""
+        y_true = np.array([0, 1, 2, 1])
+        with pytest.raises(ValueError):
+            self._eval(y_true, y_true, np.array([0.1, 0.9, 0.5, 0.7]))
+        with pytest.raises(ValueError):
+            self._eval(y_true, y_true, np.full((4, 2), 0.5))
+        with pytest.raises(ValueError):
+            evaluation.quick_eval([1.5, 2.5], [1.4, 2.6], task_type='regression',
+                                  show_plot=False, y_score=[0.1, 0.2])
+
+
 class TestCompareModels:
     """Test evaluation.compare_models function"""
     
@@ -49,6 +49,16 @@ class TestMissingAnalyze:
         report = missing.analyze(df, show_plot=False)
         
         assert len(report) == 0
+    
+    def test_analyze_weighted(self):
+        """Test weighted counts equal counts on rows repeated by their weight"""
+        df = pd.DataFrame({'A': [1.0, None, 3.0, None], 'w': [1.0, 3.0, 2.0, 1.0]})
+        
+        report = missing.analyze(df, weights='w', show_plot=False)
+        
+        assert report['Column'].tolist() == ['A']
+        assert report['Missing_Count'].iloc[0] == 4.0
+        assert report['Missing_Percent'].iloc[0] == pytest.approx(4 / 7 * 100)
 
 
 class TestQuickSummary:
@@ -117,6 +127,19 @@ class TestFillMissing:
         
         assert df_filled['A'].iloc[2] == 2.0
     
+    def test_fill_mean_skips_nullable_integers(self):
+        """Test mean filling leaves Int64 columns alone instead of failing"""
+        df = pd.DataFrame({
+            'A': pd.array([1, None, 3, 3], dtype='Int64'),
+            'B': [1.0, None, 3.0, 3.0]
+        })
+        
+        df_filled = missing.fill_missing(df, strategy='mean')
+        
+        assert df_filled['A'].dtype == 'Int64'
+        assert df_filled['A'].isna().sum() == 1
+        assert df_filled['B'].iloc[1] == pytest.approx(7 / 3)
+    
     def test_fill_constant(self):
         """Test filling with constant"""
         df = pd.DataFrame({'A': [1, None, 3]})
@@ -124,6 +147,66 @@ class TestFillMissing:
         df_filled = missing.fill_missing(df, strategy='constant', fill_value=999)
         
         assert df_filled['A'].iloc[1] == 999
+    
+    def test_fill_keeps_compact_dtypes(self):
+        """Test filling does not upcast float32 or category columns"""
+        df = pd.DataFrame({
+            'A': np.array([1.0, np.nan, 3.0], dtype=np.float32),
+            'C': pd.Categorical(['a', None, 'a']),
+        })
+        
+        df_filled = missing.fill_missing(df, strategy='mode')
+        
+        assert df_filled['A'].dtype == np.float32
+        assert isinstance(df_filled['C'].dtype, pd.CategoricalDtype)
+        assert df_filled['C'].iloc[1] == 'a'
+    
+    def test_fill_parallel_matches_serial(self):
+        """Test n_jobs gives the same result and leaves the input unchanged"""
+        rng = np.random.default_rng(0)
+        df = pd.DataFrame(rng.normal(size=(200, 6)), columns=list('ABCDEF'))
+        df[df > 1.5] = np.nan
+        original = df.copy()
+        
+        serial = missing.fill_missing(df, strategy='median')
+        parallel = missing.fill_missing(df, strategy='median', n_jobs=3)
+        
+        pd.testing.assert_frame_equal(parallel, serial)
+        pd.testing.assert_frame_equal(df, original)
+    
+    def test_fill_deep_copies_without_copy_on_write(self, monkeypatch):
+        """Test untouched columns are copied when pandas copy-on-write is off"""
+        from dshelper import _parallel
+        monkeypatch.setattr(_parallel, '_copy_on_write', lambda: False)
+        df = pd.DataFrame({'A': [1.0, None, 3.0], 'B': [4.0, 5.0, 6.0]})
+        
+        df_filled = missing.fill_missing(df, strategy='mean')
+        
+        assert not np.shares_memory(df_filled['B'].to_numpy(), df['B'].to_numpy())
+
+
+class TestArrowInput:
+    """Test missing.analyze on pyarrow Tables and Parquet files"""
+    
+    def test_analyze_parquet_matches_dataframe(self, tmp_path):
+        """Test null counts from Arrow match the DataFrame report"""
+        pa = pytest.importorskip('pyarrow')
+        pq = pytest.importorskip('pyarrow.parquet')
+        
+        df = pd.DataFrame({
+            'A': [1.0, None, 3.0, None],
+            'B': ['x', None, 'z', 'w'],
+            'C': [1, 2, 3, 4],
+        })
+        pq.write_table(pa.Table.from_pandas(df, preserve_index=False), tmp_path / 'data.parquet')
+        
+        expected = missing.analyze(df, show_plot=False)
+        report = missing.analyze(tmp_path / 'data.parquet', show_plot=False)
+        projected = missing.analyze(tmp_path / 'data.parquet', show_plot=False, columns=['A'])
+        
+        pd.testing.assert_frame_equal(report.drop(columns='Data_Type'),
+                                      expected.drop(columns='Data_Type'))
+        assert projected['Column'].tolist() == ['A']
 
 
 if __name__ == '__main__':
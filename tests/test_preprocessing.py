@@ -136,5 +136,802 @@ class TestFeatureSelectionQuick:
         assert len(selected_features) == 2
 
 
+class TestFeatureSelectionMRMR:
+    """Test preprocessing.feature_selection_mrmr function"""
+    
+    def test_mrmr_skips_redundant_features(self):
+        """Test that a near-duplicate of a selected feature is not picked"""
+        rng = np.random.default_rng(0)
+        X = pd.DataFrame({
+            'f1': rng.normal(size=200),
+            'f2': rng.normal(size=200),
+            'noise': rng.normal(size=200)
+        })
+        X['f1_copy'] = X['f1'] + 0.01 * rng.normal(size=200)
+        y = pd.Series(2 * X['f1'] + X['f2'])
+        
+        X_selected, selected_features = preprocessing.feature_selection_mrmr(X, y, k=2)
+        
+        assert selected_features[0] in ('f1', 'f1_copy')
+        assert selected_features[1] == 'f2'
+        assert list(X_selected.columns) == selected_features
+
+
+class TestSplitAndScaleMemmap:
+    """Test preprocessing.split_and_scale_memmap function"""
+    
+    def test_matches_in_memory_split_and_scale(self, tmp_path):
+        """Test out-of-core split and scale matches the in-memory version"""
+        rng = np.random.default_rng(0)
+        X = rng.normal(loc=5, scale=3, size=(1000, 4))
+        y = rng.integers(0, 2, size=1000)
+        np.save(tmp_path / 'X.npy', X)
+        
+        X_train, X_test, y_train, y_test = preprocessing.split_and_scale_memmap(
+            tmp_path / 'X.npy', y, output_dir=tmp_path / 'out', chunk_size=128
+        )
+        expected = preprocessing.split_and_scale(X, y)
+        
+        assert isinstance(X_train, np.memmap)
+        assert (tmp_path / 'out' / 'X_test.npy').exists()
+        np.testing.assert_allclose(X_train, expected[0], atol=1e-10)
+        np.testing.assert_allclose(X_test, expected[1], atol=1e-10)
+        np.testing.assert_array_equal(y_train, expected[2])
+
+
+class TestSplitAndScaleMemory:
+    """Test the dtype / copy options and memory budget of split_and_scale"""
+    
+    def test_float32_in_place(self):
+        """Test float32 output and in-place scaling"""
+        X = pd.DataFrame({
+            'feature1': np.arange(100, dtype=float),
+            'feature2': np.arange(100, dtype=float) * 10
+        })
+        y = pd.Series(np.arange(100) % 2)
+        
+        X_train, X_test, _, _ = preprocessing.split_and_scale(
+            X, y, dtype=np.float32, copy=False
+        )
+        
+        assert X_train.dtype == np.float32
+        assert X_test.dtype == np.float32
+        assert np.abs(X_train.mean(axis=0)).max() < 1e-5
+    
+    def test_peak_memory_budget(self):
+        """Test peak RSS of copy=False stays within the documented 1.5x budget"""
+        pytest.importorskip('resource')
+        import subprocess
+        import sys
+        from pathlib import Path
+        
+        script = (
+            "import resource, sys\n"
+            "import numpy as np\n"
+            "from dshelper import preprocessing\n"
+            "X = np.random.default_rng(0).random((1_000_000, 25), dtype=np.float32)\n"
+            "y = np.zeros(len(X))\n"
+            "before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss\n"
+            "preprocessing.split_and_scale(X, y, dtype=np.float32, copy=False)\n"
+            "after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss\n"
+            "unit = 1 if sys.platform == 'darwin' else 1024\n"
+            "print((after - before) * unit / X.nbytes)\n"
+        )
+        result = subprocess.run(
+            [sys.executable, '-c', script],
+            capture_output=True, text=True, check=True,
+            cwd=Path(__file__).resolve().parents[1]
+        )
+        
+        assert float(result.stdout.strip().splitlines()[-1]) < 1.5
+
+
+class TestPreprocessor:
+    """Test preprocessing.Preprocessor class"""
+    
+    def test_fit_transform(self):
+        """Test batch transform imputes, clips, scales and one-hot encodes"""
+        rng = np.random.default_rng(0)
+        df = pd.DataFrame({
+            'age': rng.normal(40, 10, size=200),
+            'income': rng.normal(50000, 8000, size=200),
+            'city': rng.choice(['Paris', 'Rome', 'Oslo'], size=200)
+        })
+        df.loc[3, 'age'] = np.nan
+        df.loc[4, 'city'] = None
+        df.loc[5, 'income'] = 1e7  # outlier
+        prep = preprocessing.Preprocessor()
+        
+        out = prep.fit_transform(df)
+        
+        assert out.shape == (200, 5)
+        assert prep.feature_names_out_[:2] == ['age', 'income']
+        assert not np.isnan(out).any()
+        assert np.abs(out[:, :2].mean(axis=0)).max() < 1e-8
+        assert out[5, 1] < 5  # clipped before scaling
+        np.testing.assert_array_equal(out[:, 2:].sum(axis=1), 1)
+    
+    def test_single_row_and_roundtrip(self, tmp_path):
+        """Test single-row dict transform matches batch transform after save/load"""
+        rng = np.random.default_rng(0)
+        df = pd.DataFrame({
+            'age': rng.normal(40, 10, size=200),
+            'income': rng.normal(50000, 8000, size=200),
+            'city': rng.choice(['Paris', 'Rome', 'Oslo'], size=200)
+        })
+        df.loc[3, 'age'] = np.nan
+        df.loc[4, 'city'] = None
+        df.loc[5, 'income'] = 1e7  # outlier
+        prep = preprocessing.Preprocessor(scaler='robust').fit(df)
+        prep.save(tmp_path / 'prep.npz')
+        
+        loaded = preprocessing.Preprocessor.load(tmp_path / 'prep.npz')
+        batch = loaded.transform(df)
+        
+        np.testing.assert_allclose(batch, prep.transform(df))
+        for i in range(6):
+            row = df.iloc[i].to_dict()
+            np.testing.assert_allclose(loaded.transform(row), batch[i])
+        
+        unknown = loaded.transform({'age': 30, 'income': 40000, 'city': 'Lima'})
+        assert unknown[2:].sum() == 0
+    
+    def test_categorical_batch_without_fill_category(self):
+        """Test missing values in a category column lacking the fitted fill value"""
+        train = pd.DataFrame({'x': [1.0, 2.0, 3.0, 4.0], 'c': ['a', 'a', 'b', None]})
+        prep = preprocessing.Preprocessor(encoding='ordinal').fit(train)
+        batch = pd.DataFrame({'x': [1.0, 2.0], 'c': pd.Categorical(['b', None], categories=['b'])})
+        
+        out = prep.transform(batch)
+        
+        np.testing.assert_array_equal(out[:, 1], [1, 0])
+        np.testing.assert_array_equal(out[1], prep.transform({'x': 2.0, 'c': None}))
+
+
+class TestSparseEncoding:
+    """Test sparse one-hot and hashing output of preprocessing.encode_categorical"""
+    
+    def test_sparse_onehot_matches_dense(self):
+        """Test sparse one-hot output matches pd.get_dummies"""
+        from scipy import sparse
+        
+        df = pd.DataFrame({
+            'num': [1.0, 2.0, 3.0, 4.0],
+            'color': ['red', 'blue', None, 'red'],
+            'size': ['S', 'M', 'L', 'M']
+        })
+        
+        encoded = preprocessing.encode_categorical(df, method='onehot', sparse=True)
+        expected = pd.get_dummies(df, columns=['color', 'size'], dtype=int)
+        
+        assert sparse.isspmatrix_csr(encoded)
+        np.testing.assert_array_equal(encoded.toarray(), expected.values)
+    
+    def test_hash_encoding(self):
+        """Test hashing trick output shape, sparsity and use in split_and_scale"""
+        rng = np.random.default_rng(0)
+        df = pd.DataFrame({
+            'num': rng.normal(size=100),
+            'merchant_id': [f'm{i}' for i in rng.integers(0, 50, size=100)]
+        })
+        y = rng.integers(0, 2, size=100)
+        
+        encoded = preprocessing.encode_categorical(df, method='hash', n_features=64)
+        
+        assert encoded.shape == (100, 65)
+        assert encoded.nnz <= 200
+        np.testing.assert_array_equal(encoded[:, 1:].sum(axis=1), 1)
+        
+        X_train, X_test, _, _ = preprocessing.split_and_scale(encoded, y)
+        assert X_train.shape == (80, 65)
+
+
+class TestCategoricalEncoder:
+    """Test preprocessing.CategoricalEncoder class"""
+    
+    def test_fit_transform_reuse(self):
+        """Test stored vocabularies give consistent codes across batches"""
+        train = pd.DataFrame({'city': ['Rome', 'Oslo', 'Paris', 'Oslo'], 'n': [1, 2, 3, 4]})
+        batch = pd.DataFrame({'city': ['Paris', 'Lima', None], 'n': [5, 6, 7]})
+        
+        encoder = preprocessing.CategoricalEncoder().fit(train)
+        
+        np.testing.assert_array_equal(encoder.transform(train)['city'], [2, 0, 1, 0])
+        np.testing.assert_array_equal(encoder.transform(batch)['city'], [1, -1, -1])
+        assert list(encoder.transform(batch)['n']) == [5, 6, 7]
+    
+    def test_unknown_handling(self):
+        """Test reserved unknown code and error mode"""
+        train = pd.DataFrame({'city': ['Rome', 'Oslo']})
+        batch = pd.DataFrame({'city': ['Lima', 'Rome']})
+        
+        encoder = preprocessing.CategoricalEncoder(unknown_value=99).fit(train)
+        np.testing.assert_array_equal(encoder.transform(batch)['city'], [99, 1])
+        
+        encoder = preprocessing.CategoricalEncoder(handle_unknown='error').fit(train)
+        with pytest.raises(ValueError):
+            encoder.transform(batch)
+    
+    def test_label_encoding_missing_values(self):
+        """Test missing values get -1 in label encoding instead of a 'nan' category"""
+        df = pd.DataFrame({'city': ['Rome', None, 'Oslo', np.nan, 'Rome']})
+        
+        result = preprocessing.encode_categorical(df, method='label')
+        
+        np.testing.assert_array_equal(result['city'], [1, -1, 0, -1, 1])
+    
+    def test_label_encoding_sorts_numbers_by_value(self):
+        """Test numeric categories are ordered by value, not as strings"""
+        df = pd.DataFrame({'size': [10, 2, 100, 2], 'grade': pd.Categorical([9.5, 10.0, 9.5, 1.0])})
+        
+        result = preprocessing.encode_categorical(df, columns=['size', 'grade'], method='label')
+        
+        np.testing.assert_array_equal(result['size'], [1, 0, 2, 0])
+        np.testing.assert_array_equal(result['grade'], [1, 2, 1, 0])
+
+
+class TestHandleOutliersVectorized:
+    """Test preprocessing.handle_outliers bulk z-score and flag paths"""
+    
+    def test_zscore_flag_and_remove(self):
+        """Test z-score flags agree with scipy and remove drops the flagged rows"""
+        from scipy import stats
+        
+        rng = np.random.default_rng(0)
+        df = pd.DataFrame(rng.standard_t(3, size=(300, 3)), columns=['A', 'B', 'C'])
+        df.loc[5, 'A'] = np.nan
+        
+        flagged = preprocessing.handle_outliers(df, method='zscore', threshold=2.5, action='flag')
+        cleaned = preprocessing.handle_outliers(df, method='zscore', threshold=2.5, action='remove')
+        
+        for col in df.columns:
+            expected = np.abs(stats.zscore(df[col], nan_policy='omit')) > 2.5
+            np.testing.assert_array_equal(flagged[f'{col}_outlier'], expected)
+        
+        any_outlier = flagged[['A_outlier', 'B_outlier', 'C_outlier']].any(axis=1)
+        assert len(cleaned) == (~any_outlier).sum()
+    
+    def test_clip_preserves_dtypes(self):
+        """Test clipping keeps int and float32 columns in their original dtypes"""
+        df = pd.DataFrame({
+            'i64': np.r_[np.arange(99), 10_000].astype(np.int64),
+            'i8': np.r_[np.arange(99), 127].astype(np.int8),
+            'f32': np.r_[np.arange(99), 1e6].astype(np.float32)
+        })
+        
+        clipped = preprocessing.handle_outliers(df, method='iqr', action='clip')
+        clipper = preprocessing.OutlierClipper().fit(df)
+        
+        assert (clipped.dtypes == df.dtypes).all()
+        assert (clipper.transform(df).dtypes == df.dtypes).all()
+        assert clipped['i64'].max() < 10_000
+    
+    def test_clipped_integers_stay_within_bounds(self):
+        """Test integers clipped to fractional bounds are rounded inwards"""
+        df = pd.DataFrame({'A': np.r_[-1000, np.arange(1, 97), 1000].astype(np.int64)})
+        clipper = preprocessing.OutlierClipper().fit(df)
+        lower, upper = clipper.bounds_.loc['A', ['lower', 'upper']]
+        assert (lower, upper) == (-48.5, 145.5)
+        
+        for clipped in (preprocessing.handle_outliers(df, method='iqr', action='clip'),
+                        clipper.transform(df)):
+            assert clipped['A'].dtype == np.int64
+            assert lower <= clipped['A'].min() and clipped['A'].max() <= upper
+            np.testing.assert_array_equal(clipped['A'].iloc[1:-1], df['A'].iloc[1:-1])
+
+
+class TestOutlierClipper:
+    """Test preprocessing.OutlierClipper class"""
+    
+    def test_matches_handle_outliers(self):
+        """Test single-chunk fit reproduces handle_outliers clipping"""
+        rng = np.random.default_rng(0)
+        df = pd.DataFrame({'A': rng.standard_t(3, size=20000), 'B': rng.exponential(size=20000)})
+        
+        for method, threshold in [('iqr', 1.5), ('zscore', 3)]:
+            clipper = preprocessing.OutlierClipper(method=method, threshold=threshold)
+            expected = preprocessing.handle_outliers(
+                df, method=method, threshold=threshold, action='clip'
+            )
+            np.testing.assert_allclose(clipper.fit_transform(df), expected, atol=1e-10)
+    
+    def test_streaming_merge_and_save(self, tmp_path):
+        """Test chunked fitting and merging across workers approximate the full fit"""
+        rng = np.random.default_rng(0)
+        df = pd.DataFrame({'A': rng.standard_t(3, size=20000), 'B': rng.exponential(size=20000)})
+        chunks = [df.iloc[i:i + 3000] for i in range(0, len(df), 3000)]
+        full = preprocessing.OutlierClipper().fit(df).bounds_
+        
+        worker_1 = preprocessing.OutlierClipper().fit(chunks[:3])
+        worker_2 = preprocessing.OutlierClipper().fit(chunks[3:])
+        worker_2.save(tmp_path / 'worker_2.npz')
+        merged = worker_1.merge(preprocessing.OutlierClipper.load(tmp_path / 'worker_2.npz'))
+        
+        np.testing.assert_allclose(merged.bounds_, full, atol=0.02)
+        assert merged.transform(df)['A'].max() <= merged.bounds_.loc['A', 'upper']
+
+
+class TestRobustOutlierDetectors:
+    """Test the 'mad' and 'isolation_forest' methods of preprocessing.handle_outliers"""
+    
+    def test_mad(self):
+        """Test MAD flags agree with the robust z-score definition"""
+        rng = np.random.default_rng(0)
+        df = pd.DataFrame({'A': rng.exponential(size=500)})
+        
+        flagged = preprocessing.handle_outliers(df, method='mad', threshold=3.5, action='flag')
+        
+        mad = np.median(np.abs(df['A'] - df['A'].median()))
+        robust_z = 0.6745 * (df['A'] - df['A'].median()) / mad
+        np.testing.assert_array_equal(flagged['A_outlier'], robust_z.abs() > 3.5)
+    
+    def test_isolation_forest_actions(self):
+        """Test isolation forest finds planted multivariate outliers for every action"""
+        rng = np.random.default_rng(0)
+        df = pd.DataFrame(rng.normal(size=(2000, 3)), columns=['A', 'B', 'C'])
+        df.iloc[:10] = 6.0
+        
+        flagged = preprocessing.handle_outliers(
+            df, method='isolation_forest', action='flag', contamination=0.01, n_jobs=2
+        )
+        cleaned = preprocessing.handle_outliers(
+            df, method='isolation_forest', action='remove', contamination=0.01
+        )
+        clipped = preprocessing.handle_outliers(
+            df, method='isolation_forest', action='clip', contamination=0.01
+        )
+        
+        assert flagged['is_outlier'].iloc[:10].all()
+        assert len(cleaned) == len(df) - flagged['is_outlier'].sum()
+        assert clipped.max().max() < 6.0
+
+
+class TestFeatureScores:
+    """Test preprocessing.feature_scores and score caching"""
+    
+    def test_score_table_matches_sklearn(self):
+        """Test the score table, also when scored in parallel column blocks"""
+        from sklearn.feature_selection import f_classif
+        
+        rng = np.random.default_rng(0)
+        X = pd.DataFrame(rng.normal(size=(300, 6)), columns=[f'f{i}' for i in range(6)])
+        y = pd.Series((X['f0'] + 0.5 * X['f3'] > 0).astype(int))
+        expected_f, expected_p = f_classif(X, y)
+        
+        for n_jobs in (None, 2):
+            preprocessing._SCORE_CACHE.clear()
+            table = preprocessing.feature_scores(X, y, n_jobs=n_jobs).set_index('Feature')
+            np.testing.assert_allclose(table.loc[X.columns, 'Score'], expected_f)
+            np.testing.assert_allclose(table.loc[X.columns, 'P_Value'], expected_p)
+        
+        assert table.index[0] == 'f0'
+    
+    def test_scores_are_cached(self):
+        """Test re-selecting with another k reuses cached scores"""
+        rng = np.random.default_rng(0)
+        X = pd.DataFrame(rng.normal(size=(300, 6)), columns=[f'f{i}' for i in range(6)])
+        y = pd.Series((X['f0'] + 0.5 * X['f3'] > 0).astype(int))
+        preprocessing._SCORE_CACHE.clear()
+        
+        _, top_1 = preprocessing.feature_selection_quick(X, y, k=1, method='mutual_info_classif')
+        cached = next(iter(preprocessing._SCORE_CACHE.values()))
+        _, top_2 = preprocessing.feature_selection_quick(X, y, k=2, method='mutual_info_classif')
+        
+        assert len(preprocessing._SCORE_CACHE) == 1
+        assert next(iter(preprocessing._SCORE_CACHE.values())) is cached
+        assert set(top_1) <= set(top_2)
+    
+    def test_mutual_info_independent_of_n_jobs(self):
+        """Test mutual information scores do not depend on the column blocking"""
+        rng = np.random.default_rng(0)
+        # Heavily tied values, so the seeded jitter decides the nearest neighbours
+        X = pd.DataFrame(rng.integers(0, 4, size=(300, 6)).astype(float),
+                         columns=[f'f{i}' for i in range(6)])
+        y = pd.Series((X['f0'] + 0.5 * X['f3'] > 2).astype(int))
+        
+        results = []
+        for n_jobs in (None, 2, 4):
+            preprocessing._SCORE_CACHE.clear()
+            results.append(preprocessing.feature_scores(X, y, method='mutual_info_classif',
+                                                        n_jobs=n_jobs))
+        
+        for result in results[1:]:
+            pd.testing.assert_frame_equal(result, results[0])
+
+
+class TestStreamingFeatureSelector:
+    """Test preprocessing.StreamingFeatureSelector class"""
+    
+    def test_matches_sklearn_across_chunks_and_workers(self):
+        """Test chunked and merged F-scores equal sklearn on the full data"""
+        from sklearn.feature_selection import f_classif, f_regression
+        
+        rng = np.random.default_rng(0)
+        X = pd.DataFrame(rng.normal(size=(3000, 5)), columns=['A', 'B', 'C', 'D', 'E'])
+        y_class = rng.integers(0, 3, size=3000)
+        X['A'] += y_class
+        y_reg = 0.3 * X['B'].to_numpy() + rng.normal(size=3000)
+        
+        for method, y, score_func in [('f_classif', y_class, f_classif),
+                                      ('f_regression', y_reg, f_regression)]:
+            worker_1 = preprocessing.StreamingFeatureSelector(method)
+            worker_2 = preprocessing.StreamingFeatureSelector(method)
+            for start in range(0, 2000, 400):
+                worker_1.update(X.iloc[start:start + 400], y[start:start + 400])
+            worker_2.update(X.iloc[2000:], y[2000:])
+            worker_1.merge(worker_2)
+            
+            expected_f, expected_p = score_func(X, y)
+            table = worker_1.scores().set_index('Feature').loc[X.columns]
+            np.testing.assert_allclose(table['Score'], expected_f, rtol=1e-8)
+            np.testing.assert_allclose(table['P_Value'], expected_p, rtol=1e-6, atol=1e-12)
+        
+        assert worker_1.select(k=1) == ['B']
+    
+    def test_merge_into_empty_selector_copies_state(self):
+        """Test updating a selector merged from another leaves the source unchanged"""
+        rng = np.random.default_rng(0)
+        X = pd.DataFrame(rng.normal(size=(400, 2)), columns=['A', 'B'])
+        y = rng.integers(0, 2, size=400)
+        X['A'] += y
+        
+        source = preprocessing.StreamingFeatureSelector().update(X, y)
+        expected = source.scores()
+        merged = preprocessing.StreamingFeatureSelector().merge(source)
+        merged.update(X.iloc[:100], np.full(100, 2))
+        
+        pd.testing.assert_frame_equal(source.scores(), expected)
+
+
+class TestSplitIndices:
+    """Test preprocessing.split_indices function"""
+    
+    def test_group_split_is_disjoint_and_stable(self):
+        """Test group-disjoint assignment does not change when data grows"""
+        rng = np.random.default_rng(0)
+        df = pd.DataFrame({'customer': rng.integers(0, 300, size=2000),
+                           'value': rng.normal(size=2000)})
+        train_idx, test_idx = preprocessing.split_indices(df, group_by='customer')
+        
+        assert not set(df['customer'].iloc[train_idx]) & set(df['customer'].iloc[test_idx])
+        assert len(train_idx) + len(test_idx) == len(df)
+        
+        new_customers = pd.DataFrame({'customer': rng.integers(1000, 1300, size=500),
+                                      'value': rng.normal(size=500)})
+        grown = pd.concat([df, new_customers], ignore_index=True)
+        _, grown_test_idx = preprocessing.split_indices(grown, group_by='customer')
+        np.testing.assert_array_equal(grown_test_idx[grown_test_idx < len(df)], test_idx)
+    
+    def test_time_split_with_gap(self):
+        """Test time-ordered split keeps the gap between train and test"""
+        rng = np.random.default_rng(0)
+        df = pd.DataFrame({
+            'date': pd.Timestamp('2024-01-01')
+            + pd.to_timedelta(rng.integers(0, 365, size=2000), unit='D'),
+            'value': rng.normal(size=2000)
+        })
+        train_idx, test_idx = preprocessing.split_indices(
+            df, time_column='date', gap=pd.Timedelta('7D')
+        )
+        
+        train_end = df['date'].iloc[train_idx].max()
+        test_start = df['date'].iloc[test_idx].min()
+        assert test_start - train_end > pd.Timedelta('7D')
+        assert df['date'].iloc[test_idx].is_monotonic_increasing
+
+
+class TestKFoldScaled:
+    """Test preprocessing.kfold_scaled generator"""
+    
+    def test_matches_per_fold_standard_scaler(self):
+        """Test each fold equals a StandardScaler fitted on that fold's training rows"""
+        from sklearn.model_selection import KFold
+        from sklearn.preprocessing import StandardScaler
+        
+        rng = np.random.default_rng(0)
+        X = pd.DataFrame(rng.normal(loc=50, scale=3, size=(503, 3)), columns=['A', 'B', 'C'])
+        y = pd.Series(rng.integers(0, 2, size=503))
+        expected_folds = KFold(n_splits=4, shuffle=True, random_state=42).split(X)
+        
+        folds = preprocessing.kfold_scaled(X, y, n_splits=4)
+        
+        for (X_train, X_val, y_train, y_val), (train_idx, val_idx) in zip(folds, expected_folds):
+            scaler = StandardScaler().fit(X.values[train_idx])
+            np.testing.assert_allclose(X_train, scaler.transform(X.values[train_idx]), atol=1e-10)
+            np.testing.assert_allclose(X_val, scaler.transform(X.values[val_idx]), atol=1e-10)
+            np.testing.assert_array_equal(y_val, y.values[val_idx])
+
+
+class TestOptimizeDtypes:
+    """Test preprocessing.optimize_dtypes function"""
+    
+    def test_downcasts_without_changing_values(self):
+        """Test integers, floats and low-cardinality strings shrink losslessly"""
+        n = 1000
+        df = pd.DataFrame({
+            'small': np.arange(n) % 100,
+            'negative': np.arange(n) - 500,
+            'large': np.arange(n) * 10 ** 6,
+            'value': np.arange(n) / 8,
+            'precise': np.linspace(0, 1, n),
+            'big': np.r_[123456789.0, 16777217.0, np.zeros(n - 2)],
+            'city': np.array(['NY', 'LA', 'SF'])[np.arange(n) % 3],
+            'id': [f'id{i}' for i in range(n)],
+        })
+        
+        df_small, report = preprocessing.optimize_dtypes(df, return_report=True)
+        
+        assert df_small['small'].dtype == np.int8
+        assert df_small['negative'].dtype == np.int16
+        assert df_small['large'].dtype == np.int32
+        assert df_small['value'].dtype == np.float32
+        assert df_small['precise'].dtype == np.float64
+        assert df_small['big'].dtype == np.float64
+        assert isinstance(df_small['city'].dtype, pd.CategoricalDtype)
+        assert not isinstance(df_small['id'].dtype, pd.CategoricalDtype)
+        pd.testing.assert_frame_equal(df_small, df, check_dtype=False, check_categorical=False,
+                                      check_exact=True)
+        assert report['Bytes_Saved'].sum() > 0
+        assert set(report['Column']) == {'small', 'negative', 'large', 'value', 'city'}
+    
+    def test_compact_dtypes_preserved(self):
+        """Test clipping keeps float32 and encoding keeps its int64 output dtypes"""
+        df = pd.DataFrame({
+            'A': np.array([1.0, 2.0, 3.0, 100.0, 2.5, 1.5], dtype=np.float32),
+            'C': pd.Categorical(['x', 'y', 'x', 'y', 'x', 'y']),
+        })
+        
+        clipped = preprocessing.handle_outliers(df, columns=['A'], method='iqr', action='clip')
+        encoded = preprocessing.encode_categorical(df, columns=['C'], method='onehot')
+        labels = preprocessing.encode_categorical(df, columns=['C'], method='label')
+        
+        assert clipped['A'].dtype == np.float32
+        assert encoded['C_x'].dtype == np.int64
+        assert labels['C'].dtype == np.int64
+
+
+class TestTargetEncoder:
+    """Test preprocessing.TargetEncoder and encode_categorical(method='target')"""
+    
+    def test_out_of_fold_matches_per_fold_groupby(self):
+        """Test each fold's encoding equals a groupby over the other folds"""
+        rng = np.random.default_rng(0)
+        df = pd.DataFrame({'C': rng.choice(list('abcdef'), size=600).astype(object)})
+        df.loc[::40, 'C'] = None
+        y = (rng.random(600) < 0.3).astype(int)
+        
+        encoded = preprocessing.TargetEncoder(n_splits=3, smoothing=5.0).fit_transform(df, y)
+        
+        folds = np.random.default_rng(42).permutation(600) % 3
+        for fold in range(3):
+            train = folds != fold
+            prior = y[train].mean()
+            train_df = pd.DataFrame({'C': df['C'][train], 'y': y[train]})
+            stats = train_df.groupby('C')['y'].agg(['sum', 'count'])
+            means = (stats['sum'] + 5.0 * prior) / (stats['count'] + 5.0)
+            expected = df['C'][~train].map(means).fillna(prior).to_numpy(dtype=float)
+            np.testing.assert_allclose(encoded['C'].to_numpy()[~train], expected)
+    
+    def test_transform_uses_fitted_mapping(self):
+        """Test new data uses the full-data mapping and unseen categories get the prior"""
+        df = pd.DataFrame({'C': ['a', 'a', 'b', 'b']})
+        y = np.array([1, 1, 0, 0])
+        
+        encoder = preprocessing.TargetEncoder(smoothing=2.0, n_splits=2).fit(df, y)
+        result = encoder.transform(pd.DataFrame({'C': ['a', 'b', 'z']}))
+        
+        np.testing.assert_allclose(result['C'], [(2 + 1.0) / 4, (0 + 1.0) / 4, 0.5])
+    
+    def test_encode_categorical_requires_target(self):
+        """Test method='target' without y raises an error"""
+        df = pd.DataFrame({'C': ['a', 'b']})
+        
+        with pytest.raises(ValueError):
+            preprocessing.encode_categorical(df, columns=['C'], method='target')
+
+
+class TestBinFeatures:
+    """Test preprocessing.bin_features and QuantileBinner"""
+    
+    def test_matches_kbins_quantile_codes(self):
+        """Test codes equal sklearn's quantile KBinsDiscretizer with compact dtype"""
+        from sklearn.preprocessing import KBinsDiscretizer
+        
+        rng = np.random.default_rng(0)
+        df = pd.DataFrame({'A': rng.normal(size=5000), 'B': rng.lognormal(size=5000)})
+        
+        binned = preprocessing.bin_features(df, n_bins=8)
+        discretizer = KBinsDiscretizer(n_bins=8, encode='ordinal', strategy='quantile')
+        expected = discretizer.fit_transform(df)
+        
+        assert binned['A'].dtype == np.uint8
+        np.testing.assert_array_equal(binned[['A', 'B']].to_numpy(), expected)
+    
+    def test_chunked_fit_and_missing_code(self):
+        """Test chunked fitting gives near-identical bins and missing values get n_bins"""
+        rng = np.random.default_rng(1)
+        df = pd.DataFrame({'A': rng.normal(size=20000)})
+        df.loc[::100, 'A'] = np.nan
+        chunks = [df.iloc[start:start + 3000] for start in range(0, len(df), 3000)]
+        
+        full = preprocessing.QuantileBinner(n_bins=10).fit_transform(df)
+        chunked = preprocessing.QuantileBinner(n_bins=10).fit(chunks).transform(df)
+        
+        assert (full['A'] != chunked['A']).mean() < 0.01
+        assert (full['A'][df['A'].isna()] == 10).all()
+        assert full['A'][df['A'].notna()].max() == 9
+
+
+class TestPreprocessingPlan:
+    """Test preprocessing.PreprocessingPlan class"""
+    
+    def test_matches_sequential_functions(self):
+        """Test the fused plan equals fill_missing -> handle_outliers -> encode -> scale"""
+        from sklearn.preprocessing import RobustScaler
+        from dshelper import missing
+        
+        rng = np.random.default_rng(0)
+        df = pd.DataFrame({
+            'A': rng.normal(40, 10, size=500),
+            'B': rng.lognormal(size=500),
+            'C': rng.choice(['x', 'y', 'z'], size=500),
+        })
+        df.loc[::37, 'A'] = np.nan
+        df.loc[7, 'B'] = 1e6
+        
+        plan = (preprocessing.PreprocessingPlan()
+                .fill_missing('median')
+                .handle_outliers('iqr', threshold=1.5)
+                .encode_categorical('onehot')
+                .scale('robust'))
+        X = plan.fit_transform(df)
+        
+        expected = missing.fill_missing(df, strategy='median')
+        expected = preprocessing.handle_outliers(expected, columns=['A', 'B'], action='clip')
+        expected = preprocessing.encode_categorical(expected, columns=['C'])
+        
+        assert plan.feature_names_out_ == ['A', 'B', 'C_x', 'C_y', 'C_z']
+        np.testing.assert_allclose(X[:, :2], RobustScaler().fit_transform(expected[['A', 'B']]),
+                                   atol=1e-12)
+        np.testing.assert_array_equal(X[:, 2:], expected[['C_x', 'C_y', 'C_z']].to_numpy())
+    
+    def test_step_order_enforced(self):
+        """Test steps declared out of execution order or twice raise errors"""
+        with pytest.raises(ValueError):
+            preprocessing.PreprocessingPlan().scale().fill_missing()
+        with pytest.raises(ValueError):
+            preprocessing.PreprocessingPlan().scale().scale()
+
+
+class TestSparseInput:
+    """Test scipy.sparse input to split_and_scale and feature selection"""
+    
+    def test_split_and_scale_stays_sparse(self):
+        """Test each scaler keeps CSR output with the sparsity pattern of the input"""
+        from scipy import sparse
+        from sklearn.preprocessing import MaxAbsScaler
+        
+        X = sparse.random(400, 50, density=0.05, format='csr', random_state=0)
+        y = np.random.default_rng(0).integers(0, 2, size=400)
+        
+        for scaler in ['standard', 'minmax', 'robust', 'maxabs']:
+            X_train, X_test, _, _ = preprocessing.split_and_scale(X, y, scaler=scaler)
+            assert sparse.isspmatrix_csr(X_train) and sparse.isspmatrix_csr(X_test)
+            assert X_train.nnz + X_test.nnz == X.nnz
+        
+        X_train, _, _, _ = preprocessing.split_and_scale(X, y, scaler='minmax')
+        X_raw, _, _, _ = preprocessing.split_and_scale(X, y, scaler='none')
+        np.testing.assert_allclose(X_train.toarray(), MaxAbsScaler().fit_transform(X_raw).toarray())
+    
+    def test_feature_selection_matches_dense(self):
+        """Test sparse selection returns CSR columns matching SelectKBest"""
+        from scipy import sparse
+        from sklearn.feature_selection import SelectKBest, f_classif
+        
+        X = sparse.random(400, 50, density=0.05, format='csr', random_state=0)
+        y = np.random.default_rng(0).integers(0, 2, size=400)
+        
+        X_selected, selected = preprocessing.feature_selection_quick(X, y, k=5)
+        
+        expected = np.flatnonzero(SelectKBest(f_classif, k=5).fit(X, y).get_support())
+        assert selected == expected.tolist()
+        assert sparse.isspmatrix_csr(X_selected)
+        np.testing.assert_array_equal(X_selected.toarray(), X.toarray()[:, expected])
+
+
+class TestArrowInput:
+    """Test preprocessing.split_and_scale on pyarrow Tables"""
+    
+    def test_table_matches_dataframe(self):
+        """Test a Table with a named target column gives the DataFrame results"""
+        pa = pytest.importorskip('pyarrow')
+        
+        rng = np.random.default_rng(0)
+        df = pd.DataFrame({
+            'A': rng.normal(size=200),
+            'B': rng.integers(0, 10, size=200),
+            'name': ['row'] * 200,
+            'label': rng.integers(0, 2, size=200),
+        })
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        
+        expected = preprocessing.split_and_scale(df[['A', 'B']], df['label'])
+        result = preprocessing.split_and_scale(table, 'label', columns=['A', 'B'])
+        
+        for got, want in zip(result, expected):
+            np.testing.assert_allclose(got, want)
+
+
+class TestSample:
+    """Test preprocessing.sample and ReservoirSampler"""
+    
+    def test_uniform_inclusion(self):
+        """Test every row is kept with probability n / N over chunked updates and merges"""
+        df = pd.DataFrame({'x': np.arange(30)})
+        counts = np.zeros(30)
+        
+        for seed in range(600):
+            sampler = preprocessing.ReservoirSampler(n=6, random_state=seed)
+            sampler.update(df.iloc[:11])
+            other = preprocessing.ReservoirSampler(n=6, random_state=seed + 10_000)
+            sampler.merge(other.update(df.iloc[11:20]))
+            sampler.update(df.iloc[20:])
+            sample = sampler.to_frame()
+            assert sample['x'].is_unique and len(sample) == 6
+            counts[sample['x'].to_numpy()] += 1
+        
+        np.testing.assert_allclose(counts / 600, 6 / 30, atol=0.07)
+    
+    def test_merge_multi_billion_row_shards(self):
+        """Test merging reservoirs that have seen over 1e9 rows each"""
+        df = pd.DataFrame({'x': np.arange(400)})
+        shares = []
+        for seed in range(20):
+            sampler = preprocessing.ReservoirSampler(n=100, random_state=seed).update(df.iloc[:200])
+            other = preprocessing.ReservoirSampler(n=100, random_state=seed).update(df.iloc[200:])
+            sampler.counts_[None], other.counts_[None] = 6 * 10 ** 9, 2 * 10 ** 9
+            
+            merged = sampler.merge(other).to_frame()
+            
+            assert len(merged) == 100
+            assert sampler.counts_[None] == 8 * 10 ** 9
+            shares.append((merged['x'] < 200).mean())
+        
+        assert abs(np.mean(shares) - 0.75) < 0.03
+    
+    def test_stratified_shards(self, tmp_path):
+        """Test per-stratum reservoirs over CSV shards with weights summing to the strata sizes"""
+        rng = np.random.default_rng(0)
+        df = pd.DataFrame({'x': np.arange(3000), 'label': (rng.random(3000) < 0.1).astype(int)})
+        df.iloc[:1000].to_csv(tmp_path / 'part-0.csv', index=False)
+        df.iloc[1000:].to_csv(tmp_path / 'part-1.csv', index=False)
+        
+        sample = preprocessing.sample(
+            [tmp_path / 'part-0.csv', tmp_path / 'part-1.csv'],
+            n=50, stratify='label', chunksize=400
+        )
+        
+        assert sample.groupby('label').size().tolist() == [50, 50]
+        weights = sample.groupby('label')['sample_weight'].sum()
+        expected = df['label'].value_counts().sort_index().to_numpy()
+        np.testing.assert_allclose(weights.to_numpy(), expected)
+
+
+class TestParallelEncoding:
+    """Test n_jobs in preprocessing.encode_categorical"""
+    
+    def test_parallel_matches_serial(self):
+        """Test every dense method gives identical output with n_jobs"""
+        rng = np.random.default_rng(0)
+        df = pd.DataFrame({f'C{i}': rng.choice(['a', 'b', 'c', None], size=300) for i in range(5)})
+        df['num'] = rng.normal(size=300)
+        y = rng.integers(0, 2, size=300)
+        
+        for method in ['onehot', 'label', 'ordinal', 'target']:
+            serial = preprocessing.encode_categorical(df, method=method, y=y)
+            parallel = preprocessing.encode_categorical(df, method=method, y=y, n_jobs=2)
+            pd.testing.assert_frame_equal(parallel, serial)
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])